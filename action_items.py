@@ -0,0 +1,232 @@
+"""
+Compact action item records and a columnar batch with direct CSV/JSON/Parquet export.
+
+``ActionItem`` keeps the source sentence once and derives the task text and
+note from it. ``ActionItemBatch`` stores many items column by column: the
+repetitive owner/deadline/priority/status values are dictionary-encoded into
+small integer arrays, so bulk extraction over an archive stays small and can be
+written out without building a pandas DataFrame.
+"""
+import csv
+import io
+import json
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Union
+
+FIELDS = ['task', 'owner', 'deadline', 'priority', 'status', 'note']
+RESOLVED_FIELDS = ['due_date', 'owner_id']
+TIMING_FIELDS = ['start_ms', 'end_ms']
+
+
+def _note_for(sentence: str) -> str:
+    return f'Extracted from: "{sentence[:50]}..."' if len(sentence) > 50 else f'Extracted from: "{sentence}"'
+
+
+@dataclass(slots=True)
+class ActionItem:
+    """One extracted action item.
+
+    ``task`` is ``sentence[task_offset:]`` (the sentence minus a leading
+    "Owner:" label) and ``note`` is derived from ``sentence``, so the text is
+    stored once. ``start_ms``/``end_ms`` are set when the transcript came
+    from timestamped audio segments. ``due_date`` (ISO) and ``owner_id``
+    (canonical speaker id) are filled when extraction was given a meeting date.
+    """
+    sentence: str
+    task_offset: int = 0
+    owner: str = ''
+    deadline: str = ''
+    priority: str = 'Medium'
+    status: str = 'Pending'
+    start_ms: Optional[int] = None
+    end_ms: Optional[int] = None
+    due_date: Optional[str] = None
+    owner_id: Optional[str] = None
+
+    def __post_init__(self):
+        self.owner = sys.intern(self.owner)
+        self.deadline = sys.intern(self.deadline)
+        self.priority = sys.intern(self.priority)
+        self.status = sys.intern(self.status)
+
+    @property
+    def task(self) -> str:
+        return self.sentence[self.task_offset:].strip() if self.task_offset else self.sentence
+
+    @property
+    def note(self) -> str:
+        return _note_for(self.sentence)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The dict shape ``enhanced_action_extraction`` has always returned."""
+        d = {'task': self.task, 'owner': self.owner, 'deadline': self.deadline,
+             'priority': self.priority, 'status': self.status, 'note': self.note}
+        if self.is_resolved:
+            d['due_date'] = self.due_date or ''
+            d['owner_id'] = self.owner_id or ''
+        if self.start_ms is not None:
+            d['start_ms'] = self.start_ms
+            d['end_ms'] = self.end_ms
+        return d
+
+    @property
+    def is_resolved(self) -> bool:
+        """True when due date/owner resolution ran (``owner_id`` is '' rather than None)."""
+        return self.owner_id is not None
+
+
+class _DictColumn:
+    """Dictionary-encoded string column: distinct values once, one small int code per row."""
+    __slots__ = ('values', 'codes', '_index')
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes = array('H')
+        self._index: Dict[str, int] = {}
+
+    def append(self, value: str) -> None:
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+            if code > 0xFFFF and self.codes.typecode == 'H':
+                self.codes = array('I', self.codes)
+        self.codes.append(code)
+
+    def __getitem__(self, i: int) -> str:
+        return self.values[self.codes[i]]
+
+
+class ActionItemBatch:
+    """Columnar container of action items with writers that bypass pandas."""
+    _DICT_COLUMNS = ('owner', 'deadline', 'priority', 'status', 'due_date', 'owner_id')
+
+    def __init__(self, items: Iterable[ActionItem] = ()):
+        self.sentences: List[str] = []
+        self.task_offsets = array('I')
+        self.start_ms = array('q')
+        self.end_ms = array('q')
+        self._columns = {name: _DictColumn() for name in self._DICT_COLUMNS}
+        self.has_timing = False
+        self.has_resolved = False
+        self.extend(items)
+
+    def append(self, item: ActionItem) -> None:
+        self.sentences.append(item.sentence)
+        self.task_offsets.append(item.task_offset)
+        for name, column in self._columns.items():
+            column.append(getattr(item, name) or '')
+        if item.is_resolved:
+            self.has_resolved = True
+        if item.start_ms is not None:
+            self.has_timing = True
+        self.start_ms.append(-1 if item.start_ms is None else item.start_ms)
+        self.end_ms.append(-1 if item.end_ms is None else item.end_ms)
+
+    def extend(self, items: Iterable[ActionItem]) -> None:
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self.sentences)
+
+    def __getitem__(self, i: int) -> ActionItem:
+        cols = self._columns
+        start, end = self.start_ms[i], self.end_ms[i]
+        return ActionItem(self.sentences[i], self.task_offsets[i], cols['owner'][i], cols['deadline'][i],
+                          cols['priority'][i], cols['status'][i],
+                          None if start < 0 else start, None if end < 0 else end,
+                          cols['due_date'][i] or None, cols['owner_id'][i] if self.has_resolved else None)
+
+    def __iter__(self) -> Iterator[ActionItem]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def fields(self) -> List[str]:
+        fields = list(FIELDS)
+        if self.has_resolved:
+            fields += RESOLVED_FIELDS
+        if self.has_timing:
+            fields += TIMING_FIELDS
+        return fields
+
+    def column(self, name: str) -> List[Any]:
+        """Materialize one column as a list."""
+        if name in self._columns:
+            col = self._columns[name]
+            return [col.values[c] for c in col.codes]
+        if name == 'task':
+            return [s[o:].strip() if o else s for s, o in zip(self.sentences, self.task_offsets)]
+        if name == 'note':
+            return [_note_for(s) for s in self.sentences]
+        if name in TIMING_FIELDS:
+            return [None if v < 0 else v for v in getattr(self, name)]
+        raise KeyError(name)
+
+    def rows(self) -> Iterator[List[Any]]:
+        columns = [self.column(name) for name in self.fields]
+        return zip(*columns)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [item.to_dict() for item in self]
+
+    def write_csv(self, dest: Union[str, IO[str]]) -> None:
+        """Write the batch as CSV (same columns as the DataFrame export) to a path or text file."""
+        if isinstance(dest, str):
+            with open(dest, 'w', encoding='utf-8', newline='') as f:
+                return self.write_csv(f)
+        writer = csv.writer(dest)
+        writer.writerow(self.fields)
+        writer.writerows(['' if v is None else v for v in row] for row in self.rows())
+
+    def to_csv(self) -> str:
+        buf = io.StringIO()
+        self.write_csv(buf)
+        return buf.getvalue()
+
+    def write_json(self, dest: Union[str, IO[str]]) -> None:
+        """Write the batch as a JSON array of records to a path or text file."""
+        if isinstance(dest, str):
+            with open(dest, 'w', encoding='utf-8') as f:
+                return self.write_json(f)
+        fields = self.fields
+        dest.write('[')
+        for i, row in enumerate(self.rows()):
+            if i:
+                dest.write(',')
+            json.dump(dict(zip(fields, row)), dest, ensure_ascii=False)
+        dest.write(']')
+
+    def to_json(self) -> str:
+        buf = io.StringIO()
+        self.write_json(buf)
+        return buf.getvalue()
+
+    def to_arrow(self):
+        """Build a pyarrow Table, passing the dictionary-encoded columns through as-is."""
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise RuntimeError("Arrow/Parquet export requires 'pip install pyarrow'") from e
+        arrays, names = [], []
+        for name in self.fields:
+            if name in self._columns:
+                col = self._columns[name]
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(col.codes, type=pa.uint32()),
+                                                             pa.array(col.values, type=pa.string())))
+            elif name in TIMING_FIELDS:
+                arrays.append(pa.array(self.column(name), type=pa.int64()))
+            else:
+                arrays.append(pa.array(self.column(name), type=pa.string()))
+            names.append(name)
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def write_parquet(self, path: str) -> None:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet export requires 'pip install pyarrow'") from e
+        pq.write_table(self.to_arrow(), path)
@@ -0,0 +1,251 @@
+"""
+SQLite-backed store of action items across meetings.
+
+Extracted action items are ingested per meeting in bulk transactions and can
+be queried by owner, due date, priority, status and meeting date through
+indexed lookups, from Python or the command line:
+
+    python action_store.py ingest sample_transcript.txt --date 2024-03-04
+    python action_store.py query --owner Mike --status Pending --due-this-week
+"""
+import argparse
+import datetime as dt
+import os
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from action_items import ActionItem
+from deadline_resolver import speaker_id
+
+DEFAULT_DB = os.environ.get('MEETING_ACTION_DB', 'action_items.db')
+
+_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    meeting_key TEXT NOT NULL UNIQUE,
+    meeting_date TEXT,
+    title TEXT,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS action_items (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    meeting_date TEXT,
+    task TEXT NOT NULL,
+    owner TEXT NOT NULL DEFAULT '',
+    owner_id TEXT NOT NULL DEFAULT '',
+    deadline TEXT NOT NULL DEFAULT '',
+    due_date TEXT,
+    priority TEXT NOT NULL DEFAULT 'Medium',
+    status TEXT NOT NULL DEFAULT 'Pending',
+    sentence TEXT NOT NULL,
+    start_ms INTEGER,
+    end_ms INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_items_owner_due ON action_items(owner COLLATE NOCASE, due_date);
+CREATE INDEX IF NOT EXISTS idx_items_owner_id_due ON action_items(owner_id, due_date);
+CREATE INDEX IF NOT EXISTS idx_items_due ON action_items(due_date);
+CREATE INDEX IF NOT EXISTS idx_items_priority ON action_items(priority, due_date);
+CREATE INDEX IF NOT EXISTS idx_items_status ON action_items(status, due_date);
+CREATE INDEX IF NOT EXISTS idx_items_meeting_date ON action_items(meeting_date);
+CREATE INDEX IF NOT EXISTS idx_items_meeting ON action_items(meeting_id);
+"""
+
+
+def _due_date(item: ActionItem) -> Optional[str]:
+    """ISO due date for an item: the resolved one, or the deadline if it is already a date."""
+    if item.due_date:
+        return item.due_date
+    return item.deadline if _ISO_DATE.match(item.deadline) else None
+
+
+class ActionStore:
+    """Action items from many meetings in one SQLite database."""
+
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self._migrate()
+        self.conn.executescript(_SCHEMA)
+
+    def _migrate(self) -> None:
+        """Add columns introduced after a database was created."""
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(action_items)')}
+        if columns and 'owner_id' not in columns:
+            self.conn.execute("ALTER TABLE action_items ADD COLUMN owner_id TEXT NOT NULL DEFAULT ''")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _add_meeting(self, meeting_key: str, items: Iterable[ActionItem], meeting_date: Optional[str],
+                     title: Optional[str]) -> int:
+        cur = self.conn.execute(
+            'INSERT INTO meetings (meeting_key, meeting_date, title, ingested_at) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(meeting_key) DO UPDATE SET meeting_date=excluded.meeting_date, '
+            'title=excluded.title, ingested_at=excluded.ingested_at RETURNING id',
+            (meeting_key, meeting_date, title, dt.datetime.now().isoformat(timespec='seconds')))
+        meeting_id = cur.fetchone()[0]
+        # Re-ingesting a meeting replaces its items rather than duplicating them
+        self.conn.execute('DELETE FROM action_items WHERE meeting_id = ?', (meeting_id,))
+        self.conn.executemany(
+            'INSERT INTO action_items (meeting_id, meeting_date, task, owner, owner_id, deadline, due_date, '
+            'priority, status, sentence, start_ms, end_ms) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            ((meeting_id, meeting_date, item.task, item.owner, item.owner_id or '', item.deadline, _due_date(item),
+              item.priority, item.status, item.sentence, item.start_ms, item.end_ms) for item in items))
+        return meeting_id
+
+    def add_meeting(self, meeting_key: str, items: Iterable[ActionItem], meeting_date: Optional[str] = None,
+                    title: Optional[str] = None) -> int:
+        """Store one meeting's action items in a single transaction. Returns the meeting id."""
+        with self.conn:
+            return self._add_meeting(meeting_key, items, meeting_date, title)
+
+    def add_meetings(self, meetings: Iterable[Tuple[str, Optional[str], Iterable[ActionItem]]]) -> int:
+        """Bulk-ingest (meeting_key, meeting_date, items) tuples in one transaction. Returns the count."""
+        count = 0
+        with self.conn:
+            for meeting_key, meeting_date, items in meetings:
+                self._add_meeting(meeting_key, items, meeting_date, None)
+                count += 1
+        return count
+
+    def query(self, owner: Optional[str] = None, status: Optional[str] = None, priority: Optional[str] = None,
+              due_from: Optional[str] = None, due_to: Optional[str] = None,
+              meeting_from: Optional[str] = None, meeting_to: Optional[str] = None,
+              limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        """Find action items; every filter is optional and dates are ISO strings (inclusive).
+
+        ``owner`` matches the name as written or the resolved speaker id, so
+        "Sarah" also finds items that said "I'll ..." in Sarah's turn.
+        """
+        where, params = [], []
+        if owner:
+            where.append('(a.owner = ? COLLATE NOCASE OR a.owner_id = ?)')
+            params.extend([owner, speaker_id(owner)])
+        if status:
+            where.append('a.status = ?')
+            params.append(status)
+        if priority:
+            where.append('a.priority = ?')
+            params.append(priority)
+        if due_from:
+            where.append('a.due_date >= ?')
+            params.append(due_from)
+        if due_to:
+            where.append('a.due_date <= ?')
+            params.append(due_to)
+        if meeting_from:
+            where.append('a.meeting_date >= ?')
+            params.append(meeting_from)
+        if meeting_to:
+            where.append('a.meeting_date <= ?')
+            params.append(meeting_to)
+        sql = ('SELECT a.id, m.meeting_key, a.meeting_date, a.task, a.owner, a.owner_id, a.deadline, a.due_date, '
+               'a.priority, a.status, a.start_ms, a.end_ms FROM action_items a JOIN meetings m ON m.id = a.meeting_id')
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY a.due_date IS NULL, a.due_date, a.meeting_date DESC, a.id'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def set_status(self, item_id: int, status: str) -> bool:
+        """Update one item's status. Returns False if the id does not exist."""
+        with self.conn:
+            cur = self.conn.execute('UPDATE action_items SET status = ? WHERE id = ?', (status, item_id))
+        return cur.rowcount > 0
+
+    def stats(self) -> Dict[str, int]:
+        meetings = self.conn.execute('SELECT COUNT(*) FROM meetings').fetchone()[0]
+        items = self.conn.execute('SELECT COUNT(*) FROM action_items').fetchone()[0]
+        return {'meetings': meetings, 'action_items': items}
+
+
+def _week_bounds(today: dt.date) -> Tuple[str, str]:
+    monday = today - dt.timedelta(days=today.weekday())
+    return monday.isoformat(), (monday + dt.timedelta(days=6)).isoformat()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cross-meeting action item store')
+    parser.add_argument('--db', default=DEFAULT_DB, help='SQLite database path')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ingest = sub.add_parser('ingest', help='Extract and store action items from transcript files')
+    ingest.add_argument('files', nargs='+', help='Transcript text files')
+    ingest.add_argument('--date', help='Meeting date (YYYY-MM-DD); defaults to each file\'s modification date')
+    ingest.add_argument('--skip-duplicates', action='store_true',
+                        help='Skip transcripts that nearly duplicate an already ingested meeting')
+
+    query = sub.add_parser('query', help='Query stored action items')
+    query.add_argument('--owner')
+    query.add_argument('--status', help='e.g. Pending, "In Progress", Completed')
+    query.add_argument('--open', action='store_true', help='Shortcut for --status Pending')
+    query.add_argument('--priority', choices=['High', 'Medium', 'Low'])
+    query.add_argument('--due-from')
+    query.add_argument('--due-to')
+    query.add_argument('--due-this-week', action='store_true')
+    query.add_argument('--meeting-from')
+    query.add_argument('--meeting-to')
+    query.add_argument('--limit', type=int, default=100)
+
+    args = parser.parse_args()
+    with ActionStore(args.db) as store:
+        if args.command == 'ingest':
+            from nlp_summarizer import extract_action_items
+            from dedup import MeetingDeduplicator
+
+            dedup = MeetingDeduplicator(store.conn) if args.skip_duplicates else None
+
+            def meetings():
+                for path in args.files:
+                    key = os.path.abspath(path)
+                    with open(path, 'r', encoding='utf-8') as f:
+                        transcript = f.read()
+                    if dedup:
+                        duplicates = dedup.find_duplicates(transcript, exclude=key)
+                        if duplicates:
+                            other, score = duplicates[0]
+                            print(f"Skipping {path}: {score:.0%} similar to {other}")
+                            continue
+                        dedup.add(key, transcript)
+                    date = args.date or dt.date.fromtimestamp(os.path.getmtime(path)).isoformat()
+                    yield key, date, extract_action_items(transcript, meeting_date=date)
+
+            try:
+                count = store.add_meetings(meetings())
+            finally:
+                if dedup:
+                    dedup.close()
+            print(f"Ingested {count} meeting(s); store now holds {store.stats()['action_items']} action items")
+        else:
+            due_from, due_to = args.due_from, args.due_to
+            if args.due_this_week:
+                due_from, due_to = _week_bounds(dt.date.today())
+            rows = store.query(owner=args.owner, status='Pending' if args.open else args.status,
+                               priority=args.priority, due_from=due_from, due_to=due_to,
+                               meeting_from=args.meeting_from, meeting_to=args.meeting_to, limit=args.limit)
+            if not rows:
+                print('No matching action items.')
+            for row in rows:
+                due = row['due_date'] or row['deadline'] or '-'
+                print(f"#{row['id']} [{row['priority']}/{row['status']}] {row['task']} "
+                      f"(owner: {row['owner'] or row['owner_id'] or '-'}, due: {due}, meeting: {row['meeting_date']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,435 @@
+"""
+Asynchronous HTTP API around the summarizer and transcriber.
+
+Text endpoints batch concurrent requests for a few milliseconds and run each
+batch in a process pool, so many small calls cost one round trip to a worker
+instead of one each. Audio is accepted as a job, queued, and transcribed by a
+fixed number of worker tasks. When too many text requests are in flight or
+the audio queue is full the server answers 429/503 with ``Retry-After``
+instead of queueing without bound, and oversized bodies get 413.
+
+    python api_server.py --port 8000 --workers 4
+
+    POST /v1/summarize       {"transcript": "...", "summary_format": "markdown|html|text|json", "backend": "rules|mistral"}
+    POST /v1/actions         {"transcript": "...", "meeting_date": "2024-03-04"}
+    POST /v1/insights        {"transcript": "..."}
+    POST /v1/analyze         all three at once
+    POST /v1/transcriptions  audio as multipart "file" or raw body -> 202 {"job_id": ...}
+    GET  /v1/transcriptions/{job_id}
+    WS   /v1/live?meeting_date=...   send transcript text as it arrives, receive new action items and a rolling summary
+    GET  /healthz, GET /metrics (Prometheus)
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from starlette.applications import Starlette
+from starlette.formparsers import MultiPartException, MultiPartParser
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+import metrics
+import scratch
+
+TEXT_KINDS = ('summarize', 'actions', 'insights', 'analyze')
+MAX_TRANSCRIPT_CHARS = 2_000_000
+# Request bodies: JSON for the text endpoints (a maximal transcript, escaped), audio uploads
+MAX_JSON_BYTES = 16 << 20
+MAX_UPLOAD_BYTES = 256 << 20
+SUMMARY_FORMATS = (None, 'markdown', 'html', 'text', 'json')
+BACKENDS = (None, 'rules', 'mistral')
+
+
+def _run_one(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    from nlp_summarizer import analyze_meeting_insights, enhanced_action_extraction, generate_summary
+
+    transcript = payload['transcript']
+    result: Dict[str, Any] = {}
+    if kind in ('summarize', 'analyze'):
+        summary = generate_summary(transcript, structured=True, backend=payload.get('backend'))
+        result['summary'] = summary.render(payload.get('summary_format') or 'markdown')
+    if kind in ('actions', 'analyze'):
+        result['action_items'] = enhanced_action_extraction(transcript, meeting_date=payload.get('meeting_date'),
+                                                              backend=payload.get('backend'))
+    if kind in ('insights', 'analyze'):
+        result['insights'] = analyze_meeting_insights(transcript)
+    return result
+
+
+def _run_batch(kind: str, payloads: List[Dict[str, Any]]) -> List[Tuple[bool, Any]]:
+    """Process-pool entry point: (ok, result or error message) per payload."""
+    results = []
+    for payload in payloads:
+        try:
+            results.append((True, _run_one(kind, payload)))
+        except Exception as e:
+            results.append((False, str(e)))
+    return results
+
+
+class Batcher:
+    """Collects requests of one kind for up to ``window`` seconds (or ``max_batch`` requests).
+
+    A flushed batch is split into up to ``workers`` pool tasks, so concurrent
+    requests spread over the pool's processes instead of queueing in one.
+    """
+
+    def __init__(self, kind: str, executor: Executor, window: float = 0.005, max_batch: int = 32,
+                 workers: int = 1):
+        self.kind = kind
+        self.executor = executor
+        self.window = window
+        self.max_batch = max_batch
+        self.workers = max(1, workers)
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, payload: Dict[str, Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((payload, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        metrics.observe(f'api.batch_size.{self.kind}', len(batch))
+        loop = asyncio.get_running_loop()
+        size = math.ceil(len(batch) / self.workers)
+        for offset in range(0, len(batch), size):
+            part = batch[offset:offset + size]
+            task = loop.run_in_executor(self.executor, _run_batch, self.kind, [payload for payload, _ in part])
+            task.add_done_callback(lambda done, part=part: self._deliver(part, done))
+
+    @staticmethod
+    def _deliver(batch: List[Tuple[Dict[str, Any], asyncio.Future]], done: asyncio.Future) -> None:
+        error = done.exception()
+        results = [(False, str(error))] * len(batch) if error else done.result()
+        for (_, future), (ok, value) in zip(batch, results):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(RuntimeError(value))
+
+
+class TranscriptionJobs:
+    """Bounded queue of audio transcription jobs served by ``workers`` tasks.
+
+    Finished jobs are kept for lookup up to ``keep`` entries, oldest dropped first.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 64, keep: int = 1000):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.jobs: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.keep = keep
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='transcribe')
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(workers)]
+
+    def submit(self, audio_path: str, backend: Optional[str]) -> Optional[str]:
+        """Queue a job; returns its id, or None when the queue is full."""
+        job_id = uuid.uuid4().hex
+        try:
+            self.queue.put_nowait((job_id, audio_path, backend))
+        except asyncio.QueueFull:
+            return None
+        self.jobs[job_id] = {'id': job_id, 'status': 'queued', 'submitted': time.time()}
+        self._trim()
+        metrics.set_gauge('queue.transcriptions', self.queue.qsize())
+        return job_id
+
+    def _trim(self) -> None:
+        while len(self.jobs) > self.keep:
+            oldest = next(iter(self.jobs))
+            if self.jobs[oldest]['status'] in ('queued', 'running'):
+                break
+            self.jobs.popitem(last=False)
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job_id, audio_path, backend = await self.queue.get()
+            metrics.set_gauge('queue.transcriptions', self.queue.qsize())
+            job = self.jobs.get(job_id, {'id': job_id})
+            job['status'] = 'running'
+            try:
+                job.update(await loop.run_in_executor(self.executor, _transcribe, audio_path, backend))
+            except Exception as e:
+                job.update(status='failed', error=str(e))
+            finally:
+                job['finished'] = time.time()
+                scratch.remove(audio_path)
+                self.queue.task_done()
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _transcribe(audio_path: str, backend: Optional[str]) -> Dict[str, Any]:
+    from audio_processor import segments_to_text, shared_backend, transcribe_audio
+
+    segments = transcribe_audio(audio_path, backend=shared_backend(backend), return_segments=True)
+    if segments is None:
+        return {'status': 'failed', 'error': 'Could not process audio'}
+    return {'status': 'done', 'text': segments_to_text(segments),
+            'segments': [segment._asdict() for segment in segments]}
+
+
+class ApiState:
+    """Executors, batchers and admission control shared by the request handlers."""
+
+    def __init__(self, workers: Optional[int], window_ms: float, max_batch: int, max_pending: int,
+                 audio_workers: int, audio_queue: int):
+        workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.batchers = {kind: Batcher(kind, self.pool, window_ms / 1000, max_batch, workers)
+                         for kind in TEXT_KINDS}
+        self.max_pending = max_pending
+        self.pending = 0
+        self.jobs = TranscriptionJobs(audio_workers, audio_queue)
+
+    async def close(self) -> None:
+        await self.jobs.close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _error(message: str, status: int, retry_after: Optional[int] = None) -> JSONResponse:
+    headers = {'Retry-After': str(retry_after)} if retry_after else None
+    return JSONResponse({'error': message}, status_code=status, headers=headers)
+
+
+def _valid_date(value: Any) -> bool:
+    """``meeting_date`` is optional, otherwise an ISO date string."""
+    if value is None:
+        return True
+    try:
+        date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+async def _stream_body(request: Request, limit: int) -> AsyncIterator[bytes]:
+    """The request body in chunks; raises ``_BodyTooLarge`` as soon as it exceeds ``limit`` bytes."""
+    length = request.headers.get('content-length', '')
+    if length.isdigit() and int(length) > limit:
+        raise _BodyTooLarge()
+    size = 0
+    async for part in request.stream():
+        size += len(part)
+        if size > limit:
+            raise _BodyTooLarge()
+        yield part
+
+
+async def _read_body(request: Request, limit: int) -> Optional[bytes]:
+    """The request body, or None once it is larger than ``limit`` bytes (before reading it all)."""
+    try:
+        return b''.join([part async for part in _stream_body(request, limit)])
+    except _BodyTooLarge:
+        return None
+
+
+def _text_endpoint(kind: str):
+    async def endpoint(request: Request) -> JSONResponse:
+        state: ApiState = request.app.state.api
+        body = await _read_body(request, MAX_JSON_BYTES)
+        if body is None:
+            return _error('Request body too large', 413)
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return _error('Request body must be JSON', 400)
+        transcript = payload.get('transcript') if isinstance(payload, dict) else None
+        if not isinstance(transcript, str) or not transcript.strip():
+            return _error("'transcript' must be a non-empty string", 400)
+        if payload.get('summary_format') not in SUMMARY_FORMATS:
+            return _error(f"'summary_format' must be one of: {', '.join(SUMMARY_FORMATS[1:])}", 400)
+        if payload.get('backend') not in BACKENDS:
+            return _error(f"'backend' must be one of: {', '.join(BACKENDS[1:])}", 400)
+        if not _valid_date(payload.get('meeting_date')):
+            return _error("'meeting_date' must be an ISO date string (YYYY-MM-DD)", 400)
+        if len(transcript) > MAX_TRANSCRIPT_CHARS:
+            return _error('Transcript too large', 413)
+        if state.pending >= state.max_pending:
+            metrics.incr('api.rejected')
+            return _error('Server busy, retry shortly', 429, retry_after=1)
+        state.pending += 1
+        metrics.set_gauge('queue.api_pending', state.pending)
+        metrics.incr(f'requests.{kind}')
+        try:
+            with metrics.span(f'api.{kind}'):
+                result = await state.batchers[kind].submit(
+                    {'transcript': transcript, 'meeting_date': payload.get('meeting_date'),
+                     'summary_format': payload.get('summary_format'), 'backend': payload.get('backend')})
+        except Exception as e:
+            return _error(str(e), 500)
+        finally:
+            state.pending -= 1
+            metrics.set_gauge('queue.api_pending', state.pending)
+        return JSONResponse(result)
+    return endpoint
+
+
+async def submit_transcription(request: Request) -> JSONResponse:
+    state: ApiState = request.app.state.api
+    if state.jobs.queue.full():
+        metrics.incr('api.rejected')
+        return _error('Transcription queue full, retry later', 503, retry_after=5)
+    filename = request.query_params.get('filename', 'upload.wav')
+    too_large = _error(f'Upload larger than {MAX_UPLOAD_BYTES >> 20} MB', 413)
+    if request.headers.get('content-type', '').startswith('multipart/form-data'):
+        parser = MultiPartParser(request.headers, _stream_body(request, MAX_UPLOAD_BYTES),
+                                 max_part_size=MAX_UPLOAD_BYTES)
+        try:
+            form = await parser.parse()
+        except _BodyTooLarge:
+            return too_large
+        except MultiPartException as e:
+            return _error(f'Malformed multipart body: {e.message}', 400)
+        try:
+            upload = form.get('file')
+            if upload is None or isinstance(upload, str):
+                return _error("Multipart body needs a 'file' field", 400)
+            filename = upload.filename or filename
+            data = await upload.read()
+        finally:
+            await form.close()
+    else:
+        data = await _read_body(request, MAX_UPLOAD_BYTES)
+        if data is None:
+            return too_large
+    if not data:
+        return _error('Empty audio upload', 400)
+    try:
+        path = scratch.spill(data, suffix=os.path.splitext(filename)[1] or '.wav', prefix='api')
+    except scratch.ScratchFull:
+        return _error('Upload storage full, retry later', 503, retry_after=30)
+    job_id = state.jobs.submit(path, request.query_params.get('backend'))
+    if job_id is None:
+        scratch.remove(path)
+        return _error('Transcription queue full, retry later', 503, retry_after=5)
+    metrics.incr('requests.transcribe')
+    return JSONResponse({'job_id': job_id, 'status': 'queued'}, status_code=202,
+                        headers={'Location': f'/v1/transcriptions/{job_id}'})
+
+
+async def get_transcription(request: Request) -> JSONResponse:
+    job = request.app.state.api.jobs.jobs.get(request.path_params['job_id'])
+    if job is None:
+        return _error('Unknown job id', 404)
+    return JSONResponse(job)
+
+
+async def healthz(request: Request) -> JSONResponse:
+    state: ApiState = request.app.state.api
+    return JSONResponse({'status': 'ok', 'pending': state.pending, 'transcription_queue': state.jobs.queue.qsize()})
+
+
+async def prometheus(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(metrics.to_prometheus(), media_type='text/plain; version=0.0.4')
+
+
+async def live_session(websocket: WebSocket) -> None:
+    """One live meeting per connection: each text message is fed to a ``LiveAnalyzer``.
+
+    Updates are O(new text), so they run inline on the event loop. The reply
+    to each message holds the action items it completed, running stats and
+    the rolling summary; closing the socket ends the meeting.
+    """
+    from live_analyzer import LiveAnalyzer
+
+    summary_format = websocket.query_params.get('summary_format') or 'markdown'
+    meeting_date = websocket.query_params.get('meeting_date')
+    if summary_format not in SUMMARY_FORMATS or not _valid_date(meeting_date):
+        await websocket.close(code=1003)
+        return
+    await websocket.accept()
+    analyzer = LiveAnalyzer(meeting_date=meeting_date)
+    metrics.incr('requests.live')
+    try:
+        while True:
+            text = await websocket.receive_text()
+            if len(text) > MAX_TRANSCRIPT_CHARS:
+                await websocket.send_json({'error': 'Message too large'})
+                continue
+            items = analyzer.feed(text)
+            await websocket.send_json({
+                'action_items': [item.to_dict() for item in items],
+                'stats': analyzer.stats(),
+                'summary': analyzer.summary().render(summary_format),
+            })
+    except WebSocketDisconnect:
+        pass
+
+
+def create_app(workers: Optional[int] = None, window_ms: float = 5.0, max_batch: int = 32,
+               max_pending: int = 512, audio_workers: int = 2, audio_queue: int = 64) -> Starlette:
+    """Build the ASGI app; pools and workers start with the server and stop with it."""
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette):
+        app.state.api = ApiState(workers, window_ms, max_batch, max_pending, audio_workers, audio_queue)
+        try:
+            yield
+        finally:
+            await app.state.api.close()
+
+    routes = [Route(f'/v1/{kind}', _text_endpoint(kind), methods=['POST']) for kind in TEXT_KINDS]
+    routes += [
+        Route('/v1/transcriptions', submit_transcription, methods=['POST']),
+        Route('/v1/transcriptions/{job_id}', get_transcription, methods=['GET']),
+        WebSocketRoute('/v1/live', live_session),
+        Route('/healthz', healthz, methods=['GET']),
+        Route('/metrics', prometheus, methods=['GET']),
+    ]
+    return Starlette(routes=routes, lifespan=lifespan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP API for meeting summarization and transcription')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, help='Process pool size for text analysis (default: CPU count)')
+    parser.add_argument('--batch-window-ms', type=float, default=5.0, help='How long to gather a batch')
+    parser.add_argument('--max-batch', type=int, default=32)
+    parser.add_argument('--max-pending', type=int, default=512, help='In-flight text requests before answering 429')
+    parser.add_argument('--audio-workers', type=int, default=2)
+    parser.add_argument('--audio-queue', type=int, default=64, help='Queued transcriptions before answering 503')
+    args = parser.parse_args()
+
+    import uvicorn
+    app = create_app(args.workers, args.batch_window_ms, args.max_batch, args.max_pending,
+                     args.audio_workers, args.audio_queue)
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
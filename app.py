@@ -1,5 +1,6 @@
-import argparse, pandas as pd
-from nlp_summarizer import generate_summary, enhanced_action_extraction
+import argparse
+from nlp_summarizer import generate_summary, extract_action_batch
+from action_items import ActionItemBatch
 
 def summarize_transcript(transcript: str):
     try:
@@ -8,12 +9,12 @@ def summarize_transcript(transcript: str):
         print('NLP error:', e)
         return "Error generating summary"
 
-def extract_actions(transcript: str):
+def extract_actions(transcript: str) -> ActionItemBatch:
     try:
-        return enhanced_action_extraction(transcript)
+        return extract_action_batch(transcript)
     except Exception as e:
         print('NLP error:', e)
-        return []
+        return ActionItemBatch()
 
 def main(args):
     inpath = args.input
@@ -25,19 +26,24 @@ def main(args):
     print(summary)
     print('\n=== Extracting Action Items ===')
     items = extract_actions(transcript)
-    df = pd.DataFrame(items)
-    if df.empty:
+    if not len(items):
         print('No action items found.')
     else:
-        print(df.to_string(index=False))
-        out_csv = args.output or 'action_items.csv'
-        df.to_csv(out_csv, index=False)
-        print(f'\nSaved action items to {out_csv}')
+        for item in items:
+            print(f"- [{item.priority}] {item.task} (owner: {item.owner or '-'}, deadline: {item.deadline or '-'})")
+        out_path = args.output or 'action_items.csv'
+        if out_path.endswith('.parquet'):
+            items.write_parquet(out_path)
+        elif out_path.endswith('.json'):
+            items.write_json(out_path)
+        else:
+            items.write_csv(out_path)
+        print(f'\nSaved action items to {out_path}')
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('--input', '-i', default='sample_transcript.txt', help='Input transcript file')
-    parser.add_argument('--output', '-o', help='Output CSV for action items')
+    parser.add_argument('--output', '-o', help='Output file for action items (.csv, .json or .parquet)')
 
     args = parser.parse_args()
     main(args)
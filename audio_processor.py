@@ -1,79 +1,463 @@
 import os
-import tempfile
-from typing import Callable, Optional, List
+import json
+import time
+import wave
+import struct
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Dict, Optional, List, NamedTuple, Tuple, Type, Union
+import numpy as np
 import speech_recognition as sr
 from pydub import AudioSegment
+from pydub.utils import which
+import metrics
+import scratch
 
-def convert_to_wav(audio_path):
-    """Convert audio file to WAV format. Returns (wav_path, created_temp: bool)."""
-    if audio_path.lower().endswith('.wav'):
+# A file path, an in-memory buffer, or a binary file object such as a Streamlit upload
+AudioSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+# Speech recognizers work on 16 kHz mono 16-bit PCM; anything richer is wasted bytes
+TARGET_SAMPLE_RATE = 16000
+TARGET_CHANNELS = 1
+TARGET_SAMPLE_WIDTH = 2
+
+def _is_normalized_wav(wav_path: str) -> bool:
+    """True when a wav file already has the target rate, channel count and sample width."""
+    try:
+        with wave.open(wav_path, 'rb') as wf:
+            return (wf.getframerate() == TARGET_SAMPLE_RATE and wf.getnchannels() == TARGET_CHANNELS
+                    and wf.getsampwidth() == TARGET_SAMPLE_WIDTH)
+    except (wave.Error, EOFError):
+        return False
+
+def _ffmpeg_normalize(audio_path: str, out_path: str) -> bool:
+    """Decode and resample with ffmpeg straight to out_path, without loading the file in Python."""
+    ffmpeg = which('ffmpeg') or which('avconv')
+    if not ffmpeg:
+        return False
+    cmd = [ffmpeg, '-nostdin', '-loglevel', 'error', '-y', '-i', audio_path,
+           '-ac', str(TARGET_CHANNELS), '-ar', str(TARGET_SAMPLE_RATE),
+           '-sample_fmt', 's16', '-f', 'wav', out_path]
+    return subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE).returncode == 0
+
+@metrics.timed('audio.decode')
+def convert_to_wav(audio_path, normalize: bool = True):
+    """Convert audio file to WAV format. Returns (wav_path, created_temp: bool).
+
+    With ``normalize`` (the default) the output is 16 kHz mono 16-bit, the
+    format recognizers expect; a wav already in that format is used as is.
+    Conversion is streamed through ffmpeg when available, otherwise done in
+    memory with pydub.
+    """
+    is_wav = audio_path.lower().endswith('.wav')
+    if is_wav and (not normalize or _is_normalized_wav(audio_path)):
         return audio_path, False
-    audio = AudioSegment.from_file(audio_path)
-    temp_wav = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-    audio.export(temp_wav.name, format='wav')
-    return temp_wav.name, True
+    temp_wav = scratch.path('.wav')
+    if normalize and _ffmpeg_normalize(audio_path, temp_wav):
+        return temp_wav, True
+    audio = AudioSegment.from_wav(audio_path) if is_wav else AudioSegment.from_file(audio_path)
+    if normalize:
+        audio = (audio.set_channels(TARGET_CHANNELS)
+                 .set_frame_rate(TARGET_SAMPLE_RATE)
+                 .set_sample_width(TARGET_SAMPLE_WIDTH))
+    audio.export(temp_wav, format='wav')
+    return temp_wav, True
+
+def _source_buffer(source) -> Tuple[memoryview, str]:
+    """Zero-copy view of an in-memory upload, plus a format hint from its file name."""
+    fmt = os.path.splitext(getattr(source, 'name', '') or '')[1].lstrip('.').lower()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source), fmt
+    getbuffer = getattr(source, 'getbuffer', None)
+    if getbuffer is not None:
+        return getbuffer(), fmt
+    return memoryview(source.read()), fmt
+
+def _wav_header(buf: memoryview) -> Optional[Tuple[int, int, int, int, int]]:
+    """(channels, frame_rate, sample_width, data_offset, data_length) of a PCM WAV buffer, else None."""
+    if len(buf) < 12 or bytes(buf[0:4]) != b'RIFF' or bytes(buf[8:12]) != b'WAVE':
+        return None
+    pos, fmt = 12, None
+    while pos + 8 <= len(buf):
+        chunk_id = bytes(buf[pos:pos + 4])
+        (size,) = struct.unpack_from('<I', buf, pos + 4)
+        body = pos + 8
+        if chunk_id == b'fmt ' and size >= 16:
+            tag, channels, rate, _, _, bits = struct.unpack_from('<HHIIHH', buf, body)
+            if tag not in (1, 0xFFFE) or bits % 8:
+                return None
+            fmt = (channels, rate, bits // 8)
+        elif chunk_id == b'data':
+            if fmt is None:
+                return None
+            # Streamed WAVs may leave the data size at 0 or 0xFFFFFFFF
+            length = len(buf) - body if size in (0, 0xFFFFFFFF) else min(size, len(buf) - body)
+            return fmt + (body, length - length % (fmt[0] * fmt[2]))
+        pos = body + size + (size & 1)
+    return None
+
+def _ffmpeg_decode_buffer(buf: memoryview) -> Optional[bytes]:
+    """Pipe an encoded buffer through ffmpeg and return target-format PCM, or None if that fails."""
+    ffmpeg = which('ffmpeg') or which('avconv')
+    if not ffmpeg:
+        return None
+    cmd = [ffmpeg, '-nostdin', '-loglevel', 'error', '-i', 'pipe:0',
+           '-ac', str(TARGET_CHANNELS), '-ar', str(TARGET_SAMPLE_RATE), '-f', 's16le', 'pipe:1']
+    proc = subprocess.run(cmd, input=buf, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    return proc.stdout if proc.returncode == 0 and proc.stdout else None
+
+def decode_audio(source: AudioSource, normalize: bool = True) -> AudioSegment:
+    """Decode a path, bytes-like buffer or binary file object into an ``AudioSegment``.
+
+    In-memory uploads are decoded from their buffer without writing them out:
+    a WAV already in the target format (or any PCM WAV with ``normalize``
+    off) is wrapped directly, anything else is piped through ffmpeg. Only
+    when that is not possible (no ffmpeg, or a container ffmpeg cannot read
+    from a pipe) is the upload spilled to the scratch directory.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        wav_path, created_temp = convert_to_wav(os.fspath(source), normalize=normalize)
+        try:
+            return AudioSegment.from_wav(wav_path)
+        finally:
+            if created_temp:
+                scratch.remove(wav_path)
+    buf, fmt = _source_buffer(source)
+    with metrics.span('audio.decode', bytes=len(buf)):
+        header = _wav_header(buf)
+        if header and (not normalize or header[:3] == (TARGET_CHANNELS, TARGET_SAMPLE_RATE, TARGET_SAMPLE_WIDTH)):
+            channels, rate, width, offset, length = header
+            return AudioSegment(data=bytes(buf[offset:offset + length]), sample_width=width,
+                                frame_rate=rate, channels=channels)
+        if normalize:
+            pcm = _ffmpeg_decode_buffer(buf)
+            if pcm is not None:
+                return AudioSegment(data=pcm, sample_width=TARGET_SAMPLE_WIDTH,
+                                    frame_rate=TARGET_SAMPLE_RATE, channels=TARGET_CHANNELS)
+    metrics.incr('audio.upload_spills')
+    spilled = scratch.spill(buf, suffix=f'.{fmt}' if fmt else '', prefix='upload')
+    try:
+        return decode_audio(spilled, normalize=normalize)
+    finally:
+        scratch.remove(spilled)
+
+@metrics.timed('audio.vad')
+def detect_speech_spans(audio: AudioSegment, frame_ms: int = 30, silence_thresh_db: Optional[float] = None,
+                        min_silence_ms: int = 1000, pad_ms: int = 200) -> List[Tuple[int, int]]:
+    """Voice-activity detection over decoded PCM using per-frame RMS energy.
+
+    Returns (start_ms, end_ms) spans of the original timeline that contain
+    sound. Frames quieter than ``silence_thresh_db`` dBFS (default: 16 dB
+    below the clip's average loudness) count as silence; only silent runs of
+    at least ``min_silence_ms`` are dropped, and kept spans are padded by
+    ``pad_ms`` so word onsets are not clipped.
+    """
+    total = len(audio)
+    if total == 0 or audio.rms == 0:
+        return []
+    if silence_thresh_db is None:
+        silence_thresh_db = audio.dBFS - 16
+    samples = np.asarray(audio.get_array_of_samples(), dtype=np.float32)
+    if audio.channels > 1:
+        samples = samples.reshape(-1, audio.channels).mean(axis=1)
+    frame_len = max(1, int(audio.frame_rate * frame_ms / 1000))
+    n_frames = -(-len(samples) // frame_len)
+    samples = np.pad(samples, (0, n_frames * frame_len - len(samples)))
+    rms = np.sqrt(np.mean(np.square(samples.reshape(n_frames, frame_len)), axis=1))
+    threshold = audio.max_possible_amplitude * 10 ** (silence_thresh_db / 20)
+    voiced = rms > threshold
+    if not voiced.any():
+        return []
+    # Run boundaries of the voiced mask, as frame indices [start, end)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+    spans: List[Tuple[int, int]] = []
+    for start_f, end_f in zip(edges[::2], edges[1::2]):
+        start = max(0, int(start_f) * frame_ms - pad_ms)
+        end = min(total, int(end_f) * frame_ms + pad_ms)
+        if spans and start - spans[-1][1] < min_silence_ms:
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+    return spans
+
+def _plan_chunks(total_ms: int, chunk_ms: int = 60000, overlap_ms: int = 1000,
+                 spans: Optional[List[Tuple[int, int]]] = None) -> List[Tuple[int, int]]:
+    """Plan (start_ms, end_ms) chunk ranges, optionally only inside speech spans.
+
+    Each span is cut into pieces of at most ``chunk_ms``; pieces after the
+    first in a span start ``overlap_ms`` early to avoid boundary loss.
+    """
+    ranges: List[Tuple[int, int]] = []
+    for span_start, span_end in (spans if spans is not None else [(0, total_ms)]):
+        start = span_start
+        while start < span_end:
+            end = min(start + chunk_ms, span_end)
+            if start != span_start and overlap_ms > 0:
+                # add slight overlap at beginning to avoid boundary loss
+                ranges.append((max(span_start, start - overlap_ms), end))
+            else:
+                ranges.append((start, end))
+            start = end
+    return ranges
+
+@metrics.timed('audio.chunk')
+def _export_chunks(audio: AudioSegment, ranges: List[Tuple[int, int]]) -> List[str]:
+    """Export each (start_ms, end_ms) range of audio to a scratch wav. Returns list of paths."""
+    chunks: List[str] = []
+    for start, end in ranges:
+        chunk_path = scratch.path('.wav', prefix='chunk')
+        audio[start:end].export(chunk_path, format='wav')
+        chunks.append(chunk_path)
+    return chunks
 
 def _split_to_chunks(wav_path: str, chunk_ms: int = 60000, overlap_ms: int = 1000) -> List[str]:
     """Split wav file path into fixed-size chunks with small overlap. Returns list of temp wav paths."""
     audio = AudioSegment.from_wav(wav_path)
-    chunks: List[str] = []
-    start = 0
-    total = len(audio)
-    while start < total:
-        end = min(start + chunk_ms, total)
-        seg = audio[start:end]
-        if start != 0 and overlap_ms > 0:
-            # add slight overlap at beginning to avoid boundary loss
-            seg = audio[max(0, start - overlap_ms):end]
-        tmp = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-        seg.export(tmp.name, format='wav')
-        chunks.append(tmp.name)
-        start = end
-    return chunks
+    return _export_chunks(audio, _plan_chunks(len(audio), chunk_ms, overlap_ms))
 
-def transcribe_audio(audio_path: str, on_progress: Optional[Callable[[float], None]] = None) -> Optional[str]:
-    """Transcribe audio file to text using Google Speech Recognition with chunking.
+class RecognitionResult(NamedTuple):
+    """Text recognized for one audio chunk."""
+    text: str
+    confidence: float = 1.0
 
-    on_progress: optional callback receiving float in [0,1] to report progress.
+class RecognizerBackend:
+    """Speech recognizer interface used by ``transcribe_audio``.
+
+    Backends decode a batch of WAV chunk paths per call and return one
+    result per path (``None`` when nothing could be recognized). ``batch_size``
+    is how many chunks ``transcribe_audio`` hands over at once.
     """
-    wav_path, created_temp = convert_to_wav(audio_path)
-    recognizer = sr.Recognizer()
-    parts: List[str] = []
-    chunk_paths: List[str] = []
-    try:
-        chunk_paths = _split_to_chunks(wav_path, chunk_ms=60000, overlap_ms=800)
-        total = len(chunk_paths)
-        for idx, path in enumerate(chunk_paths, start=1):
+    name = 'base'
+    batch_size = 1
+
+    def recognize_batch(self, paths: List[str]) -> List[Optional[RecognitionResult]]:
+        raise NotImplementedError
+
+class GoogleBackend(RecognizerBackend):
+    """Google Web Speech API via speech_recognition (network, one request per chunk)."""
+    name = 'google'
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def recognize_batch(self, paths: List[str]) -> List[Optional[RecognitionResult]]:
+        results: List[Optional[RecognitionResult]] = []
+        for path in paths:
             try:
                 with sr.AudioFile(path) as source:
-                    # Optionally adjust for ambient noise per chunk
-                    audio = recognizer.record(source)
-                    text = recognizer.recognize_google(audio)
-                    parts.append(text)
+                    audio = self.recognizer.record(source)
+                response = self.recognizer.recognize_google(audio, show_all=True)
             except Exception as e:
-                print(f"Chunk {idx}/{total} transcription error: {str(e)}")
-                # Keep going; insert placeholder or skip
+                print(f"Google recognition error for {os.path.basename(path)}: {str(e)}")
+                results.append(None)
+                continue
+            alternatives = response.get('alternative') if isinstance(response, dict) else None
+            if not alternatives:
+                results.append(None)
                 continue
-            finally:
-                if on_progress:
-                    try:
-                        on_progress(min(idx / total, 1.0))
-                    except Exception:
-                        pass
+            best = alternatives[0]
+            results.append(RecognitionResult(best.get('transcript', ''), float(best.get('confidence', 1.0))))
+        return results
+
+class VoskBackend(RecognizerBackend):
+    """Offline recognition with a local Vosk (Kaldi) model.
+
+    The model is loaded once and shared; each batch is decoded concurrently
+    on a thread pool since the Kaldi decoder releases the GIL. The model
+    directory comes from ``model_path`` or the ``VOSK_MODEL_PATH`` env var.
+    """
+    name = 'vosk'
+
+    def __init__(self, model_path: Optional[str] = None, batch_size: int = 4):
+        try:
+            import vosk
+        except ImportError as e:
+            raise RuntimeError("Vosk backend requires the 'vosk' package (pip install vosk)") from e
+        model_path = model_path or os.environ.get('VOSK_MODEL_PATH')
+        if not model_path:
+            raise RuntimeError("Set VOSK_MODEL_PATH to a downloaded Vosk model directory")
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self.model = vosk.Model(model_path)
+        self.batch_size = batch_size
+        self._pool = ThreadPoolExecutor(max_workers=batch_size)
+
+    def _decode(self, path: str) -> Optional[RecognitionResult]:
+        with wave.open(path, 'rb') as wf:
+            rec = self._vosk.KaldiRecognizer(self.model, wf.getframerate())
+            rec.SetWords(True)
+            while True:
+                data = wf.readframes(8000)
+                if not data:
+                    break
+                rec.AcceptWaveform(data)
+        result = json.loads(rec.FinalResult())
+        text = result.get('text', '').strip()
+        if not text:
+            return None
+        words = result.get('result') or []
+        confidence = sum(w.get('conf', 1.0) for w in words) / len(words) if words else 1.0
+        return RecognitionResult(text, confidence)
+
+    def recognize_batch(self, paths: List[str]) -> List[Optional[RecognitionResult]]:
+        return list(self._pool.map(self._decode, paths))
+
+class StubBackend(RecognizerBackend):
+    """Deterministic offline recognizer for tests and benchmarks.
+
+    Returns a fixed phrase describing each chunk's duration, optionally
+    sleeping ``latency`` seconds per batch to mimic a real decoder.
+    """
+    name = 'stub'
+
+    def __init__(self, latency: float = 0.0, batch_size: int = 8):
+        self.latency = latency
+        self.batch_size = batch_size
+
+    def recognize_batch(self, paths: List[str]) -> List[Optional[RecognitionResult]]:
+        if self.latency:
+            time.sleep(self.latency)
+        results: List[Optional[RecognitionResult]] = []
+        for path in paths:
+            with wave.open(path, 'rb') as wf:
+                duration_ms = int(wf.getnframes() * 1000 / wf.getframerate())
+            results.append(RecognitionResult(f"stub transcript of {duration_ms} ms", 1.0))
+        return results
+
+BACKENDS: Dict[str, Type[RecognizerBackend]] = {
+    'google': GoogleBackend,
+    'vosk': VoskBackend,
+    'stub': StubBackend,
+}
+
+def get_backend(name: Optional[str] = None, **kwargs) -> RecognizerBackend:
+    """Instantiate a recognizer backend by name (default: ``MEETING_ASR_BACKEND`` env var or 'google')."""
+    name = (name or os.environ.get('MEETING_ASR_BACKEND') or 'google').lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown recognizer backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
+
+_SHARED_BACKENDS: Dict[str, RecognizerBackend] = {}
+_SHARED_LOCK = threading.Lock()
+
+def shared_backend(name: Optional[str] = None) -> RecognizerBackend:
+    """Process-wide recognizer per backend name, created on first use (see ``get_backend``).
+
+    Loading a recognizer (a Vosk model in particular) is the slow part of a
+    first transcription, so ``transcribe_audio`` and the warm-up in
+    ``warmup.py`` share one instance instead of building one per call.
+    """
+    name = (name or os.environ.get('MEETING_ASR_BACKEND') or 'google').lower()
+    backend = _SHARED_BACKENDS.get(name)
+    if backend is None:
+        with _SHARED_LOCK:
+            backend = _SHARED_BACKENDS.get(name)
+            if backend is None:
+                backend = _SHARED_BACKENDS[name] = get_backend(name)
+    return backend
+
+class TranscriptSegment(NamedTuple):
+    """A piece of transcript with its position on the original audio timeline."""
+    start_ms: int
+    end_ms: int
+    text: str
+    confidence: float
+
+def _recognize_ranges(audio: AudioSegment, ranges: List[Tuple[int, int]], backend: RecognizerBackend,
+                      on_progress: Optional[Callable[[float], None]] = None) -> List[TranscriptSegment]:
+    """Recognize the given (start_ms, end_ms) ranges of audio, batch by batch.
+
+    Returns one segment per range that produced text, in range order.
+    """
+    segments: List[TranscriptSegment] = []
+    total = len(ranges)
+    batch_size = max(1, backend.batch_size)
+    for offset in range(0, total, batch_size):
+        batch = ranges[offset:offset + batch_size]
+        # Export one batch at a time so temp disk use stays bounded
+        paths = _export_chunks(audio, batch)
+        try:
+            with metrics.span('audio.recognize', backend=backend.name, batch=len(paths)):
+                results = backend.recognize_batch(paths)
+        except Exception as e:
+            metrics.incr('audio.chunks_failed', len(batch))
+            print(f"Chunks {offset + 1}-{offset + len(batch)}/{total} transcription error: {str(e)}")
+            # Keep going; skip this batch
+            results = []
+        finally:
+            for p in paths:
+                scratch.remove(p)
+            if on_progress:
+                try:
+                    on_progress(min((offset + len(batch)) / total, 1.0))
+                except Exception:
+                    pass
+        metrics.incr('audio.chunks_recognized', len(results))
+        for (start, end), result in zip(batch, results):
+            if result and result.text:
+                segments.append(TranscriptSegment(start, end, result.text.strip(), result.confidence))
+    return segments
+
+def transcribe_audio(audio_path: AudioSource, on_progress: Optional[Callable[[float], None]] = None,
+                     backend: Optional[RecognizerBackend] = None, vad: bool = True,
+                     normalize: bool = True, return_segments: bool = False
+                     ) -> Union[str, List[TranscriptSegment], None]:
+    """Transcribe audio file to text with chunking.
+
+    audio_path: a file path, or the upload itself as bytes, a memoryview or a
+    binary file object (decoded in memory, see ``decode_audio``).
+    on_progress: optional callback receiving float in [0,1] to report progress.
+    backend: recognizer to use; defaults to ``shared_backend()`` (Google unless
+    ``MEETING_ASR_BACKEND`` says otherwise). Chunks are handed to the backend
+    ``backend.batch_size`` at a time.
+    vad: skip silent stretches (see ``detect_speech_spans``) instead of
+    sending them to the recognizer.
+    normalize: resample to 16 kHz mono 16-bit before chunking (see ``convert_to_wav``).
+    return_segments: return a list of ``TranscriptSegment`` (times on the
+    original recording) instead of one joined string.
+    """
+    try:
+        if backend is None:
+            backend = shared_backend()
+        audio = decode_audio(audio_path, normalize=normalize)
+        spans = detect_speech_spans(audio) if vad else None
+        ranges = _plan_chunks(len(audio), chunk_ms=60000, overlap_ms=800, spans=spans)
+        segments = _recognize_ranges(audio, ranges, backend, on_progress=on_progress)
     except Exception as e:
         print(f"Error preparing audio for transcription: {str(e)}")
         return None
-    finally:
-        # Cleanup temp chunk files
-        for p in chunk_paths:
-            try:
-                os.unlink(p)
-            except Exception:
-                pass
-        if created_temp:
-            try:
-                os.unlink(wav_path)
-            except Exception:
-                pass
 
-    return ' '.join(parts).strip() if parts else None
\ No newline at end of file
+    if not segments:
+        return None
+    if return_segments:
+        return segments
+    return segments_to_text(segments)
+
+def segments_to_text(segments: List[TranscriptSegment]) -> str:
+    """Join segment texts into the flat transcript ``transcribe_audio`` returns."""
+    return ' '.join(seg.text for seg in segments).strip()
+
+def retranscribe_segments(audio_path: AudioSource, segments: List[TranscriptSegment], min_confidence: float = 0.6,
+                          backend: Optional[RecognizerBackend] = None, normalize: bool = True
+                          ) -> List[TranscriptSegment]:
+    """Re-run recognition only for segments below ``min_confidence``.
+
+    Segments whose new result is more confident replace the old ones; all
+    others are kept, so a retry costs time proportional to the weak segments
+    rather than the whole recording.
+    """
+    weak = [i for i, seg in enumerate(segments) if seg.confidence < min_confidence]
+    if not weak:
+        return list(segments)
+    if backend is None:
+        backend = shared_backend()
+    audio = decode_audio(audio_path, normalize=normalize)
+    ranges = [(segments[i].start_ms, segments[i].end_ms) for i in weak]
+    redone = {(seg.start_ms, seg.end_ms): seg for seg in _recognize_ranges(audio, ranges, backend)}
+    updated = list(segments)
+    for i in weak:
+        new = redone.get((segments[i].start_ms, segments[i].end_ms))
+        if new and new.confidence > segments[i].confidence:
+            updated[i] = new
+    return updated
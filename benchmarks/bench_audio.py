@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the audio transcription path using the offline stub recognizer.
+
+Synthesizes a meeting-like recording of configurable length and format, then
+measures convert_to_wav (decode), _split_to_chunks (chunking) and
+transcribe_audio end to end, reporting time, temp disk bytes written and
+peak RSS. The recognizer is the stub backend with configurable latency, so
+runs are reproducible and need no network.
+
+Usage:
+    python benchmarks/bench_audio.py --seconds 600 --format mp3 --latency 0.2
+    python benchmarks/bench_audio.py --compare-normalize --rate 48000 --channels 2
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+import audio_processor
+
+
+def synthesize_recording(seconds: int, rate: int, channels: int, pause_ms: int = 2000) -> AudioSegment:
+    """Build a meeting-like recording: 8 s tone bursts ("speech") separated by pauses."""
+    burst = Sine(220).to_audio_segment(duration=8000, volume=-18)
+    pause = AudioSegment.silent(duration=pause_ms)
+    block = (burst + pause).set_frame_rate(rate).set_channels(channels).set_sample_width(2)
+    repeats = max(1, -(-seconds * 1000 // len(block)))
+    return (block * repeats)[:seconds * 1000]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+class _ByteCounter:
+    """Wraps convert_to_wav and _export_chunks to total the bytes they write to temp storage."""
+
+    def __init__(self):
+        self.bytes_written = 0
+        self._convert = audio_processor.convert_to_wav
+        self._export = audio_processor._export_chunks
+
+    def convert_to_wav(self, audio_path, normalize=True):
+        wav_path, created = self._convert(audio_path, normalize=normalize)
+        if created:
+            self.bytes_written += os.path.getsize(wav_path)
+        return wav_path, created
+
+    def export_chunks(self, audio, ranges):
+        paths = self._export(audio, ranges)
+        self.bytes_written += sum(os.path.getsize(p) for p in paths)
+        return paths
+
+    def __enter__(self):
+        audio_processor.convert_to_wav = self.convert_to_wav
+        audio_processor._export_chunks = self.export_chunks
+        return self
+
+    def __exit__(self, *exc):
+        audio_processor.convert_to_wav = self._convert
+        audio_processor._export_chunks = self._export
+
+
+def bench_stages(source_path: str, latency: float, batch_size: int, normalize: bool, vad: bool) -> dict:
+    """Time decode, chunking and end-to-end transcription of one file."""
+    result = {'normalize': normalize, 'vad': vad}
+
+    start = time.perf_counter()
+    wav_path, created = audio_processor.convert_to_wav(source_path, normalize=normalize)
+    result['decode_s'] = time.perf_counter() - start
+    try:
+        start = time.perf_counter()
+        chunk_paths = audio_processor._split_to_chunks(wav_path)
+        result['chunk_s'] = time.perf_counter() - start
+        result['chunks'] = len(chunk_paths)
+        result['chunk_bytes'] = sum(os.path.getsize(p) for p in chunk_paths)
+        for p in chunk_paths:
+            os.unlink(p)
+    finally:
+        if created:
+            os.unlink(wav_path)
+
+    backend = audio_processor.StubBackend(latency=latency, batch_size=batch_size)
+    with _ByteCounter() as counter:
+        start = time.perf_counter()
+        segments = audio_processor.transcribe_audio(source_path, backend=backend, vad=vad,
+                                                    normalize=normalize, return_segments=True)
+        result['end_to_end_s'] = time.perf_counter() - start
+    result['recognized_segments'] = len(segments or [])
+    result['temp_bytes_written'] = counter.bytes_written
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the audio transcription path offline')
+    parser.add_argument('--seconds', type=int, default=600, help='Length of the synthesized recording')
+    parser.add_argument('--format', default='wav', help='Container for the synthesized file (wav, mp3, flac, ogg; non-wav needs ffmpeg)')
+    parser.add_argument('--rate', type=int, default=48000, help='Source sample rate')
+    parser.add_argument('--channels', type=int, default=2, help='Source channel count')
+    parser.add_argument('--pause-ms', type=int, default=2000, help='Silence between speech bursts')
+    parser.add_argument('--latency', type=float, default=0.0, help='Stub recognizer latency per batch, seconds')
+    parser.add_argument('--batch-size', type=int, default=8, help='Stub recognizer batch size')
+    parser.add_argument('--input', help='Benchmark this audio file instead of a synthesized one')
+    parser.add_argument('--compare-normalize', action='store_true',
+                        help='Also run without normalization and VAD for comparison')
+    parser.add_argument('--output', '-o', help='Write results as JSON')
+    args = parser.parse_args()
+
+    source_path = args.input
+    created = False
+    if not source_path:
+        tmp = tempfile.NamedTemporaryFile(suffix=f'.{args.format}', delete=False)
+        tmp.close()
+        synthesize_recording(args.seconds, args.rate, args.channels, args.pause_ms).export(tmp.name, format=args.format)
+        source_path, created = tmp.name, True
+
+    runs = [(True, True)]
+    if args.compare_normalize:
+        runs = [(False, False), (False, True), (True, True)]
+    results = []
+    try:
+        print(f"Source: {source_path} ({os.path.getsize(source_path) / 1e6:.1f} MB)")
+        for normalize, vad in runs:
+            r = bench_stages(source_path, args.latency, args.batch_size, normalize, vad)
+            results.append(r)
+            print(f"normalize={str(normalize):5} vad={str(vad):5}  decode={r['decode_s']:.2f}s  "
+                  f"chunk={r['chunk_s']:.2f}s ({r['chunks']} chunks)  end-to-end={r['end_to_end_s']:.2f}s  "
+                  f"temp written={r['temp_bytes_written'] / 1e6:.1f} MB  peak RSS={r['peak_rss_mb']:.0f} MB")
+    finally:
+        if created:
+            os.unlink(source_path)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'runs': results}, f, indent=2)
+        print(f"Saved results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
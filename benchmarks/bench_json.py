@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Benchmark and fuzz check for JSON extraction in utils.
+
+Times ``extract_json_from_text`` and streaming ``iter_json_blocks`` on
+multi-MB synthetic model outputs: a large action-item array wrapped in
+prose, many small blocks, adversarial text full of unmatched brackets
+(the shape that made the old greedy regexes backtrack), many tiny
+balanced blocks that are not JSON (each one a failed decode) and a run of
+openers followed by closers of the other type (none has an opener).
+``--legacy`` also times the previous regex implementation, with a time
+limit per input. ``--fuzz N`` runs N randomized cases, with runs of stray
+closers in the prose, checking that chunked streaming finds the same
+blocks as a one-shot scan and that embedded JSON is recovered.
+
+Usage:
+    python benchmarks/bench_json.py --sizes 1M,8M --legacy
+    python benchmarks/bench_json.py --fuzz 2000
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import extract_json_from_text, iter_json_blocks
+from bench_nlp import parse_size
+
+_PROSE = ("Sure! Here are the action items I found (see notes [1] and [2]). "
+          "Owners' names are taken from the speaker labels; \"deadline\" is as stated. ")
+
+
+def legacy_extract(text: str):
+    """The previous regex-based implementation, kept for comparison."""
+    m = re.search(r'(\[\s*\{.*\}\s*\])', text, flags=re.S)
+    if not m:
+        m = re.search(r'(\{.*\})', text, flags=re.S)
+    if not m:
+        return None
+    json_text = m.group(1)
+    try:
+        return json.loads(json_text)
+    except Exception:
+        try:
+            return json.loads(json_text.replace("'", '"'))
+        except Exception:
+            return None
+
+
+def _item(rng: random.Random, i: int) -> dict:
+    return {'task': f'Follow up on item {i} [{rng.randint(0, 99)}] with "quotes" and {{braces}}',
+            'owner': rng.choice(['Mike', 'Sarah', 'Lisa', '']),
+            'deadline': rng.choice(['friday', 'next week', '']),
+            'priority': rng.choice(['High', 'Medium', 'Low'])}
+
+
+def big_array(size: int, rng: random.Random) -> str:
+    items, length, i = [], 0, 0
+    while length < size:
+        item = _item(rng, i)
+        items.append(item)
+        length += len(json.dumps(item)) + 2
+        i += 1
+    return _PROSE + json.dumps(items, indent=1) + '\n\nLet me know if you need anything else.'
+
+
+def many_blocks(size: int, rng: random.Random) -> str:
+    parts, length, i = [], 0, 0
+    while length < size:
+        part = f'{_PROSE}{json.dumps(_item(rng, i))}\n'
+        parts.append(part)
+        length += len(part)
+        i += 1
+    return ''.join(parts)
+
+
+def adversarial(size: int, rng: random.Random) -> str:
+    """Unclosed "[{" openers and stray "}" with no valid JSON."""
+    unit = '[{ "a": 1 } x '
+    return unit * (size // len(unit))
+
+
+def invalid_blocks(size: int, rng: random.Random) -> str:
+    """Many tiny balanced blocks that are not JSON ("[x]", "[{]"), one per line."""
+    unit = '[x]\n[{]\n'
+    return unit * (size // len(unit))
+
+
+def stray_closers(size: int, rng: random.Random) -> str:
+    """A run of "[" then a run of "}": no closer matches any of the open brackets."""
+    return '[' * (size // 2) + '}' * (size // 2)
+
+
+INPUTS = {'big_array': big_array, 'many_blocks': many_blocks, 'adversarial': adversarial,
+          'invalid_blocks': invalid_blocks, 'stray_closers': stray_closers}
+
+
+def _timed(fn, text):
+    start = time.perf_counter()
+    fn(text)
+    return time.perf_counter() - start
+
+
+def _legacy_worker(text, queue):
+    queue.put(_timed(legacy_extract, text))
+
+
+def time_legacy(text: str, limit: float):
+    """Legacy timing in a subprocess so a catastrophic case can be cut off."""
+    queue = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=_legacy_worker, args=(text, queue))
+    proc.start()
+    proc.join(limit)
+    if proc.is_alive():
+        proc.terminate()
+        proc.join()
+        return None
+    return queue.get()
+
+
+def run_benchmark(sizes, legacy: bool, limit: float) -> None:
+    rng = random.Random(0)
+    print(f"{'input':<14} {'size':>8} {'first (s)':>10} {'all (s)':>9} {'MB/s':>8} {'blocks':>7}"
+          + (f" {'legacy (s)':>11}" if legacy else ''))
+    for size in sizes:
+        for name, make in INPUTS.items():
+            text = make(size, rng)
+            mb = len(text) / (1 << 20)
+            first = _timed(extract_json_from_text, text)
+            start = time.perf_counter()
+            blocks = sum(1 for _ in iter_json_blocks(text))
+            total = time.perf_counter() - start
+            line = f"{name:<14} {mb:>7.1f}M {first:>10.3f} {total:>9.3f} {mb / total:>8.1f} {blocks:>7}"
+            if legacy:
+                old = time_legacy(text, limit)
+                line += f" {old:>11.3f}" if old is not None else f" {'>' + str(limit):>11}"
+            print(line)
+
+
+def _random_json(rng: random.Random, depth: int = 0):
+    kind = rng.random()
+    if depth > 3 or kind < 0.3:
+        return rng.choice([rng.randint(-99, 99), 'x]y', 'a"b', 'c\\d', '{', '', True, None, 1.5])
+    if kind < 0.65:
+        return [_random_json(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {f'k{i}': _random_json(rng, depth + 1) for i in range(rng.randint(0, 4))}
+
+
+def _noise(rng: random.Random) -> str:
+    return ''.join(rng.choice(['word ', "it's ", '"quote" ', '(', ')', '] ', '} ', '\n', 'x: ', '}}}}} ', ']]]] '])
+                   for _ in range(rng.randint(0, 8)))
+
+
+def run_fuzz(cases: int, seed: int) -> int:
+    rng = random.Random(seed)
+    failures = 0
+    for case in range(cases):
+        blocks = [_random_json(rng) for _ in range(rng.randint(1, 4))]
+        blocks = [b if isinstance(b, (list, dict)) else [b] for b in blocks]
+        text = ''.join(_noise(rng) + json.dumps(b) for b in blocks) + _noise(rng)
+        one_shot = list(iter_json_blocks(text))
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(1, 12))))
+        pieces = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        streamed = list(iter_json_blocks(iter(pieces)))
+        ok = streamed == one_shot and all(b in one_shot for b in blocks)
+        if not ok:
+            failures += 1
+            if failures <= 5:
+                print(f'case {case}: expected {blocks!r}\n  one-shot {one_shot!r}\n  streamed {streamed!r}\n  text {text!r}')
+    print(f'{cases - failures}/{cases} fuzz cases passed')
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark and fuzz utils JSON extraction')
+    parser.add_argument('--sizes', default='1M,8M', help='Comma-separated input sizes, e.g. 1M,8M')
+    parser.add_argument('--legacy', action='store_true', help='Also time the old regex implementation')
+    parser.add_argument('--limit', type=float, default=10.0, help='Seconds before a legacy run is cut off')
+    parser.add_argument('--fuzz', type=int, default=0, help='Run this many fuzz cases instead of the benchmark')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.fuzz:
+        sys.exit(1 if run_fuzz(args.fuzz, args.seed) else 0)
+    run_benchmark([parse_size(s) for s in args.sizes.split(',')], args.legacy, args.limit)
+
+
+if __name__ == '__main__':
+    main()
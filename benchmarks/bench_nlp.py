@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the NLP pipeline in nlp_summarizer.
+
+Times each stage on synthetic transcripts of increasing size and reports
+throughput (MB/s), peak traced memory and the scaling exponent between the
+smallest and largest size. Results can be saved as JSON and compared
+against a previous run to catch regressions between commits.
+
+Usage:
+    python benchmarks/bench_nlp.py --sizes 1K,10K,100K,1M --output bench_nlp.json
+    python benchmarks/bench_nlp.py --compare bench_nlp.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nlp_summarizer
+from synthetic_transcript import generate_transcript
+
+STAGES = [
+    'extract_sentences',
+    'extract_speakers',
+    'calculate_word_frequency',
+    'generate_summary',
+    'analyze_meeting_insights',
+    'enhanced_action_extraction',
+]
+
+_UNITS = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper().rstrip('B')
+    if text and text[-1] in _UNITS:
+        return int(float(text[:-1]) * _UNITS[text[-1]])
+    return int(text)
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return 'unknown'
+
+
+def time_stage(fn, transcript: str, repeat: int) -> float:
+    """Best-of-``repeat`` wall time in seconds."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(transcript)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(fn, transcript: str) -> int:
+    """Peak bytes allocated by one call, measured separately so tracing doesn't skew timings."""
+    tracemalloc.start()
+    try:
+        fn(transcript)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, repeat: int, speakers: int, action_density: float, decision_density: float,
+        stages=STAGES) -> dict:
+    results = {stage: [] for stage in stages}
+    for size in sizes:
+        transcript = generate_transcript(size, speakers, action_density, decision_density)
+        nbytes = len(transcript.encode('utf-8'))
+        for stage in stages:
+            fn = getattr(nlp_summarizer, stage)
+            seconds = time_stage(fn, transcript, repeat)
+            results[stage].append({
+                'bytes': nbytes,
+                'seconds': seconds,
+                'mb_per_s': nbytes / (1 << 20) / seconds if seconds else math.inf,
+                'peak_bytes': peak_memory(fn, transcript),
+            })
+            print(f"{stage:28} {nbytes:>12,} B  {seconds * 1000:10.2f} ms  "
+                  f"{results[stage][-1]['mb_per_s']:8.2f} MB/s  "
+                  f"peak {results[stage][-1]['peak_bytes'] / (1 << 20):8.2f} MB", flush=True)
+    for stage, points in results.items():
+        if len(points) > 1 and points[0]['seconds'] > 0:
+            first, last = points[0], points[-1]
+            exponent = math.log(last['seconds'] / first['seconds']) / math.log(last['bytes'] / first['bytes'])
+        else:
+            exponent = None
+        results[stage] = {'points': points, 'scaling_exponent': exponent}
+    return {
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {'repeat': repeat, 'speakers': speakers, 'action_density': action_density,
+                   'decision_density': decision_density},
+        'stages': results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> int:
+    """Print per-stage time ratios against a baseline. Returns the number of regressions."""
+    regressions = 0
+    print(f"\nComparing {current['revision']} against {baseline['revision']}")
+    for stage, data in current['stages'].items():
+        base = baseline['stages'].get(stage)
+        if not base:
+            continue
+        base_by_size = {p['bytes']: p for p in base['points']}
+        for point in data['points']:
+            ref = base_by_size.get(point['bytes'])
+            if not ref or not ref['seconds']:
+                continue
+            ratio = point['seconds'] / ref['seconds']
+            flag = ''
+            if ratio > 1 + tolerance:
+                flag = '  <-- regression'
+                regressions += 1
+            print(f"{stage:28} {point['bytes']:>12,} B  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark nlp_summarizer stages')
+    parser.add_argument('--sizes', default='1K,10K,100K,1M',
+                        help='Comma-separated transcript sizes, e.g. 1K,1M,100M')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions per stage (best is kept)')
+    parser.add_argument('--speakers', type=int, default=5)
+    parser.add_argument('--action-density', type=float, default=0.2)
+    parser.add_argument('--decision-density', type=float, default=0.1)
+    parser.add_argument('--stages', help=f"Comma-separated subset of: {', '.join(STAGES)}")
+    parser.add_argument('--output', '-o', help='Write results as JSON')
+    parser.add_argument('--compare', help='Baseline JSON from a previous run')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='Slowdown ratio above which a stage is flagged as a regression')
+    args = parser.parse_args()
+
+    stages = args.stages.split(',') if args.stages else STAGES
+    sizes = [parse_size(s) for s in args.sizes.split(',')]
+    current = run(sizes, args.repeat, args.speakers, args.action_density, args.decision_density, stages)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(current, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+In-process load generator for the Summarizer and TTS flows.
+
+Replays a weighted mix of the requests the pages make, each on its own
+thread as Streamlit runs one thread per session:
+
+- paste: insights, structured summary and action items of a pasted transcript
+- audio: transcription of an uploaded recording (stub recognizer) and action items
+- tts:   text_to_speech of an uploaded text (stub TTS engine)
+
+Concurrency is ramped in steps; each step reports throughput, error rate
+and latency percentiles (overall and per request kind). Resident memory is
+sampled throughout, so growth that survives a step shows up as a slope.
+The ramp stops early once a step breaks the latency or error budget, and
+the last step within budget is reported as the capacity of this process.
+Everything runs offline; ``benchmarks/load_streamlit.py`` drives a running
+app over HTTP instead.
+
+Usage:
+    python benchmarks/load_mix.py --mix paste=6,audio=2,tts=2 --concurrency 1,2,4,8 --step-seconds 20
+    python benchmarks/load_mix.py --paste-size 200K --audio-seconds 600 --asr-latency 0.2 --slo 10 -o load.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('MEETING_TTS_BACKEND', 'stub')
+
+import audio_processor
+import metrics
+import scratch
+import text_to_audio
+from nlp_summarizer import analyze_meeting_insights, extract_action_batch, generate_summary
+
+from bench_audio import synthesize_recording
+from bench_nlp import parse_size
+from synthetic_transcript import generate_transcript
+
+KINDS = ('paste', 'audio', 'tts')
+# Distinct inputs per kind, so caches don't answer repeated requests
+VARIANTS = 8
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        kind = kind.strip()
+        if kind not in KINDS:
+            raise argparse.ArgumentTypeError(f"Unknown request kind '{kind}'. Choose from: {', '.join(KINDS)}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+
+class Workload:
+    """Inputs for each request kind and the calls the pages make with them."""
+
+    def __init__(self, args):
+        self.backend = audio_processor.StubBackend(latency=args.asr_latency)
+        engine = text_to_audio.shared_engine()
+        if isinstance(engine, text_to_audio.StubEngine):
+            engine.latency = args.tts_latency
+        self.transcripts = [generate_transcript(args.paste_size, seed=i) for i in range(VARIANTS)]
+        self.texts = [generate_transcript(args.tts_size, seed=100 + i).encode('utf-8') for i in range(VARIANTS)]
+        self.recordings = []
+        for i in range(min(VARIANTS, 2)):
+            buf = io.BytesIO()
+            synthesize_recording(args.audio_seconds, args.audio_rate, 1, pause_ms=1500 + 500 * i).export(buf, format='wav')
+            self.recordings.append(buf.getvalue())
+
+    def paste(self, rng: random.Random) -> bool:
+        transcript = rng.choice(self.transcripts)
+        analyze_meeting_insights(transcript)
+        generate_summary(transcript, structured=True).to_html()
+        extract_action_batch(transcript, meeting_date=date.today()).to_dicts()
+        return True
+
+    def audio(self, rng: random.Random) -> bool:
+        segments = audio_processor.transcribe_audio(rng.choice(self.recordings), backend=self.backend,
+                                                    return_segments=True)
+        if not segments:
+            return False
+        extract_action_batch(audio_processor.segments_to_text(segments), segments=segments).to_dicts()
+        return True
+
+    def tts(self, rng: random.Random) -> bool:
+        out_path = text_to_audio.text_to_speech(rng.choice(self.texts))
+        scratch.remove(out_path)
+        return out_path is not None
+
+
+class Recorder:
+    """Request outcomes and memory samples, shared by the load threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.results: List[Tuple[float, str, float, bool]] = []  # (start offset, kind, seconds, ok)
+        self.memory: List[Tuple[float, int, float]] = []  # (offset, concurrency, rss MB)
+        self.started = time.perf_counter()
+        self.concurrency = 0
+
+    def add(self, start: float, kind: str, seconds: float, ok: bool) -> None:
+        with self.lock:
+            self.results.append((start - self.started, kind, seconds, ok))
+
+    def sample_memory(self, stop: threading.Event, interval: float) -> None:
+        while not stop.is_set():
+            self.memory.append((time.perf_counter() - self.started, self.concurrency, metrics.rss_mb()))
+            stop.wait(interval)
+
+
+def session(workload: Workload, recorder: Recorder, mix: Dict[str, float], deadline: float, seed: int) -> None:
+    rng = random.Random(seed)
+    kinds, weights = list(mix), list(mix.values())
+    calls: Dict[str, Callable[[random.Random], bool]] = {k: getattr(workload, k) for k in kinds}
+    while time.perf_counter() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        start = time.perf_counter()
+        try:
+            ok = calls[kind](rng)
+        except Exception as e:
+            print(f"{kind} request failed: {e}", file=sys.stderr)
+            ok = False
+        recorder.add(start, kind, time.perf_counter() - start, ok)
+
+
+def summarize_step(results: List[Tuple[float, str, float, bool]], concurrency: int, seconds: float,
+                   rss_mb: float, baseline_mb: float) -> dict:
+    latencies = sorted(r[2] for r in results)
+    errors = sum(1 for r in results if not r[3])
+    step = {
+        'concurrency': concurrency,
+        'requests': len(results),
+        'throughput_rps': len(results) / seconds if seconds else 0.0,
+        'error_rate': errors / len(results) if results else 0.0,
+        'p50_s': percentile(latencies, 0.50),
+        'p95_s': percentile(latencies, 0.95),
+        'p99_s': percentile(latencies, 0.99),
+        'max_s': latencies[-1] if latencies else 0.0,
+        'rss_mb': rss_mb,
+        'rss_growth_mb': rss_mb - baseline_mb,
+        'kinds': {},
+    }
+    for kind in KINDS:
+        values = sorted(r[2] for r in results if r[1] == kind)
+        if values:
+            step['kinds'][kind] = {'requests': len(values), 'p50_s': percentile(values, 0.50),
+                                   'p95_s': percentile(values, 0.95)}
+    return step
+
+
+def memory_slope(samples: List[Tuple[float, int, float]]) -> float:
+    """Least-squares RSS growth in MB per minute over the run."""
+    if len(samples) < 2:
+        return 0.0
+    xs = [s[0] for s in samples]
+    ys = [s[2] for s in samples]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    var = sum((x - mx) ** 2 for x in xs)
+    return 60 * sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var if var else 0.0
+
+
+def run(args) -> dict:
+    print("Preparing inputs...")
+    workload = Workload(args)
+    mix = {k: w for k, w in args.mix.items() if w > 0}
+    # One request of each kind first, so imports and first-call costs stay out of the steps
+    rng = random.Random(0)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for kind in mix:
+            getattr(workload, kind)(rng)
+
+    recorder = Recorder()
+    stop = threading.Event()
+    sampler = threading.Thread(target=recorder.sample_memory, args=(stop, args.sample_interval), daemon=True)
+    sampler.start()
+    baseline_mb = metrics.rss_mb()
+    steps = []
+    capacity = None
+    print(f"{'conc':>5} {'reqs':>6} {'req/s':>7} {'err %':>6} {'p50 (s)':>8} {'p95 (s)':>8} {'p99 (s)':>8} "
+          f"{'RSS MB':>8} {'growth':>7}  per-kind p95")
+    try:
+        for concurrency in args.concurrency:
+            recorder.concurrency = concurrency
+            first = len(recorder.results)
+            start = time.perf_counter()
+            deadline = start + args.step_seconds
+            threads = [threading.Thread(target=session, name=f'load-{i}',
+                                        args=(workload, recorder, mix, deadline, concurrency * 1000 + i))
+                       for i in range(concurrency)]
+            # The flows print a line per request; keep stdout for the report (failures go to stderr)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+            elapsed = time.perf_counter() - start
+            step = summarize_step(recorder.results[first:], concurrency, elapsed, metrics.rss_mb(), baseline_mb)
+            steps.append(step)
+            kinds = '  '.join(f"{k}={v['p95_s']:.2f}" for k, v in step['kinds'].items())
+            print(f"{concurrency:>5} {step['requests']:>6} {step['throughput_rps']:>7.2f} "
+                  f"{100 * step['error_rate']:>6.1f} {step['p50_s']:>8.3f} {step['p95_s']:>8.3f} "
+                  f"{step['p99_s']:>8.3f} {step['rss_mb']:>8.0f} {step['rss_growth_mb']:>+7.0f}  {kinds}")
+            if step['p95_s'] > args.slo or step['error_rate'] > args.max_error_rate:
+                print(f"Stopping ramp: p95 {step['p95_s']:.2f}s (budget {args.slo:g}s), "
+                      f"errors {100 * step['error_rate']:.1f}% (budget {100 * args.max_error_rate:g}%)")
+                break
+            capacity = step
+    finally:
+        stop.set()
+        sampler.join()
+
+    slope = memory_slope(recorder.memory)
+    peak = max((s[2] for s in recorder.memory), default=baseline_mb)
+    print(f"Memory: start {baseline_mb:.0f} MB, peak {peak:.0f} MB, end {metrics.rss_mb():.0f} MB, "
+          f"trend {slope:+.1f} MB/min")
+    if capacity:
+        print(f"Capacity within budget: {capacity['concurrency']} concurrent sessions, "
+              f"{capacity['throughput_rps']:.2f} req/s at p95 {capacity['p95_s']:.2f}s")
+    else:
+        print("No step met the latency/error budget")
+    return {
+        'config': {k: v for k, v in vars(args).items()},
+        'cpu_count': os.cpu_count(),
+        'steps': steps,
+        'capacity_concurrency': capacity['concurrency'] if capacity else 0,
+        'memory': {'baseline_mb': baseline_mb, 'peak_mb': peak, 'trend_mb_per_min': slope,
+                   'samples': [{'t_s': t, 'concurrency': c, 'rss_mb': m} for t, c, m in recorder.memory]},
+        'requests': [{'t_s': t, 'kind': k, 'latency_s': s, 'ok': ok} for t, k, s, ok in recorder.results],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ramp a mixed Summarizer/TTS workload in-process')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('paste=6,audio=2,tts=2'),
+                        help='Request kinds and weights, e.g. paste=6,audio=2,tts=2')
+    parser.add_argument('--concurrency', type=lambda s: [int(c) for c in s.split(',')], default=[1, 2, 4, 8],
+                        help='Concurrent sessions per step, e.g. 1,2,4,8,16')
+    parser.add_argument('--step-seconds', type=float, default=20, help='Duration of each step')
+    parser.add_argument('--paste-size', type=parse_size, default=parse_size('20K'), help='Pasted transcript size')
+    parser.add_argument('--audio-seconds', type=int, default=120, help='Length of uploaded recordings')
+    parser.add_argument('--audio-rate', type=int, default=16000,
+                        help='Sample rate of uploaded recordings (other than 16000 is resampled with ffmpeg)')
+    parser.add_argument('--tts-size', type=parse_size, default=parse_size('3K'), help='TTS input text size')
+    parser.add_argument('--asr-latency', type=float, default=0.05, help='Stub recognizer latency per batch, seconds')
+    parser.add_argument('--tts-latency', type=float, default=0.002,
+                        help='Stub TTS latency per second of speech, seconds')
+    parser.add_argument('--slo', type=float, default=5.0, help='p95 latency budget per step, seconds')
+    parser.add_argument('--max-error-rate', type=float, default=0.01, help='Error rate budget per step')
+    parser.add_argument('--sample-interval', type=float, default=1.0, help='Seconds between memory samples')
+    parser.add_argument('--output', '-o', help='Write steps, memory samples and every request as JSON')
+    args = parser.parse_args()
+
+    result = run(args)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"Saved results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Load test for the Summarizer page of a running app.
+
+Each simulated user opens its own Streamlit session over the app's
+websocket (as a browser tab does), loads the Summarizer page, then
+repeatedly pastes a transcript and clicks "Generate Summary & Actions",
+timing each click until the page finishes rendering the action items.
+Sessions run concurrently, so the numbers show how the deployment copes
+with many users at once: compare a single process against
+``run_app.py --workers N``.
+
+Usage:
+    python run_app.py --port 8501 --workers 4 &
+    python benchmarks/load_streamlit.py --url http://localhost:8501 --sessions 8 --requests 5 --size 20K
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from bench_nlp import parse_size
+from synthetic_transcript import generate_transcript
+
+PAGE = 'Summarizer'
+TEXT_LABEL = 'Meeting Transcript'
+BUTTON_LABEL = 'Generate Summary & Actions'
+DONE_MARKER = 'Action Items'
+
+
+class PageSession:
+    """One browser-like Streamlit session driven over the websocket protocol."""
+
+    def __init__(self, url: str, timeout: float):
+        self.ws_url = url.replace('http', 'ws', 1).rstrip('/') + '/_stcore/stream'
+        self.timeout = timeout
+        self.ws = None
+        self.widgets: Dict[str, str] = {}
+
+    async def __aenter__(self) -> 'PageSession':
+        self.ws = await websockets.connect(self.ws_url, subprotocols=['streamlit'], max_size=None)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.ws.close()
+
+    async def rerun(self, widget_states: Optional[List[WidgetState]] = None) -> List[str]:
+        """Rerun the page with ``widget_states``; returns the markdown it rendered."""
+        msg = BackMsg()
+        msg.rerun_script.page_name = PAGE
+        if widget_states:
+            msg.rerun_script.widget_states.widgets.extend(widget_states)
+        await self.ws.send(msg.SerializeToString())
+        markdown = []
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await asyncio.wait_for(self.ws.recv(), self.timeout))
+            kind = fwd.WhichOneof('type')
+            if kind == 'script_finished':
+                return markdown
+            if kind != 'delta' or fwd.delta.WhichOneof('type') != 'new_element':
+                continue
+            element = fwd.delta.new_element
+            field = element.WhichOneof('type')
+            if field == 'markdown':
+                markdown.append(element.markdown.body)
+            elif field in ('text_area', 'button'):
+                widget = getattr(element, field)
+                self.widgets.setdefault(widget.label, widget.id)
+
+    async def summarize(self, transcript: str) -> float:
+        """Paste ``transcript``, click the button and return seconds until the action items render."""
+        text_id = next(i for label, i in self.widgets.items() if TEXT_LABEL in label)
+        button_id = next(i for label, i in self.widgets.items() if BUTTON_LABEL in label)
+        start = time.perf_counter()
+        markdown = await self.rerun([WidgetState(id=text_id, string_value=transcript),
+                                     WidgetState(id=button_id, trigger_value=True)])
+        elapsed = time.perf_counter() - start
+        if not any(DONE_MARKER in body for body in markdown):
+            raise RuntimeError('page finished without action items')
+        return elapsed
+
+
+async def user(idx: int, args, latencies: List[float], errors: List[str]) -> None:
+    try:
+        async with PageSession(args.url, args.timeout) as session:
+            await session.rerun()
+            for n in range(args.requests):
+                # Distinct transcripts unless --repeat-transcript, so the shared cache doesn't hide the work
+                seed = 0 if args.repeat_transcript else idx * args.requests + n
+                transcript = generate_transcript(args.size, seed=seed)
+                try:
+                    latencies.append(await session.summarize(transcript))
+                except Exception as e:
+                    errors.append(f'session {idx}: {e}')
+    except Exception as e:
+        errors.append(f'session {idx}: {e}')
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run(args) -> int:
+    latencies: List[float] = []
+    errors: List[str] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(user(i, args, latencies, errors) for i in range(args.sessions)))
+    wall = time.perf_counter() - start
+
+    print(f"{args.sessions} sessions x {args.requests} requests, {args.size:,} byte transcripts -> {args.url}")
+    if latencies:
+        print(f"{'p50 (s)':>9} {'p95 (s)':>9} {'max (s)':>9} {'mean (s)':>9} {'req/s':>8}")
+        print(f"{percentile(latencies, 50):>9.3f} {percentile(latencies, 95):>9.3f} {max(latencies):>9.3f} "
+              f"{statistics.mean(latencies):>9.3f} {len(latencies) / wall:>8.2f}")
+    print(f"completed {len(latencies)}, errors {len(errors)}, wall {wall:.1f}s")
+    for error in errors[:5]:
+        print(f"  ❌ {error}")
+    return 1 if errors else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent load test of the Summarizer page')
+    parser.add_argument('--url', default='http://localhost:8501', help='App (or proxy) base URL')
+    parser.add_argument('--sessions', type=int, default=8, help='Concurrent browser sessions')
+    parser.add_argument('--requests', type=int, default=5, help='Summaries per session')
+    parser.add_argument('--size', type=parse_size, default=parse_size('20K'), help='Transcript size, e.g. 5K, 100K')
+    parser.add_argument('--repeat-transcript', action='store_true',
+                        help='Every request sends the same transcript (measures the shared cache)')
+    parser.add_argument('--timeout', type=float, default=300, help='Seconds to wait for a page run')
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Synthetic meeting transcript generator for benchmarks and load tests.
+
+Produces "Speaker: text" turns in the same shape as sample_transcript.txt,
+with configurable speaker count, size and density of action items and decisions.
+Output is deterministic for a given seed.
+"""
+
+import random
+from typing import Iterator, List
+
+FIRST_NAMES = ['John', 'Sarah', 'Mike', 'Lisa', 'Priya', 'Tom', 'Anna', 'Ravi', 'Elena', 'David',
+               'Chen', 'Maria', 'Omar', 'Julia', 'Ken', 'Fatima', 'Lukas', 'Grace', 'Ivan', 'Nora']
+TOPICS = ['SmartTrack API', 'marketing campaign', 'Q4 launch', 'budget report', 'login service',
+          'design review', 'customer onboarding', 'data pipeline', 'mobile release', 'security audit']
+DEADLINES = ['Friday', 'Monday', 'Wednesday', 'tomorrow', 'next week', 'end of the month', 'March']
+DISCUSSION = [
+    "I think the {topic} is progressing well but we still have some open questions",
+    "The latest numbers on the {topic} look better than last quarter",
+    "We had a few issues with the {topic} during testing last week",
+    "Can someone remind me where we landed on the {topic} discussion",
+    "There is a concern about the timeline for the {topic}",
+    "Customers gave great feedback on the {topic} in the last survey",
+]
+ACTIONS = [
+    "I'll prepare the {topic} summary by {deadline}",
+    "{name} will review the {topic} and report back by {deadline}",
+    "We need to finalize the {topic} before {deadline}",
+    "I will send the updated {topic} plan to everyone by {deadline}",
+    "{name} should coordinate with the team on the urgent {topic} fix by {deadline}",
+]
+DECISIONS = [
+    "We agreed to move the {topic} forward as planned",
+    "The team decided to postpone the {topic} until next sprint",
+    "We concluded that the {topic} needs another review cycle",
+    "Leadership approved the revised {topic} budget",
+]
+
+
+def iter_turns(speakers: int = 5, action_density: float = 0.2, decision_density: float = 0.1,
+               seed: int = 0) -> Iterator[str]:
+    """Yield an endless stream of transcript turns ("Name: sentence. sentence.")."""
+    rng = random.Random(seed)
+    names: List[str] = [FIRST_NAMES[i % len(FIRST_NAMES)] + ('' if i < len(FIRST_NAMES) else f' {i}')
+                        for i in range(max(1, speakers))]
+    while True:
+        speaker = rng.choice(names)
+        sentences = []
+        for _ in range(rng.randint(1, 3)):
+            roll = rng.random()
+            if roll < action_density:
+                template = rng.choice(ACTIONS)
+            elif roll < action_density + decision_density:
+                template = rng.choice(DECISIONS)
+            else:
+                template = rng.choice(DISCUSSION)
+            sentences.append(template.format(topic=rng.choice(TOPICS), deadline=rng.choice(DEADLINES),
+                                             name=rng.choice(names)) + '.')
+        yield f"{speaker}: {' '.join(sentences)}"
+
+
+def generate_transcript(size_bytes: int, speakers: int = 5, action_density: float = 0.2,
+                        decision_density: float = 0.1, seed: int = 0) -> str:
+    """Generate a transcript of roughly ``size_bytes`` UTF-8 bytes."""
+    parts: List[str] = []
+    total = 0
+    for turn in iter_turns(speakers, action_density, decision_density, seed):
+        parts.append(turn)
+        total += len(turn) + 2
+        if total >= size_bytes:
+            break
+    return '\n\n'.join(parts)
@@ -0,0 +1,214 @@
+"""
+Resolve raw action item deadlines and owners into typed values.
+
+``enhanced_action_extraction`` reports deadlines as the words it found
+("friday", "march", "next week") and owners as a capitalized word. Given the
+meeting date and the transcript's speakers, this module turns them into ISO
+due dates and canonical speaker ids. Phrases are matched against lookup
+tables built once at import, keyed by word tuples, so resolving a sentence is
+a dictionary probe per word position rather than a cascade of regexes.
+"""
+import calendar
+import datetime as dt
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+DateLike = Union[str, dt.date, dt.datetime]
+_Rule = Callable[[dt.date], dt.date]
+
+_WORD_RE = re.compile(r"[a-z]+|\d{1,4}(?:[/-]\d{1,2}(?:[/-]\d{2,4})?)?")
+_NUMERIC_DATE_RE = re.compile(r'^(\d{1,4})[/-](\d{1,2})(?:[/-](\d{2,4}))?$')
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+MONTHS = ['january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september',
+          'october', 'november', 'december']
+# Only abbreviations that aren't everyday words (no mon/wed/sat/sun)
+_WEEKDAY_ABBR = {'tue': 1, 'tues': 1, 'thu': 3, 'thur': 3, 'thurs': 3, 'fri': 4}
+_MONTH_ABBR = {name[:3]: i + 1 for i, name in enumerate(MONTHS) if name != 'may'}
+_MONTH_ABBR['sept'] = 9
+
+
+def _end_of_month(year: int, month: int) -> dt.date:
+    return dt.date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _upcoming(day: dt.date, weekday: int) -> dt.date:
+    """Next date falling on ``weekday`` strictly after ``day``."""
+    return day + dt.timedelta(days=(weekday - day.weekday() - 1) % 7 + 1)
+
+
+def _next_week_day(day: dt.date, weekday: int) -> dt.date:
+    """``weekday`` of the following calendar week ("next friday")."""
+    monday_next = day + dt.timedelta(days=7 - day.weekday())
+    return monday_next + dt.timedelta(days=weekday)
+
+
+def _this_week_day(day: dt.date, weekday: int) -> dt.date:
+    """``weekday`` of the current calendar week, or the meeting day if that has passed."""
+    target = day + dt.timedelta(days=weekday - day.weekday())
+    return max(target, day)
+
+
+def _month_deadline(day: dt.date, month: int) -> dt.date:
+    """End of the named month, this year or next if it has already ended."""
+    year = day.year if month >= day.month else day.year + 1
+    return _end_of_month(year, month)
+
+
+def _add_months(day: dt.date, months: int) -> dt.date:
+    month_index = day.month - 1 + months
+    return _end_of_month(day.year + month_index // 12, month_index % 12 + 1)
+
+
+def _end_of_quarter(day: dt.date) -> dt.date:
+    return _end_of_month(day.year, ((day.month - 1) // 3 + 1) * 3)
+
+
+def _build_phrase_table() -> Dict[Tuple[str, ...], _Rule]:
+    table: Dict[Tuple[str, ...], _Rule] = {}
+
+    def add(phrase: str, rule: _Rule) -> None:
+        table[tuple(phrase.split())] = rule
+
+    for phrase in ('today', 'tonight', 'eod', 'end of day', 'end of the day', 'asap'):
+        add(phrase, lambda d: d)
+    add('tomorrow', lambda d: d + dt.timedelta(days=1))
+    add('yesterday', lambda d: d - dt.timedelta(days=1))
+    add('day after tomorrow', lambda d: d + dt.timedelta(days=2))
+
+    for phrase in ('this week', 'end of week', 'end of the week', 'eow'):
+        add(phrase, lambda d: _this_week_day(d, 4))
+    for phrase in ('next week', 'end of next week'):
+        add(phrase, lambda d: _next_week_day(d, 4))
+    for phrase in ('this month', 'end of month', 'end of the month', 'eom'):
+        add(phrase, lambda d: _add_months(d, 0))
+    for phrase in ('next month', 'end of next month'):
+        add(phrase, lambda d: _add_months(d, 1))
+    for phrase in ('this quarter', 'end of quarter', 'end of the quarter', 'eoq'):
+        add(phrase, _end_of_quarter)
+    add('next quarter', lambda d: _end_of_quarter(_add_months(d, 3)))
+    add('end of year', lambda d: dt.date(d.year, 12, 31))
+    add('end of the year', lambda d: dt.date(d.year, 12, 31))
+
+    weekday_names = {name: i for i, name in enumerate(WEEKDAYS)}
+    weekday_names.update(_WEEKDAY_ABBR)
+    for name, wd in weekday_names.items():
+        add(name, lambda d, wd=wd: _upcoming(d, wd))
+        add(f'this {name}', lambda d, wd=wd: _upcoming(d, wd))
+        add(f'next {name}', lambda d, wd=wd: _next_week_day(d, wd))
+        add(f'end of {name}', lambda d, wd=wd: _upcoming(d, wd))
+        # "tuesday next week", "friday of next week"
+        add(f'{name} next week', lambda d, wd=wd: _next_week_day(d, wd))
+        add(f'{name} of next week', lambda d, wd=wd: _next_week_day(d, wd))
+
+    month_names = {name: i + 1 for i, name in enumerate(MONTHS)}
+    month_names.update(_MONTH_ABBR)
+    for name, month in month_names.items():
+        add(name, lambda d, m=month: _month_deadline(d, m))
+        add(f'end of {name}', lambda d, m=month: _month_deadline(d, m))
+    return table
+
+
+PHRASES = _build_phrase_table()
+_MAX_PHRASE = max(len(k) for k in PHRASES)
+# "may" as a month is ambiguous with the verb; only accept it with a preposition before it
+_AMBIGUOUS = {('may',)}
+_MONTH_PREPOSITIONS = {'by', 'in', 'until', 'before', 'of', 'end'}
+# A day and month without a year ("3/15") is only a date after one of these; elsewhere
+# "2-3 weeks", "pages 10-12" or "3/4 of the budget" are ranges and fractions
+_DATE_WORDS = {'by', 'on', 'due', 'before', 'until', 'till', 'deadline'}
+
+
+def to_date(value: DateLike) -> dt.date:
+    if isinstance(value, dt.datetime):
+        return value.date()
+    if isinstance(value, dt.date):
+        return value
+    return dt.date.fromisoformat(value)
+
+
+def _numeric_date(token: str, meeting_date: dt.date, partial: bool = True) -> Optional[dt.date]:
+    """Parse 2024-03-15, 3/15, 3/15/24 (month first, as in US meeting notes).
+
+    partial: accept a month and day without a year.
+    """
+    m = _NUMERIC_DATE_RE.match(token)
+    if not m:
+        return None
+    a, b, c = m.group(1), m.group(2), m.group(3)
+    if not c and not partial:
+        return None
+    try:
+        if len(a) == 4:
+            if not c:
+                return None
+            return dt.date(int(a), int(b), int(c))
+        year = meeting_date.year if not c else int(c) + (2000 if len(c) == 2 else 0)
+        parsed = dt.date(year, int(a), int(b))
+        if not c and parsed < meeting_date:
+            parsed = parsed.replace(year=year + 1)
+        return parsed
+    except ValueError:
+        return None
+
+
+def resolve_phrase(text: str, meeting_date: DateLike) -> Optional[dt.date]:
+    """Resolve the first date expression found in ``text`` relative to ``meeting_date``."""
+    day = to_date(meeting_date)
+    words = _WORD_RE.findall(text.lower())
+    for i, word in enumerate(words):
+        if word[0].isdigit():
+            # A bare "3/15" as the whole text is a raw deadline, not a fraction in a sentence
+            partial = len(words) == 1 or (i > 0 and words[i - 1] in _DATE_WORDS)
+            parsed = _numeric_date(word, day, partial)
+            if parsed:
+                return parsed
+            continue
+        for n in range(min(_MAX_PHRASE, len(words) - i), 0, -1):
+            key = tuple(words[i:i + n])
+            rule = PHRASES.get(key)
+            if rule is None:
+                continue
+            if key in _AMBIGUOUS and (i == 0 or words[i - 1] not in _MONTH_PREPOSITIONS):
+                continue
+            return rule(day)
+    return None
+
+
+def resolve_deadline(deadline: str, meeting_date: DateLike, sentence: str = '') -> Optional[str]:
+    """ISO due date for a raw deadline, falling back to the full sentence when the raw words don't resolve."""
+    for text in (deadline, sentence):
+        if text:
+            resolved = resolve_phrase(text, meeting_date)
+            if resolved:
+                return resolved.isoformat()
+    return None
+
+
+def speaker_id(name: str) -> str:
+    """Canonical id for a speaker name: lowercase words joined by hyphens."""
+    return '-'.join(re.findall(r'\w+', name.lower()))
+
+
+class OwnerResolver:
+    """Maps owner names found in sentences to canonical ids of the transcript's speakers.
+
+    Matches full names and, when unambiguous, first names ("Sarah" ->
+    "sarah-chen").
+    """
+
+    def __init__(self, speakers: Iterable[str]):
+        self.lookup: Dict[str, str] = {}
+        first_names: Dict[str, List[str]] = {}
+        for name in speakers:
+            sid = speaker_id(name)
+            if not sid:
+                continue
+            self.lookup[name.lower().strip()] = sid
+            first_names.setdefault(sid.split('-')[0], []).append(sid)
+        for first, ids in first_names.items():
+            if len(set(ids)) == 1:
+                self.lookup.setdefault(first, ids[0])
+
+    def resolve(self, owner: str) -> str:
+        return self.lookup.get(owner.lower().strip(), '') if owner else ''
@@ -0,0 +1,274 @@
+"""
+Near-duplicate detection with MinHash signatures and LSH banding.
+
+Used two ways:
+- ``dedupe_sentences`` collapses near-identical sentences inside a transcript
+  before scoring, so repeated statements don't yield duplicate action items.
+  Sentences naming different dates, numbers or people are never merged.
+- ``MeetingDeduplicator`` keeps signatures of archived meetings in SQLite with
+  one indexed row per LSH band, so checking a new transcript against the
+  archive touches only the few meetings sharing a band bucket.
+
+Hashes are CRC32-based and seeded, so signatures are stable across processes
+and can be stored.
+"""
+import contextlib
+import re
+import sqlite3
+import zlib
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from deadline_resolver import PHRASES
+from tokenizer import stop_words
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_WORD_RE = re.compile(r'\w+')
+# Words of the deadline phrases: "friday", "tomorrow", "next", "week", "march", "eod", ...
+_DATE_WORDS = frozenset(word for phrase in PHRASES for word in phrase) - {'of', 'the'}
+
+
+def shingles(text: str, k: int = 2) -> Set[str]:
+    """Word k-grams of the lowercased text (the whole text if it has fewer than k words)."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= k:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+class MinHasher:
+    """Computes ``num_perm``-long MinHash signatures with universal hashing mod 2^31-1."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self.b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+
+    @staticmethod
+    def _hash(shingle: str) -> int:
+        return zlib.crc32(shingle.encode('utf-8')) % _MERSENNE_PRIME
+
+    def signature(self, items: Iterable[str]) -> np.ndarray:
+        return self.signatures([items])[0]
+
+    def signatures(self, item_sets: Sequence[Iterable[str]], block: int = 2048) -> np.ndarray:
+        """Signatures for many shingle sets at once, shape (len(item_sets), num_perm).
+
+        Works in blocks of sets, hashing all their shingles in one vectorized
+        pass and taking per-set minima with ``np.minimum.reduceat``. Empty sets
+        get an all-max signature that matches nothing.
+        """
+        out = np.full((len(item_sets), self.num_perm), _MERSENNE_PRIME, dtype=np.int64)
+        for start in range(0, len(item_sets), block):
+            hashes: List[int] = []
+            starts: List[int] = []
+            rows: List[int] = []
+            for row, items in enumerate(item_sets[start:start + block]):
+                h = [self._hash(s) for s in items]
+                if h:
+                    starts.append(len(hashes))
+                    rows.append(start + row)
+                    hashes.extend(h)
+            if not hashes:
+                continue
+            x = np.asarray(hashes, dtype=np.int64)
+            permuted = (np.outer(x, self.a) + self.b) % _MERSENNE_PRIME
+            out[rows] = np.minimum.reduceat(permuted, starts, axis=0)
+        return out
+
+
+def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(sig_a == sig_b))
+
+
+class LSHIndex:
+    """In-memory LSH over MinHash signatures: ``bands`` buckets of ``num_perm // bands`` rows each.
+
+    Lookups only compare against keys sharing at least one band bucket, then
+    confirm with the signature similarity.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, threshold: float = 0.8):
+        if num_perm % bands:
+            raise ValueError('num_perm must be divisible by bands')
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+        self._signatures: List[np.ndarray] = []
+        self.keys: List[object] = []
+        # Random odd multipliers fold each band's rows into one int64 bucket key
+        self._fold = np.random.default_rng(7).integers(1, 1 << 62, size=self.rows, dtype=np.int64) | 1
+
+    def band_keys(self, sigs: np.ndarray) -> np.ndarray:
+        """Bucket keys for one signature (shape (bands,)) or many (shape (n, bands)), vectorized."""
+        shaped = sigs.reshape(sigs.shape[:-1] + (self.bands, self.rows))
+        return (shaped * self._fold).sum(axis=-1)
+
+    def query(self, sig: np.ndarray, keys: Optional[Sequence[int]] = None) -> List[Tuple[object, float]]:
+        """Stored keys whose similarity to ``sig`` reaches the threshold, most similar first.
+
+        ``keys`` may pass precomputed ``band_keys(sig)`` to skip recomputing them.
+        """
+        if keys is None:
+            keys = self.band_keys(sig).tolist()
+        candidates: Set[int] = set()
+        for bucket, key in zip(self._buckets, keys):
+            hit = bucket.get(key)
+            if hit:
+                candidates.update(hit)
+        matches = [(self.keys[i], similarity(sig, self._signatures[i])) for i in candidates]
+        return sorted((m for m in matches if m[1] >= self.threshold), key=lambda m: -m[1])
+
+    def add(self, key: object, sig: np.ndarray, keys: Optional[Sequence[int]] = None) -> None:
+        idx = len(self.keys)
+        self.keys.append(key)
+        self._signatures.append(sig)
+        if keys is None:
+            keys = self.band_keys(sig).tolist()
+        for bucket, bucket_key in zip(self._buckets, keys):
+            bucket.setdefault(bucket_key, []).append(idx)
+
+
+_SENTENCE_HASHER: Optional[MinHasher] = None
+
+
+def anchors(sentence: str) -> FrozenSet[str]:
+    """Date words, numbers and names in ``sentence``, lowercased.
+
+    Two action items that differ only in these ("deploy on Friday" and
+    "deploy on Monday", "Alex will" and "Sam will") are different tasks
+    however similar the rest of the wording is.
+    """
+    common = stop_words('en')
+    found = set()
+    for i, word in enumerate(_WORD_RE.findall(sentence)):
+        lower = word.lower()
+        if lower in _DATE_WORDS or not word.isalpha():
+            found.add(lower)
+        # Capitalized words are names, except "I" and a sentence-initial common word ("We", "So")
+        elif word[0].isupper() and word != 'I' and (i or lower not in common):
+            found.add(lower)
+    return frozenset(found)
+
+
+def dedupe_sentences(sentences: List[str], threshold: float = 0.8) -> List[str]:
+    """Drop sentences that are near-duplicates of an earlier one, keeping order.
+
+    Exact repeats (ignoring case and punctuation) are removed without hashing;
+    near-duplicates only when they have the same ``anchors``.
+    """
+    global _SENTENCE_HASHER
+    if len(sentences) < 2:
+        return list(sentences)
+    seen_exact: Set[str] = set()
+    unique: List[str] = []
+    for sentence in sentences:
+        norm = ' '.join(_WORD_RE.findall(sentence.lower()))
+        if norm not in seen_exact:
+            seen_exact.add(norm)
+            unique.append(sentence)
+    if len(unique) < 2:
+        return unique
+    if _SENTENCE_HASHER is None:
+        _SENTENCE_HASHER = MinHasher()
+    sigs = _SENTENCE_HASHER.signatures([shingles(s) for s in unique])
+    index = LSHIndex(_SENTENCE_HASHER.num_perm, bands=16, threshold=threshold)
+    all_keys = index.band_keys(sigs).tolist()
+    kept: List[str] = []
+    for sentence, sig, keys in zip(unique, sigs, all_keys):
+        # Salting the band keys with the anchors puts only sentences with the same anchors in a bucket
+        salt = hash(anchors(sentence))
+        keys = [key ^ salt for key in keys]
+        if index.query(sig, keys):
+            continue
+        index.add(len(kept), sig, keys)
+        kept.append(sentence)
+    return kept
+
+
+_MEETING_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meeting_signatures (
+    meeting_key TEXT PRIMARY KEY,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meeting_lsh_bands (
+    band INTEGER NOT NULL,
+    bucket BLOB NOT NULL,
+    meeting_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_meeting_lsh ON meeting_lsh_bands(band, bucket);
+CREATE INDEX IF NOT EXISTS idx_meeting_lsh_key ON meeting_lsh_bands(meeting_key);
+"""
+
+
+class MeetingDeduplicator:
+    """Flags transcripts that nearly duplicate an already archived meeting.
+
+    Signatures and LSH band buckets live in SQLite (its own tables, so it can
+    share a database with ``ActionStore``); each lookup is one indexed probe
+    per band plus a comparison with the few candidates found. Pass an open
+    ``sqlite3.Connection`` instead of a path to join the caller's
+    transactions rather than committing on its own.
+    """
+
+    def __init__(self, path: Union[str, sqlite3.Connection], num_perm: int = 128, bands: int = 32,
+                 threshold: float = 0.8, shingle_size: int = 5):
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self._owns_conn = not isinstance(path, sqlite3.Connection)
+        self.conn = sqlite3.connect(path) if self._owns_conn else path
+        for statement in _MEETING_SCHEMA.split(';'):
+            if statement.strip():
+                self.conn.execute(statement)
+        if self._owns_conn:
+            self.conn.commit()
+
+    def close(self) -> None:
+        if self._owns_conn:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def signature(self, transcript: str) -> np.ndarray:
+        return self.hasher.signature(shingles(transcript, self.shingle_size))
+
+    def find_duplicates(self, transcript: str, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Archived meetings similar to ``transcript`` at or above the threshold, most similar first."""
+        sig = self.signature(transcript)
+        candidates: Set[str] = set()
+        for band in range(self.bands):
+            bucket = sig[band * self.rows:(band + 1) * self.rows].tobytes()
+            candidates.update(row[0] for row in self.conn.execute(
+                'SELECT meeting_key FROM meeting_lsh_bands WHERE band = ? AND bucket = ?', (band, bucket)))
+        candidates.discard(exclude)
+        matches = []
+        for key in candidates:
+            row = self.conn.execute('SELECT signature FROM meeting_signatures WHERE meeting_key = ?', (key,)).fetchone()
+            if row:
+                score = similarity(sig, np.frombuffer(row[0], dtype=np.int64))
+                if score >= self.threshold:
+                    matches.append((key, score))
+        return sorted(matches, key=lambda m: -m[1])
+
+    def add(self, meeting_key: str, transcript: str) -> None:
+        """Record a meeting's signature (replacing an earlier one for the same key)."""
+        sig = self.signature(transcript)
+        with self.conn if self._owns_conn else contextlib.nullcontext():
+            self.conn.execute('DELETE FROM meeting_lsh_bands WHERE meeting_key = ?', (meeting_key,))
+            self.conn.execute('INSERT OR REPLACE INTO meeting_signatures (meeting_key, signature) VALUES (?, ?)',
+                              (meeting_key, sig.tobytes()))
+            self.conn.executemany(
+                'INSERT INTO meeting_lsh_bands (band, bucket, meeting_key) VALUES (?, ?, ?)',
+                ((band, sig[band * self.rows:(band + 1) * self.rows].tobytes(), meeting_key)
+                 for band in range(self.bands)))
@@ -1,12 +1,47 @@
-# This file is kept for compatibility but only contains legacy functions
-# All extraction is now handled by nlp_summarizer.py
+# Parsing helpers for action items returned by the Mistral backend (see llm_backend.py).
+# Rule-based extraction lives in nlp_summarizer.py.
 
 from typing import List, Dict, Any
 
-def parse_mistral_action_items(mistral_text: str) -> List[Dict[str, Any]]:
-    """Legacy function - use nlp_summarizer.enhanced_action_extraction instead"""
-    return []
+from utils import extract_json_from_text
+
+_PRIORITIES = {'high': 'High', 'urgent': 'High', 'critical': 'High', 'medium': 'Medium', 'normal': 'Medium',
+               'low': 'Low'}
 
 
+def _field(item: Dict[str, Any], *names: str) -> str:
+    for name in names:
+        value = item.get(name)
+        if value:
+            return str(value).strip()
+    return ''
 
 
+def parse_mistral_action_items(mistral_text: str) -> List[Dict[str, Any]]:
+    """Parse a model response into action item dicts shaped like ``enhanced_action_extraction`` output.
+
+    Accepts a JSON array of items or an object with an ``action_items`` list,
+    anywhere in the response text. Items without a task are dropped.
+    """
+    data = extract_json_from_text(mistral_text or '')
+    if isinstance(data, dict):
+        data = data.get('action_items') or data.get('items') or []
+    if not isinstance(data, list):
+        return []
+    items = []
+    for raw in data:
+        if not isinstance(raw, dict):
+            continue
+        task = _field(raw, 'task', 'action', 'description', 'title')
+        if not task:
+            continue
+        priority = _PRIORITIES.get(_field(raw, 'priority').lower(), 'Medium')
+        items.append({
+            'task': task,
+            'owner': _field(raw, 'owner', 'assignee', 'responsible'),
+            'deadline': _field(raw, 'deadline', 'due', 'due_date'),
+            'priority': priority,
+            'status': _field(raw, 'status') or 'Pending',
+            'note': _field(raw, 'note') or 'Extracted by Mistral',
+        })
+    return items
@@ -0,0 +1,310 @@
+"""
+Map-reduce summarization for long transcripts.
+
+The transcript is cut into windows of roughly ``window_chars`` characters
+(or ``window_ms`` of audio when timestamped segments are available), each
+window is summarized with the rule-based ``generate_summary`` in a process
+pool, and the window summaries are reduced into one ``MeetingSummary``.
+Window summaries are yielded as they complete, so a page can show progress
+on a three-hour meeting long before the final summary exists, and wall time
+tracks the slowest window rather than the whole transcript.
+
+Usage:
+    python hierarchical_summary.py meeting.txt --stream --workers 4
+"""
+import argparse
+import atexit
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import metrics
+from dedup import dedupe_sentences
+from meeting_summary import MeetingSummary
+from nlp_summarizer import DECISION_INDICATORS, generate_summary, calculate_word_frequency, keyword_tokens, \
+    meaningful_keywords, score_sentence
+
+WINDOW_CHARS = 12_000
+WINDOW_MS = 10 * 60 * 1000
+# Windows grow beyond window_chars rather than exceed this count
+MAX_WINDOWS = 64
+TIMELINE_ENTRIES = 12
+# The Summarizer page switches to windowed summaries above this size
+HIERARCHICAL_MIN_CHARS = 60_000
+
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+class Window(NamedTuple):
+    """A contiguous part of the transcript, with its audio time span when known."""
+    index: int
+    text: str
+    start_ms: Optional[int] = None
+    end_ms: Optional[int] = None
+
+    @property
+    def label(self) -> str:
+        if self.start_ms is None:
+            return f'Part {self.index + 1}'
+        return f'{_clock(self.start_ms)}–{_clock(self.end_ms)}'
+
+
+def _clock(ms: int) -> str:
+    minutes, seconds = divmod(ms // 1000, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}:{minutes:02d}:{seconds:02d}' if hours else f'{minutes:02d}:{seconds:02d}'
+
+
+def _units(transcript: str, max_chars: int) -> List[str]:
+    """Speaker turns (lines), with turns longer than a window split at sentence ends."""
+    units = []
+    for line in transcript.splitlines(keepends=True):
+        if len(line) <= max_chars:
+            units.append(line)
+            continue
+        piece = ''
+        for sentence in _SENTENCE_END_RE.split(line):
+            if piece and len(piece) + len(sentence) > max_chars:
+                units.append(piece)
+                piece = ''
+            piece += sentence + ' '
+        if piece:
+            units.append(piece)
+    return units
+
+
+def split_windows(transcript: str, segments: Optional[List[Any]] = None,
+                  window_chars: int = WINDOW_CHARS, window_ms: int = WINDOW_MS) -> List[Window]:
+    """Cut a transcript into windows for ``summarize_windows``.
+
+    With ``segments`` (``audio_processor.TranscriptSegment``) windows span
+    ``window_ms`` of audio. Otherwise they hold whole speaker turns up to
+    ``window_chars``; in the last third of each window the cut goes where
+    adjacent turns share the fewest keywords, so topics tend to stay whole.
+    """
+    window_chars = max(window_chars, len(transcript) // MAX_WINDOWS)
+    if segments:
+        windows, texts, start = [], [], segments[0].start_ms
+        end = start
+        for seg in segments:
+            if texts and seg.start_ms - start >= window_ms:
+                windows.append(Window(len(windows), ' '.join(texts), start, end))
+                texts, start = [], seg.start_ms
+            texts.append(seg.text)
+            end = seg.end_ms
+        windows.append(Window(len(windows), ' '.join(texts), start, end))
+        return windows
+
+    units = _units(transcript, window_chars)
+    words = [set(keyword_tokens(unit)) for unit in units]
+    windows, first, size = [], 0, 0
+    for i, unit in enumerate(units):
+        size += len(unit)
+        if size < window_chars or i == first:
+            continue
+        # Window is full: pick the weakest topic link among turns in its last third
+        cut, best, tail = i, None, size
+        for j in range(i, first, -1):
+            tail -= len(units[j])
+            if tail < window_chars * 2 // 3:
+                break
+            overlap = len(words[j - 1] & words[j])
+            if best is None or overlap < best:
+                cut, best = j, overlap
+        windows.append(Window(len(windows), ''.join(units[first:cut])))
+        first = cut
+        size = sum(len(u) for u in units[first:i + 1])
+    if first < len(units):
+        windows.append(Window(len(windows), ''.join(units[first:])))
+    return [w for w in windows if w.text.strip()]
+
+
+def _summarize_window(text: str) -> Tuple[MeetingSummary, List[Tuple[str, int]]]:
+    """Map step (runs in a worker process): the window's summary and its keyword counts."""
+    summary = generate_summary(text, structured=True, backend='rules')
+    return summary, calculate_word_frequency(text).most_common(200)
+
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS: Optional[int] = None
+
+
+def _pool(workers: Optional[int]) -> ProcessPoolExecutor:
+    """Process pool shared by all calls in this process, recreated if the worker count changes."""
+    global _POOL, _POOL_WORKERS
+    if _POOL is None or _POOL_WORKERS != workers:
+        _shutdown_pool()
+        _POOL, _POOL_WORKERS = ProcessPoolExecutor(max_workers=workers), workers
+    return _POOL
+
+
+@atexit.register
+def _shutdown_pool() -> None:
+    """Stop the shared pool; the next ``_pool`` call starts a fresh one."""
+    global _POOL, _POOL_WORKERS
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+    _POOL, _POOL_WORKERS = None, None
+
+
+def summarize_windows(windows: List[Window], workers: Optional[int] = None
+                      ) -> Iterator[Tuple[Window, MeetingSummary, List[Tuple[str, int]]]]:
+    """Yield ``(window, summary, keyword counts)`` for each window as soon as it is done.
+
+    Windows run in a process pool of ``workers`` processes (default: CPU
+    count); a single window, or a single worker, runs in this process, as
+    do the remaining windows if a worker process dies.
+    """
+    workers = workers or os.cpu_count() or 1
+    if len(windows) == 1 or workers == 1:
+        for window in windows:
+            yield (window, *_summarize_window(window.text))
+        return
+    try:
+        pool = _pool(workers)
+        futures = {pool.submit(_summarize_window, w.text): w for w in windows}
+    except (OSError, BrokenProcessPool) as e:
+        print(f"Process pool unavailable, summarizing windows in-process: {e}")
+        yield from summarize_windows(windows, workers=1)
+        return
+    pending = dict(futures)
+    try:
+        for future in as_completed(futures):
+            result = future.result()
+            del pending[future]
+            yield (futures[future], *result)
+    except BrokenProcessPool as e:
+        print(f"Process pool broke, summarizing {len(pending)} remaining windows in-process: {e}")
+        _shutdown_pool()
+        yield from summarize_windows(sorted(pending.values()), workers=1)
+
+
+def _spread(items: List[str], limit: int) -> List[str]:
+    """Up to ``limit`` items evenly spaced through the meeting, in order."""
+    if len(items) <= limit:
+        return items
+    step = len(items) / limit
+    return [items[int(i * step)] for i in range(limit)]
+
+
+def reduce_summaries(results: List[Tuple[Window, MeetingSummary, List[Tuple[str, int]]]],
+                     max_bullets: int = 5) -> MeetingSummary:
+    """Reduce step: combine window summaries into one summary of the whole meeting.
+
+    Keywords come from the summed window counts and key points are re-scored
+    against them; decisions and next steps are de-duplicated and sampled
+    across the meeting. A Timeline section lists each window's top point.
+    """
+    results = sorted(results, key=lambda r: r[0].index)
+    word_freq: Counter = Counter()
+    for _, _, counts in results:
+        word_freq.update(dict(counts))
+    keywords = meaningful_keywords(word_freq)
+
+    participants: Dict[str, None] = {}
+    sections: Dict[str, Tuple[str, str, List[str]]] = {}
+    timeline = []
+    for window, summary, _ in results:
+        participants.update(dict.fromkeys(summary.metadata.get('participants', [])))
+        for section in summary.sections:
+            if section.title.startswith('Participants'):
+                sections.setdefault('Participants', (section.icon, '', []))
+                continue
+            icon, text, bullets = sections.setdefault(section.title, (section.icon, section.text, []))
+            bullets.extend(section.bullets)
+        points = next((s.bullets for s in summary.sections if s.title == 'Key Discussion Points'), None)
+        if points:
+            timeline.append(f'{window.label}: {points[0]}')
+
+    merged = MeetingSummary(metadata={
+        'participants': list(participants),
+        'keywords': keywords,
+        'sentence_count': sum(s.metadata.get('sentence_count', 0) for _, s, _ in results),
+        'advanced_nlp': any(s.metadata.get('advanced_nlp') for _, s, _ in results),
+        'windows': len(results),
+    })
+    # Sections keep the order they first appear in, as in generate_summary
+    for title, (icon, text, bullets) in sections.items():
+        if title == 'Participants':
+            merged.add(icon, f'Participants ({len(participants)})', ', '.join(list(participants)[:8]))
+            continue
+        if title == 'Key Topics':
+            if keywords:
+                merged.add(icon, title, ', '.join(keywords))
+            continue
+        bullets = dedupe_sentences(bullets)
+        if title == 'Key Discussion Points':
+            bullets = sorted(bullets, key=lambda b: score_sentence(b, keywords, word_freq), reverse=True)[:3]
+        elif title == 'Decisions Made':
+            # Prefer explicit decisions when sampling a long list
+            strong = [b for b in bullets if any(word in b.lower() for word in DECISION_INDICATORS)]
+            bullets = _spread(strong if len(strong) >= max_bullets else bullets, max_bullets)
+        else:
+            bullets = _spread(bullets, max_bullets)
+        merged.add(icon, title, text, bullets)
+    if len(timeline) > 1:
+        merged.add('🕒', 'Timeline', bullets=_spread(timeline, TIMELINE_ENTRIES))
+    return merged
+
+
+@metrics.timed('nlp.hierarchical')
+def summarize_hierarchical(transcript: str, segments: Optional[List[Any]] = None,
+                           window_chars: int = WINDOW_CHARS, window_ms: int = WINDOW_MS,
+                           workers: Optional[int] = None,
+                           on_window: Optional[Callable[[Window, MeetingSummary], None]] = None) -> MeetingSummary:
+    """Summarize a long transcript window by window and reduce to one ``MeetingSummary``.
+
+    ``on_window(window, summary)`` is called as each window summary
+    completes (in completion order), e.g. to stream progress to a page.
+    """
+    windows = split_windows(transcript, segments, window_chars, window_ms)
+    if not windows:
+        return generate_summary(transcript, structured=True, backend='rules')
+    results = []
+    with metrics.span('nlp.map'):
+        for window, summary, counts in summarize_windows(windows, workers):
+            results.append((window, summary, counts))
+            if on_window:
+                on_window(window, summary)
+    with metrics.span('nlp.reduce'):
+        return reduce_summaries(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Map-reduce summary of a long transcript')
+    parser.add_argument('file', help='Transcript text file')
+    parser.add_argument('--window-chars', type=int, default=WINDOW_CHARS)
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--stream', action='store_true', help='Print window summaries as they complete')
+    parser.add_argument('--compare', action='store_true', help='Also time the single-pass generate_summary')
+    parser.add_argument('--format', default='markdown', choices=['markdown', 'html', 'text', 'json'])
+    args = parser.parse_args()
+
+    with open(args.file, 'r', encoding='utf-8') as f:
+        transcript = f.read()
+
+    def show(window: Window, summary: MeetingSummary) -> None:
+        print(f'--- {window.label} ({len(window.text):,} chars) ---\n{summary.to_text()}\n', flush=True)
+
+    start = time.perf_counter()
+    summary = summarize_hierarchical(transcript, window_chars=args.window_chars, workers=args.workers,
+                                     on_window=show if args.stream else None)
+    elapsed = time.perf_counter() - start
+    rendered = summary.render(args.format)
+    print(json.dumps(rendered, indent=2, ensure_ascii=False) if args.format == 'json' else rendered)
+    # An empty transcript has no windows and gets the single-pass summary
+    print(f"\n{summary.metadata.get('windows', 0)} windows in {elapsed:.2f}s", file=sys.stderr)
+    if args.compare:
+        start = time.perf_counter()
+        generate_summary(transcript, backend='rules')
+        print(f'single pass: {time.perf_counter() - start:.2f}s', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
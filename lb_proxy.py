@@ -0,0 +1,136 @@
+"""
+Sticky-session TCP reverse proxy in front of several app workers.
+
+Streamlit keeps each browser session (and its ``session_state``) in the
+worker process that serves its websocket, so a browser must keep talking to
+the same worker. For every client connection the proxy reads the head of
+the first HTTP request, routes by the ``meeting_worker`` cookie if present
+and otherwise to the worker with the fewest open connections, and adds the
+cookie to the first response so the page's websocket and later reconnects
+follow. After that it only copies bytes, which keeps websockets and
+keep-alive connections on their worker. A worker that refuses connections
+is skipped and the client re-pinned to another one.
+
+    python lb_proxy.py --port 8501 --backend 127.0.0.1:8511 --backend 127.0.0.1:8512
+"""
+import argparse
+import asyncio
+import contextlib
+import re
+from typing import List, Optional, Tuple
+
+COOKIE = 'meeting_worker'
+MAX_HEAD = 64 * 1024
+_COOKIE_RE = re.compile(rb'^cookie:.*?\b' + COOKIE.encode() + rb'=(\d+)', re.IGNORECASE | re.MULTILINE)
+
+
+class StickyProxy:
+    def __init__(self, backends: List[Tuple[str, int]], host: str = '127.0.0.1', port: int = 8501):
+        self.backends = backends
+        self.host = host
+        self.port = port
+        self.active = [0] * len(backends)
+        self.served = [0] * len(backends)
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_HEAD)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def _order(self, head: bytes) -> Tuple[List[int], bool]:
+        """Workers to try, best first, and whether the client is already pinned to the first."""
+        by_load = sorted(range(len(self.backends)), key=lambda i: (self.active[i], self.served[i]))
+        m = _COOKIE_RE.search(head)
+        if m and int(m.group(1)) < len(self.backends):
+            pinned = int(m.group(1))
+            return [pinned] + [i for i in by_load if i != pinned], True
+        return by_load, False
+
+    async def _connect(self, order: List[int]):
+        for idx in order:
+            try:
+                reader, writer = await asyncio.open_connection(*self.backends[idx], limit=MAX_HEAD)
+                return idx, reader, writer
+            except OSError:
+                continue
+        return None, None, None
+
+    async def _handle(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> None:
+        try:
+            head = await client_reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            client_writer.close()
+            return
+        order, pinned = self._order(head)
+        idx, up_reader, up_writer = await self._connect(order)
+        if idx is None:
+            client_writer.write(b'HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+            with contextlib.suppress(ConnectionError):
+                await client_writer.drain()
+            client_writer.close()
+            return
+        self.active[idx] += 1
+        self.served[idx] += 1
+        try:
+            up_writer.write(head)
+            # Pin the client unless it already carries the cookie for this worker
+            cookie = None if pinned and idx == order[0] else idx
+            await asyncio.gather(self._pipe(client_reader, up_writer),
+                                 self._pipe_response(up_reader, client_writer, cookie))
+        finally:
+            self.active[idx] -= 1
+
+    async def _pipe_response(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                             cookie: Optional[int]) -> None:
+        if cookie is not None:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                writer.close()
+                return
+            status_end = head.index(b'\r\n') + 2
+            writer.write(head[:status_end]
+                         + f'Set-Cookie: {COOKIE}={cookie}; Path=/; HttpOnly; SameSite=Lax\r\n'.encode()
+                         + head[status_end:])
+        await self._pipe(reader, writer)
+
+    @staticmethod
+    async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            with contextlib.suppress(Exception):
+                writer.close()
+
+
+def parse_backend(text: str) -> Tuple[str, int]:
+    host, _, port = text.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sticky-session reverse proxy for app workers')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8501)
+    parser.add_argument('--backend', action='append', required=True, type=parse_backend,
+                        help='Worker address host:port (repeat for each worker)')
+    args = parser.parse_args()
+    proxy = StickyProxy(args.backend, args.host, args.port)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(proxy.serve_forever())
+
+
+if __name__ == '__main__':
+    main()
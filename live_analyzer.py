@@ -0,0 +1,216 @@
+"""
+Incremental analysis of a meeting that is still going on.
+
+``LiveAnalyzer.feed()`` takes transcript text as it arrives (from a
+microphone pipeline, the API's ``/v1/live`` websocket or the Summarizer
+page's Live tab) and keeps running word counts, speaker stats, decisions,
+action items and a rolling summary. Each update touches only the new text:
+complete lines and sentences are analyzed once and the unfinished tail is
+held until the next call. Detection and scoring are the same rules
+``nlp_summarizer`` applies to a whole transcript.
+"""
+import heapq
+import itertools
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import metrics
+from action_items import ActionItem, ActionItemBatch
+from deadline_resolver import DateLike, OwnerResolver, resolve_deadline
+from meeting_summary import MeetingSummary
+from nlp_summarizer import _FIRST_PERSON_RE, _SPEAKER_RE, action_from_sentence, extract_sentences, \
+    is_decision, is_next_step, keyword_tokens, meaningful_keywords, score_sentence
+
+_SENTENCE_END = '.!?'
+# Keyword candidates tracked for the rolling summary (meaningful_keywords looks at the top 15)
+_TOP_WORDS = 15
+
+
+@dataclass(slots=True)
+class SpeakerStats:
+    turns: int = 0
+    words: int = 0
+
+
+class LiveAnalyzer:
+    """Running analysis of a transcript fed in pieces.
+
+    meeting_date: resolve deadlines and owners of action items as
+    ``enhanced_action_extraction(meeting_date=...)`` does.
+    key_points: how many candidate sentences the rolling summary keeps.
+    recent: decisions and next steps shown in the summary (the latest ones).
+    """
+
+    def __init__(self, meeting_date: Optional[DateLike] = None, key_points: int = 64, recent: int = 3):
+        self.meeting_date = meeting_date
+        self.key_points = key_points
+        self.recent = recent
+        self.word_freq: Counter = Counter()
+        self.word_count = 0
+        self.sentence_count = 0
+        self.speakers: Dict[str, SpeakerStats] = {}
+        self.action_items: List[ActionItem] = []
+        self.decisions: List[str] = []
+        self.next_steps: List[str] = []
+        self._line_parts: List[str] = []
+        self._sentence_parts: List[str] = []
+        self._line_speaker: Optional[str] = None
+        self._sentence_speaker: Optional[str] = None
+        self._seen = set()
+        self._top: Dict[str, int] = {}
+        self._pool: List[Any] = []  # min-heap of (score, seq, sentence)
+        self._seq = itertools.count()
+        self._names: Dict[str, None] = {}  # speakers seen so far, for owner resolution
+        self._owners: Optional[OwnerResolver] = None
+
+    def feed(self, text: str) -> List[ActionItem]:
+        """Add newly transcribed text; returns the action items it completed."""
+        if not text:
+            return []
+        with metrics.span('live.feed'):
+            metrics.incr('live.updates')
+            lines = self._complete(self._line_parts, text, '\n')
+            if lines:
+                self._add_lines(lines)
+            sentences = self._complete(self._sentence_parts, text, _SENTENCE_END)
+            return self._add_sentences(sentences) if sentences else []
+
+    def flush(self) -> List[ActionItem]:
+        """End of the meeting: analyze the unfinished last line and sentence."""
+        lines, self._line_parts = ''.join(self._line_parts), []
+        if lines:
+            self._add_lines(lines)
+        sentences, self._sentence_parts = ''.join(self._sentence_parts), []
+        return self._add_sentences(sentences) if sentences else []
+
+    @staticmethod
+    def _complete(parts: List[str], text: str, ends: str) -> str:
+        """Text up to the last boundary character (pending parts included); the rest stays pending."""
+        cut = max(text.rfind(c) for c in ends)
+        if cut == -1:
+            parts.append(text)
+            return ''
+        done = ''.join(parts) + text[:cut + 1]
+        parts[:] = [text[cut + 1:]] if cut + 1 < len(text) else []
+        return done
+
+    def _add_lines(self, text: str) -> None:
+        for line in text.splitlines():
+            m = _SPEAKER_RE.match(line)
+            if m:
+                self._line_speaker = m.group(1).strip()
+                stats = self.speakers.get(self._line_speaker)
+                if stats is None:
+                    stats = self.speakers[self._line_speaker] = SpeakerStats()
+                    self._add_name(self._line_speaker)
+                stats.turns += 1
+                line = line[m.end():]
+            words = len(line.split())
+            self.word_count += words
+            if self._line_speaker:
+                self.speakers[self._line_speaker].words += words
+        tokens = keyword_tokens(text)
+        self.word_freq.update(tokens)
+        # Counts only grow, so a word can only enter the top set when its own count changes
+        for word in set(tokens):
+            if word in self._top or len(self._top) < _TOP_WORDS:
+                self._top[word] = self.word_freq[word]
+                continue
+            low = min(self._top, key=self._top.get)
+            if self.word_freq[word] > self._top[low]:
+                del self._top[low]
+                self._top[word] = self.word_freq[word]
+
+    def keywords(self) -> List[str]:
+        return meaningful_keywords(Counter(self._top))
+
+    def _add_sentences(self, text: str) -> List[ActionItem]:
+        keywords = self.keywords()
+        found = []
+        for sentence in extract_sentences(text):
+            # A sentence can end before its line does, so its speaker label is read here too
+            for m in _SPEAKER_RE.finditer(sentence):
+                self._sentence_speaker = m.group(1).strip()
+                self._add_name(self._sentence_speaker)
+            key = sentence.lower()
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            self.sentence_count += 1
+            if is_decision(sentence):
+                self.decisions.append(sentence)
+            if is_next_step(sentence):
+                self.next_steps.append(sentence)
+            if len(sentence) > 25:
+                entry = (score_sentence(sentence, keywords, self.word_freq), next(self._seq), sentence)
+                if len(self._pool) < self.key_points:
+                    heapq.heappush(self._pool, entry)
+                elif entry[0] > self._pool[0][0]:
+                    heapq.heapreplace(self._pool, entry)
+            item = action_from_sentence(sentence)
+            if item is None:
+                continue
+            if self.meeting_date is not None:
+                self._resolve(item)
+            self.action_items.append(item)
+            found.append(item)
+        if found:
+            metrics.incr('live.action_items', len(found))
+        return found
+
+    def _add_name(self, name: str) -> None:
+        if name not in self._names:
+            self._names[name] = None
+            self._owners = None
+
+    def _resolve(self, item: ActionItem) -> None:
+        if self._owners is None:
+            self._owners = OwnerResolver(self._names)
+        item.due_date = resolve_deadline(item.deadline, self.meeting_date, item.sentence)
+        item.owner_id = self._owners.resolve(item.owner)
+        if not item.owner_id and self._sentence_speaker and _FIRST_PERSON_RE.search(item.sentence):
+            item.owner_id = self._owners.resolve(self._sentence_speaker)
+
+    def action_batch(self) -> ActionItemBatch:
+        return ActionItemBatch(self.action_items)
+
+    def summary(self) -> MeetingSummary:
+        """Rolling summary of everything so far, in the shape ``generate_summary`` returns.
+
+        Key points are re-scored against the current keywords, so the cost
+        depends on ``key_points``, not on how long the meeting has run.
+        """
+        keywords = self.keywords()
+        participants = list(self.speakers)
+        summary = MeetingSummary(metadata={
+            'participants': participants,
+            'keywords': keywords,
+            'sentence_count': self.sentence_count,
+            'word_count': self.word_count,
+            'advanced_nlp': False,
+            'live': True,
+        })
+        if participants:
+            summary.add('👥', f'Participants ({len(participants)})', ', '.join(participants[:8]))
+        if keywords:
+            summary.add('🎯', 'Key Topics', ', '.join(keywords))
+        scored = sorted(((score_sentence(s, keywords, self.word_freq), seq, s) for _, seq, s in self._pool),
+                        reverse=True)
+        summary.add('💬', 'Key Discussion Points',
+                    bullets=[s.replace('"', '').strip() for _, _, s in scored[:3]])
+        if self.decisions:
+            summary.add('✅', 'Decisions Made', bullets=[s.replace('"', '').strip() for s in self.decisions[-self.recent:]])
+        if self.next_steps:
+            summary.add('🚀', 'Next Steps', bullets=[s.replace('"', '').strip() for s in self.next_steps[-self.recent:]])
+        return summary
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'word_count': self.word_count,
+            'sentence_count': self.sentence_count,
+            'speakers': {name: {'turns': s.turns, 'words': s.words} for name, s in self.speakers.items()},
+            'keywords': self.keywords(),
+            'action_items': len(self.action_items),
+            'decisions': len(self.decisions),
+        }
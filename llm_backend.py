@@ -0,0 +1,501 @@
+"""
+Optional Mistral backend for summaries and action items.
+
+Selected with ``MEETING_NLP_BACKEND=mistral`` (or ``backend='mistral'``);
+``generate_summary`` and ``enhanced_action_extraction`` keep their interface
+and fall back to the rule-based path whenever the backend is unavailable or
+a request fails.
+
+- Requests go through a small pool of keep-alive ``http.client``
+  connections, so consecutive calls reuse TLS sessions.
+- Transcripts over the token budget are split at line/sentence boundaries
+  and the chunks are sent concurrently; per-chunk results are merged.
+- Responses are cached in memory by (model, prompt), so re-analysing the
+  same transcript costs no requests.
+- ``python llm_backend.py mock`` serves a local, offline stand-in for the
+  chat completions API (answers come from the rule-based extractor) for
+  development and load tests.
+
+Configuration: ``MISTRAL_API_KEY`` (or ``[api] MISTRAL_API_KEY`` in Streamlit
+secrets), ``MISTRAL_BASE_URL`` (default https://api.mistral.ai),
+``MISTRAL_MODEL`` (default mistral-small-latest).
+"""
+import argparse
+import email.utils
+import hashlib
+import http.client
+import json
+import math
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import metrics
+from extractor import parse_mistral_action_items
+from meeting_summary import MeetingSummary
+from utils import extract_json_from_text
+
+DEFAULT_BASE_URL = 'https://api.mistral.ai'
+DEFAULT_MODEL = 'mistral-small-latest'
+CHARS_PER_TOKEN = 4
+_PLACEHOLDER_KEY = 'your-actual-mistral-api-key-here'
+# Longest wait honoured from a Retry-After header, in seconds
+MAX_RETRY_AFTER = 60.0
+
+SUMMARY_PROMPT = (
+    'You summarize meeting transcripts. Reply with JSON only, in the form '
+    '{"sections": [{"icon": "<emoji>", "title": "<title>", "text": "<one line>", "bullets": ["<point>"]}]} '
+    'using the sections Participants, Key Topics, Key Discussion Points, Decisions Made and Next Steps '
+    '(omit empty ones). Keep bullets short, factual and in the transcript\'s words.')
+ACTIONS_PROMPT = (
+    'You extract action items from meeting transcripts. Reply with JSON only, in the form '
+    '{"action_items": [{"task": "<what>", "owner": "<who or empty>", "deadline": "<when or empty>", '
+    '"priority": "High|Medium|Low"}]}. Only include concrete commitments or requests.')
+
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+class LLMError(RuntimeError):
+    """A request to the model API failed."""
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def chunk_by_tokens(text: str, max_tokens: int = 6000) -> List[str]:
+    """Split text into pieces of at most ``max_tokens`` (estimated), breaking between lines, then sentences."""
+    budget = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= budget:
+        return [text] if text.strip() else []
+    pieces: List[str] = []
+    for line in text.splitlines(keepends=True):
+        if len(line) <= budget:
+            pieces.append(line)
+            continue
+        for sentence in _SENTENCE_END_RE.split(line):
+            pieces.extend(sentence[i:i + budget] for i in range(0, len(sentence), budget))
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for piece in pieces:
+        if size + len(piece) > budget and current:
+            chunks.append(''.join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += len(piece)
+    if current:
+        chunks.append(''.join(current))
+    return [c for c in chunks if c.strip()]
+
+
+def _retry_delay(headers: Dict[str, str], attempt: int) -> float:
+    """Seconds to wait before retrying: ``Retry-After`` (seconds or an HTTP date), else exponential backoff."""
+    backoff = 0.5 * 2 ** attempt
+    value = next((v for k, v in headers.items() if k.lower() == 'retry-after'), '').strip()
+    if not value:
+        return backoff
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return backoff
+    if math.isnan(delay):
+        return backoff
+    return min(max(delay, 0.0), MAX_RETRY_AFTER)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections to one host, at most ``size`` in use at a time."""
+
+    def __init__(self, base_url: str, size: int = 8, timeout: float = 60.0):
+        parts = urllib.parse.urlsplit(base_url)
+        self.https = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self._idle: 'queue.LifoQueue[http.client.HTTPConnection]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    @contextmanager
+    def connection(self) -> Iterator[http.client.HTTPConnection]:
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            except BaseException:
+                conn.close()
+                raise
+            self._idle.put(conn)
+
+    def request(self, method: str, path: str, body: bytes, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """Send one request, retrying once on a fresh connection if a kept-alive one was closed by the server."""
+        for attempt in range(2):
+            try:
+                with self.connection() as conn:
+                    conn.request(method, self.prefix + path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    data = response.read()
+                    return response.status, dict(response.getheaders()), data
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if attempt:
+                    raise
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class ResponseCache:
+    """Thread-safe in-memory LRU of model responses."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+        metrics.incr('llm.cache_hit' if value is not None else 'llm.cache_miss')
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class MistralClient:
+    """Minimal chat completions client over a ``ConnectionPool``."""
+
+    def __init__(self, api_key: str, base_url: str = DEFAULT_BASE_URL, model: str = DEFAULT_MODEL,
+                 pool_size: int = 8, timeout: float = 60.0, retries: int = 3,
+                 cache: Optional[ResponseCache] = None):
+        self.api_key = api_key
+        self.model = model
+        self.retries = retries
+        self.pool = ConnectionPool(base_url, pool_size, timeout)
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='llm')
+
+    def chat(self, messages: List[Dict[str, str]], max_tokens: int = 1024, temperature: float = 0.1,
+             json_mode: bool = True) -> str:
+        """Return the assistant message for one conversation (cached)."""
+        key = ResponseCache.key(self.model, messages, max_tokens, temperature, json_mode)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        payload: Dict[str, Any] = {'model': self.model, 'messages': messages, 'max_tokens': max_tokens,
+                                   'temperature': temperature}
+        if json_mode:
+            payload['response_format'] = {'type': 'json_object'}
+        body = json.dumps(payload).encode('utf-8')
+        headers = {'Authorization': f'Bearer {self.api_key}', 'Content-Type': 'application/json',
+                   'Accept': 'application/json', 'Connection': 'keep-alive'}
+        for attempt in range(self.retries + 1):
+            metrics.incr('llm.requests')
+            with metrics.span('llm.request'):
+                status, response_headers, data = self.pool.request('POST', '/v1/chat/completions', body, headers)
+            if status == 200:
+                break
+            retryable = status == 429 or status >= 500
+            if not retryable or attempt == self.retries:
+                metrics.incr('llm.errors')
+                raise LLMError(f'Mistral API returned {status}: {data[:200].decode("utf-8", "replace")}')
+            metrics.incr('llm.retries')
+            time.sleep(_retry_delay(response_headers, attempt))
+        result = json.loads(data)
+        usage = result.get('usage') or {}
+        metrics.incr('llm.prompt_tokens', usage.get('prompt_tokens', 0))
+        metrics.incr('llm.completion_tokens', usage.get('completion_tokens', 0))
+        content = result['choices'][0]['message']['content']
+        if self.cache is not None:
+            self.cache.put(key, content)
+        return content
+
+    def chat_many(self, conversations: List[List[Dict[str, str]]], **kwargs) -> List[str]:
+        """Send several conversations concurrently (bounded by the pool size); results keep their order."""
+        if len(conversations) == 1:
+            return [self.chat(conversations[0], **kwargs)]
+        return list(self._executor.map(lambda messages: self.chat(messages, **kwargs), conversations))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.pool.close()
+
+
+def _messages(system: str, chunk: str, index: int, total: int) -> List[Dict[str, str]]:
+    part = f' (part {index + 1} of {total})' if total > 1 else ''
+    return [{'role': 'system', 'content': system},
+            {'role': 'user', 'content': f'Meeting transcript{part}:\n<<<\n{chunk}\n>>>'}]
+
+
+def _merge_summaries(summaries: List[MeetingSummary], max_bullets: int = 5) -> MeetingSummary:
+    """Combine per-chunk summaries: same-titled sections merged, bullets de-duplicated in order."""
+    merged = MeetingSummary(metadata={'backend': 'mistral', 'chunks': len(summaries)})
+    by_title: Dict[str, Any] = {}
+    for summary in summaries:
+        for section in summary.sections:
+            target = by_title.get(section.title)
+            if target is None:
+                target = by_title[section.title] = merged.add(section.icon, section.title, section.text)
+            elif not target.text:
+                target.text = section.text
+            for bullet in section.bullets:
+                if bullet not in target.bullets and len(target.bullets) < max_bullets:
+                    target.bullets.append(bullet)
+    return merged
+
+
+def parse_summary(text: str) -> MeetingSummary:
+    """Build a ``MeetingSummary`` from the model's JSON reply."""
+    data = extract_json_from_text(text or '')
+    sections = data.get('sections') if isinstance(data, dict) else None
+    if not isinstance(sections, list) or not sections:
+        raise LLMError('Model reply did not contain summary sections')
+    summary = MeetingSummary()
+    for raw in sections:
+        if not isinstance(raw, dict) or not raw.get('title'):
+            continue
+        bullets = [str(b).strip() for b in raw.get('bullets') or [] if str(b).strip()]
+        summary.add(str(raw.get('icon') or ''), str(raw['title']).strip(), str(raw.get('text') or '').strip(), bullets)
+    return summary
+
+
+class MistralBackend:
+    """Summaries and action items from Mistral, chunked to fit ``max_input_tokens`` per request."""
+
+    name = 'mistral'
+
+    def __init__(self, client: MistralClient, max_input_tokens: int = 6000):
+        self.client = client
+        self.max_input_tokens = max_input_tokens
+
+    def _ask(self, system: str, transcript: str, max_tokens: int) -> List[str]:
+        chunks = chunk_by_tokens(transcript, self.max_input_tokens)
+        conversations = [_messages(system, chunk, i, len(chunks)) for i, chunk in enumerate(chunks)]
+        return self.client.chat_many(conversations, max_tokens=max_tokens)
+
+    def summarize(self, transcript: str) -> MeetingSummary:
+        with metrics.span('llm.summary'):
+            replies = self._ask(SUMMARY_PROMPT, transcript, max_tokens=800)
+            return _merge_summaries([parse_summary(reply) for reply in replies])
+
+    def extract_action_items(self, transcript: str) -> List[Dict[str, Any]]:
+        with metrics.span('llm.extract'):
+            replies = self._ask(ACTIONS_PROMPT, transcript, max_tokens=1200)
+            items, seen = [], set()
+            for reply in replies:
+                for item in parse_mistral_action_items(reply):
+                    key = item['task'].lower()
+                    if key not in seen:
+                        seen.add(key)
+                        items.append(item)
+            return items
+
+
+def get_api_key() -> Optional[str]:
+    """``MISTRAL_API_KEY`` from the environment, else from Streamlit secrets when running in the app."""
+    key = os.environ.get('MISTRAL_API_KEY')
+    if not key:
+        try:
+            import streamlit as st
+            key = st.secrets['api']['MISTRAL_API_KEY']
+        except Exception:
+            key = None
+    return key if key and key != _PLACEHOLDER_KEY else None
+
+
+_backends: Dict[Tuple[str, str], MistralBackend] = {}
+_backends_lock = threading.Lock()
+_cache = ResponseCache()
+
+
+def get_llm(name: str = 'mistral') -> MistralBackend:
+    """Shared backend instance (one connection pool and cache per process).
+
+    Raises ``LLMError`` when no API key is configured; a local mock server
+    (``MISTRAL_BASE_URL=http://127.0.0.1:...``) needs none.
+    """
+    if name != 'mistral':
+        raise ValueError(f"Unknown NLP backend '{name}'. Choose from: rules, mistral")
+    base_url = os.environ.get('MISTRAL_BASE_URL', DEFAULT_BASE_URL)
+    model = os.environ.get('MISTRAL_MODEL', DEFAULT_MODEL)
+    with _backends_lock:
+        backend = _backends.get((base_url, model))
+        if backend is None:
+            api_key = get_api_key()
+            if not api_key:
+                if not base_url.startswith('http://'):
+                    raise LLMError('MISTRAL_API_KEY is not configured')
+                api_key = 'mock'
+            backend = _backends[(base_url, model)] = MistralBackend(
+                MistralClient(api_key, base_url, model, cache=_cache))
+        return backend
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    """Chat completions stand-in: answers come from the rule-based extractor."""
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    error_rate = 0.0
+    _counter = 0
+    _counter_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        from nlp_summarizer import enhanced_action_extraction, generate_summary
+
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        if self.path.rstrip('/') != '/v1/chat/completions':
+            return self._send(404, {'message': 'Not found'})
+        with _MockHandler._counter_lock:
+            _MockHandler._counter += 1
+            request_id = _MockHandler._counter
+        if random.random() < self.error_rate:
+            return self._send(429, {'message': 'Rate limited (mock)'}, {'Retry-After': '0.05'})
+        if self.latency:
+            time.sleep(self.latency)
+        system, user = request['messages'][0]['content'], request['messages'][-1]['content']
+        match = re.search(r'<<<\n(.*)\n>>>', user, re.S)
+        transcript = match.group(1) if match else user
+        if 'action items' in system:
+            content = {'action_items': [
+                {k: item[k] for k in ('task', 'owner', 'deadline', 'priority')}
+                for item in enhanced_action_extraction(transcript, backend='rules')]}
+        else:
+            summary = generate_summary(transcript, structured=True, backend='rules')
+            content = {'sections': summary.to_dict()['sections']}
+        text = json.dumps(content)
+        self._send(200, {
+            'id': f'mock-{request_id}', 'object': 'chat.completion', 'model': request.get('model'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': estimate_tokens(system + user), 'completion_tokens': estimate_tokens(text)},
+        })
+
+
+def serve_mock(host: str = '127.0.0.1', port: int = 8089, latency: float = 0.0,
+               error_rate: float = 0.0) -> ThreadingHTTPServer:
+    """Start the mock API server in a background thread and return it (call ``shutdown()`` to stop)."""
+    handler = type('MockHandler', (_MockHandler,), {'latency': latency, 'error_rate': error_rate})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] if ordered else 0.0
+
+
+def load_test(transcript: str, requests: int, concurrency: int) -> Dict[str, float]:
+    """Issue ``requests`` uncached summary calls with ``concurrency`` in flight; returns throughput and latency."""
+    backend = get_llm()
+    backend.client.cache = None
+    latencies: List[float] = []
+
+    def one(i: int) -> None:
+        start = time.perf_counter()
+        backend.summarize(f'{transcript}\n[run {i}]')
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+    return {'requests': requests, 'seconds': elapsed, 'req_per_s': requests / elapsed,
+            'p50_ms': _percentile(latencies, 0.5) * 1000, 'p95_ms': _percentile(latencies, 0.95) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mistral summarization backend tools')
+    sub = parser.add_subparsers(dest='command', required=True)
+    mock = sub.add_parser('mock', help='Run a local mock of the chat completions API')
+    mock.add_argument('--host', default='127.0.0.1')
+    mock.add_argument('--port', type=int, default=8089)
+    mock.add_argument('--latency', type=float, default=0.0, help='Seconds of simulated model latency')
+    mock.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    for name, what in (('summarize', 'Summarize'), ('actions', 'Extract action items from')):
+        cmd = sub.add_parser(name, help=f'{what} a transcript file through the backend')
+        cmd.add_argument('file')
+    load = sub.add_parser('loadtest', help='Concurrent summary requests against MISTRAL_BASE_URL')
+    load.add_argument('file')
+    load.add_argument('--requests', type=int, default=200)
+    load.add_argument('--concurrency', type=int, default=8)
+    load.add_argument('--mock', action='store_true', help='Start an in-process mock server and target it')
+    load.add_argument('--latency', type=float, default=0.05, help='Mock latency in seconds (with --mock)')
+    args = parser.parse_args()
+
+    if args.command == 'mock':
+        server = serve_mock(args.host, args.port, args.latency, args.error_rate)
+        print(f'Mock Mistral API on http://{args.host}:{args.port} (Ctrl+C to stop)')
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+    with open(args.file, 'r', encoding='utf-8') as f:
+        transcript = f.read()
+    if args.command == 'loadtest':
+        if args.mock:
+            server = serve_mock(port=0, latency=args.latency)
+            os.environ['MISTRAL_BASE_URL'] = f'http://127.0.0.1:{server.server_address[1]}'
+        result = load_test(transcript, args.requests, args.concurrency)
+        print(f"{result['requests']} requests in {result['seconds']:.2f}s: {result['req_per_s']:.1f} req/s, "
+              f"p50 {result['p50_ms']:.0f} ms, p95 {result['p95_ms']:.0f} ms")
+    elif args.command == 'summarize':
+        print(get_llm().summarize(transcript).to_markdown())
+    else:
+        for item in get_llm().extract_action_items(transcript):
+            print(f"- [{item['priority']}] {item['task']} (owner: {item['owner'] or '-'}, "
+                  f"deadline: {item['deadline'] or '-'})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Structured meeting summary with markdown, HTML and plain-text renderers.
+
+``generate_summary(..., structured=True)`` returns a ``MeetingSummary``:
+titled sections holding an inline value and/or bullet points, plus metadata
+about the analysis. Each renderer walks the sections once and memoizes its
+output on the object, so a page or API response that renders the same
+summary several times does the work once.
+"""
+import html
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass(slots=True)
+class SummarySection:
+    """One labelled part of a summary, e.g. "👥 Participants (4): John, Sarah"."""
+    icon: str
+    title: str
+    text: str = ''
+    bullets: List[str] = field(default_factory=list)
+
+    @property
+    def label(self) -> str:
+        return f'{self.icon} {self.title}' if self.icon else self.title
+
+
+@dataclass(slots=True)
+class MeetingSummary:
+    sections: List[SummarySection] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    _rendered: Dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+
+    def add(self, icon: str, title: str, text: str = '', bullets: List[str] = None) -> SummarySection:
+        section = SummarySection(icon, title, text, list(bullets or []))
+        self.sections.append(section)
+        self._rendered.clear()
+        return section
+
+    def section(self, title: str) -> SummarySection:
+        for section in self.sections:
+            if section.title == title:
+                return section
+        raise KeyError(title)
+
+    def _memo(self, kind: str, render) -> str:
+        out = self._rendered.get(kind)
+        if out is None:
+            out = self._rendered[kind] = render()
+        return out
+
+    def to_markdown(self) -> str:
+        """The markdown string ``generate_summary`` has always returned."""
+        def render():
+            parts = []
+            for s in self.sections:
+                parts.append(f'**{s.label}:** {s.text}' if s.text else f'**{s.label}:**')
+                parts.extend(f'   • {bullet}' for bullet in s.bullets)
+            return '\n\n'.join(parts)
+        return self._memo('markdown', render)
+
+    def to_html(self) -> str:
+        """HTML fragment: one paragraph per section, bullets as a list. All text is escaped."""
+        def render():
+            parts = ['<div class="meeting-summary">']
+            for s in self.sections:
+                label = html.escape(s.label)
+                text = f' {html.escape(s.text)}' if s.text else ''
+                parts.append(f'<p><strong>{label}:</strong>{text}</p>')
+                if s.bullets:
+                    parts.append('<ul>')
+                    parts.extend(f'<li>{html.escape(bullet)}</li>' for bullet in s.bullets)
+                    parts.append('</ul>')
+            parts.append('</div>')
+            return ''.join(parts)
+        return self._memo('html', render)
+
+    def to_text(self) -> str:
+        """Plain text without markup, e.g. for email or terminals."""
+        def render():
+            lines = []
+            for s in self.sections:
+                lines.append(f'{s.title}: {s.text}' if s.text else f'{s.title}:')
+                lines.extend(f'  - {bullet}' for bullet in s.bullets)
+            return '\n'.join(lines)
+        return self._memo('text', render)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'sections': [asdict(s) for s in self.sections], 'metadata': dict(self.metadata)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MeetingSummary':
+        """Inverse of ``to_dict``, e.g. for summaries kept in ``shared_cache``."""
+        return cls([SummarySection(**s) for s in data.get('sections', [])], dict(data.get('metadata', {})))
+
+    def render(self, fmt: str = 'markdown') -> Any:
+        """Render by name: 'markdown', 'html', 'text' or 'json' (a dict)."""
+        renderers = {'markdown': self.to_markdown, 'html': self.to_html, 'text': self.to_text, 'json': self.to_dict}
+        if fmt not in renderers:
+            raise ValueError(f"Unknown summary format '{fmt}'. Choose from: {', '.join(renderers)}")
+        return renderers[fmt]()
+
+    def __str__(self) -> str:
+        return self.to_markdown()
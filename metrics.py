@@ -0,0 +1,270 @@
+"""
+Lightweight instrumentation for the summarizer, transcription and TTS pipelines.
+
+Stages are wrapped in spans (``with span('audio.decode'):`` or the
+``@timed`` decorator); counters, gauges and histograms cover everything
+else. Recording is off unless ``MEETING_METRICS=1`` is set or ``enable()`` is
+called, and when off every hook returns immediately. Collected data can be
+exported as JSON, Prometheus text format or a Chrome trace file
+(chrome://tracing, Perfetto).
+"""
+import functools
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+_enabled = os.environ.get('MEETING_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+
+# Bounded storage so a long-running server never grows without limit
+HISTOGRAM_SAMPLES = 10000
+TRACE_EVENTS = 100000
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_gauges: Dict[str, float] = {}
+_histograms: Dict[str, Deque[float]] = {}
+_histogram_totals: Dict[str, List[float]] = {}  # name -> [count, sum] over all samples ever seen
+_trace: Deque[Dict[str, Any]] = deque(maxlen=TRACE_EVENTS)
+_started = time.time()
+
+
+def enable(flag: bool = True) -> None:
+    """Turn metric recording on or off for this process."""
+    global _enabled
+    _enabled = flag
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Drop all recorded metrics and trace events."""
+    global _started
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
+        _histogram_totals.clear()
+        _trace.clear()
+        _started = time.time()
+
+
+def incr(name: str, value: float = 1) -> None:
+    """Add ``value`` to a counter."""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def set_gauge(name: str, value: float) -> None:
+    """Set a gauge to its current value (queue depth, memory, ...)."""
+    if not _enabled:
+        return
+    with _lock:
+        _gauges[name] = value
+
+
+def observe(name: str, value: float) -> None:
+    """Record one sample in a histogram."""
+    if not _enabled:
+        return
+    with _lock:
+        samples = _histograms.get(name)
+        if samples is None:
+            samples = _histograms[name] = deque(maxlen=HISTOGRAM_SAMPLES)
+            _histogram_totals[name] = [0, 0.0]
+        samples.append(value)
+        totals = _histogram_totals[name]
+        totals[0] += 1
+        totals[1] += value
+
+
+class _Span:
+    """Times a block, recording it as ``stage.<name>`` seconds and as a trace event."""
+    __slots__ = ('name', 'args', '_start')
+
+    def __init__(self, name: str, args: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.args = args
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ns = time.perf_counter_ns() - self._start
+        observe(f'stage.{self.name}', duration_ns / 1e9)
+        if exc_type is not None:
+            incr(f'stage.{self.name}.errors')
+        event = {'name': self.name, 'ph': 'X', 'ts': self._start / 1000, 'dur': duration_ns / 1000,
+                 'pid': os.getpid(), 'tid': threading.get_ident()}
+        if self.args:
+            event['args'] = self.args
+        with _lock:
+            _trace.append(event)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **args):
+    """Context manager timing a pipeline stage. Extra keyword args go into the trace event."""
+    if not _enabled:
+        return _NOOP_SPAN
+    return _Span(name, args or None)
+
+
+def timed(name: str) -> Callable:
+    """Decorator form of ``span`` for whole functions."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def rss_mb() -> float:
+    """Current resident memory of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1 << 20)
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+def snapshot() -> Dict[str, Any]:
+    """Current counters, gauges and histogram summaries (count, sum, p50/p95/p99, max)."""
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        samples = {name: sorted(values) for name, values in _histograms.items()}
+        totals = {name: list(t) for name, t in _histogram_totals.items()}
+    histograms = {}
+    for name, values in samples.items():
+        histograms[name] = {
+            'count': int(totals[name][0]),
+            'sum': totals[name][1],
+            'p50': _percentile(values, 0.50),
+            'p95': _percentile(values, 0.95),
+            'p99': _percentile(values, 0.99),
+            'max': values[-1] if values else 0.0,
+        }
+    return {'uptime_s': time.time() - _started, 'counters': counters, 'gauges': gauges,
+            'histograms': histograms}
+
+
+def to_json(indent: Optional[int] = 2) -> str:
+    return json.dumps(snapshot(), indent=indent)
+
+
+def _prom_name(name: str) -> str:
+    return 'meeting_' + re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+def to_prometheus() -> str:
+    """Render the snapshot in Prometheus text exposition format.
+
+    Stage spans become one ``meeting_stage_seconds`` summary labelled by stage.
+    """
+    snap = snapshot()
+    out = io.StringIO()
+    for name, value in sorted(snap['counters'].items()):
+        metric = _prom_name(name) + '_total'
+        out.write(f'# TYPE {metric} counter\n{metric} {value}\n')
+    for name, value in sorted(snap['gauges'].items()):
+        metric = _prom_name(name)
+        out.write(f'# TYPE {metric} gauge\n{metric} {value}\n')
+    typed = set()
+    for name, h in sorted(snap['histograms'].items()):
+        if name.startswith('stage.'):
+            metric, labels = 'meeting_stage_seconds', f'stage="{name[len("stage."):]}"'
+        else:
+            metric, labels = _prom_name(name), ''
+        if metric not in typed:
+            out.write(f'# TYPE {metric} summary\n')
+            typed.add(metric)
+        sep = ',' if labels else ''
+        for q in ('0.5', '0.95', '0.99'):
+            key = {'0.5': 'p50', '0.95': 'p95', '0.99': 'p99'}[q]
+            out.write(f'{metric}{{{labels}{sep}quantile="{q}"}} {h[key]}\n')
+        suffix = f'{{{labels}}}' if labels else ''
+        out.write(f'{metric}_sum{suffix} {h["sum"]}\n{metric}_count{suffix} {h["count"]}\n')
+    return out.getvalue()
+
+
+def write_chrome_trace(path: str) -> str:
+    """Write recorded spans as a Chrome trace (JSON array format). Returns the path."""
+    with _lock:
+        events = list(_trace)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    return path
+
+
+@contextmanager
+def profile(kind: str = 'cprofile', limit: int = 30) -> Iterator[Dict[str, str]]:
+    """Profile the enclosed block with cProfile or pyinstrument.
+
+    Yields a dict whose ``'report'`` key holds the text report once the block
+    exits, so a single request can be profiled on demand.
+    """
+    result: Dict[str, str] = {'kind': kind, 'report': ''}
+    if kind == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError as e:
+            raise RuntimeError("pyinstrument profiling requires 'pip install pyinstrument'") from e
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield result
+        finally:
+            profiler.stop()
+            result['report'] = profiler.output_text(unicode=True, color=False)
+        return
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
+        result['report'] = stream.getvalue()
@@ -1,9 +1,17 @@
 """
 NLP-based summarization and analysis without external APIs
 """
+import os
 import re
+import bisect
 from collections import Counter
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
+import metrics
+from action_items import ActionItem, ActionItemBatch
+from dedup import dedupe_sentences
+from deadline_resolver import DateLike, OwnerResolver, resolve_deadline
+from meeting_summary import MeetingSummary
+from tokenizer import stop_words, tokenize
 try:
     from advanced_nlp import (
         advanced_sentiment_analysis, extract_named_entities, 
@@ -14,38 +22,115 @@ try:
 except ImportError:
     ADVANCED_NLP_AVAILABLE = False
 
+# Patterns are compiled once at import (run_app warms this module before the first request)
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+_SPEAKER_RE = re.compile(r'^([A-Z][a-zA-Z\s]+?)(?:\s*\([^)]+\))?\s*:', re.MULTILINE)
+_OWNER_LABEL_RE = re.compile(r'([A-Z][a-zA-Z]+)(?:\s*\([^)]+\))?\s*:')
+_OWNER_NAME_RE = re.compile(r'\b([A-Z][a-zA-Z]+)\s+(?:will|shall|should|must|needs to)')
+_ACTION_INDICATORS = ('will', 'shall', 'should', 'must', 'need to', 'have to', 'going to', 'responsible', 'assign', 'due', 'by', 'before', 'after', 'deadline')
+_HIGH_PRIORITY_WORDS = ('urgent', 'asap', 'immediately', 'critical', 'important')
+_LOW_PRIORITY_WORDS = ('later', 'eventually', 'when possible', 'low priority')
+
+@metrics.timed('nlp.segment')
 def extract_sentences(text: str) -> List[str]:
     """Extract sentences from text"""
-    sentences = re.split(r'[.!?]+', text)
+    sentences = _SENTENCE_SPLIT_RE.split(text)
     return [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
 
 def extract_speakers(text: str) -> List[str]:
     """Extract speaker names from transcript"""
-    pattern = r'^([A-Z][a-zA-Z\s]+?)(?:\s*\([^)]+\))?\s*:'
-    speakers = re.findall(pattern, text, re.MULTILINE)
-    # Clean and deduplicate speakers
-    clean_speakers = []
-    for speaker in speakers:
-        clean_name = speaker.strip()
-        if clean_name and clean_name not in clean_speakers:
-            clean_speakers.append(clean_name)
-    return clean_speakers
+    speakers = _SPEAKER_RE.findall(text)
+    # Clean and deduplicate speakers, keeping first-appearance order
+    clean_speakers = dict.fromkeys(speaker.strip() for speaker in speakers)
+    clean_speakers.pop('', None)
+    return list(clean_speakers)
+
+# Devanagari names have no case, so any run of that script before a colon is a label too
+_SPEAKER_LABEL_RE = re.compile(r'^(?:[A-Z][a-zA-Z\s]+|[\u0900-\u0963\u0966-\u097f][\u0900-\u0963\u0966-\u097f\s]*)'
+                               r'(?:\s*\([^)]+\))?\s*:', re.MULTILINE)
+STOP_WORDS = stop_words('en')
 
-def calculate_word_frequency(text: str) -> Dict[str, int]:
+def keyword_tokens(text: str, language: Optional[str] = None, min_length: Optional[int] = None) -> List[str]:
+    """Lowercased content words of a text, without speaker labels or common words (see ``tokenizer.tokenize``)"""
+    text = _SPEAKER_LABEL_RE.sub('', text)
+    return tokenize(text, language, min_length)
+
+@metrics.timed('nlp.keywords')
+def calculate_word_frequency(text: str, language: Optional[str] = None,
+                             min_length: Optional[int] = None) -> Dict[str, int]:
     """Calculate word frequency for important terms"""
-    # Remove speaker names and common words
-    text = re.sub(r'^[A-Z][a-zA-Z\s]+(?:\s*\([^)]+\))?\s*:', '', text, flags=re.MULTILINE)
-    words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
-    
-    # Filter out common words
-    stop_words = {'will', 'that', 'this', 'with', 'have', 'they', 'from', 'been', 'were', 'said', 'each', 'which', 'their', 'time', 'would', 'there', 'could', 'other', 'more', 'very', 'what', 'know', 'just', 'first', 'into', 'over', 'think', 'also', 'your', 'work', 'life', 'only', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use'}
-    
-    filtered_words = [w for w in words if w not in stop_words]
-    return Counter(filtered_words)
+    return Counter(keyword_tokens(text, language, min_length))
+
+# Common meeting words that make poor topics
+MEETING_STOP_WORDS = frozenset({'team', 'need', 'will', 'next', 'before', 'after', 'meeting', 'update'})
+DECISION_INDICATORS = ('decided', 'agreed', 'concluded', 'important', 'key')
+
+def is_decision(sentence: str) -> bool:
+    """Sentence records a decision or outcome"""
+    return any(word in sentence.lower() for word in ['decided', 'agreed', 'concluded', 'approved', 'finalized'])
+
+def is_next_step(sentence: str) -> bool:
+    """Sentence describes a planned next step"""
+    if len(sentence) <= 30 or sentence.startswith('That'):
+        return False
+    return any(phrase in sentence.lower() for phrase in ['will', 'should', 'need to', 'plan to', 'next week', 'by friday', 'by monday'])
+
+def meaningful_keywords(word_freq: Counter, limit: int = 5) -> List[str]:
+    """Top title-cased keywords, skipping common meeting words"""
+    keywords = []
+    for word, freq in word_freq.most_common(15):
+        if word not in MEETING_STOP_WORDS:
+            keywords.append(word.title())
+        if len(keywords) >= limit:
+            break
+    return keywords
+
+def score_sentence(sentence: str, keywords: List[str], word_freq: Dict[str, int]) -> float:
+    """Key-point score: keyword frequency plus a bonus for decisions, halved for short or labelled lines"""
+    lowered = [k.lower() for k in keywords]
+    score = 0
+    # Keyword frequency score
+    for word in sentence.lower().split():
+        if word in lowered:
+            score += word_freq.get(word, 0) * 2
+    # Decision/conclusion indicators
+    if any(indicator in sentence.lower() for indicator in DECISION_INDICATORS):
+        score += 10
+    # Avoid very short or speaker-only sentences
+    if len(sentence) < 30 or sentence.count(':') > 0:
+        score *= 0.5
+    return score
+
+@metrics.timed('nlp.summary')
+def generate_summary(transcript: str, dedupe: bool = True, structured: bool = False,
+                     backend: Optional[str] = None, hierarchical: bool = False) -> Union[str, MeetingSummary]:
+    """Generate structured summary using NLP techniques
+
+    dedupe: collapse near-duplicate sentences (see ``dedup.dedupe_sentences``)
+    before scoring so repeated statements don't crowd out the key points.
+    structured: return a ``MeetingSummary`` (sections, bullets, metadata)
+    instead of its markdown rendering.
+    backend: 'rules' or 'mistral' (default: ``MEETING_NLP_BACKEND`` or
+    'rules'); the rule-based summary is used if the model is unavailable.
+    hierarchical: summarize windows of a long transcript in parallel and
+    reduce them (see ``hierarchical_summary.summarize_hierarchical``).
+    """
+    if hierarchical and _backend_name(backend) == 'rules':
+        from hierarchical_summary import summarize_hierarchical
+        summary = summarize_hierarchical(transcript)
+        return summary if structured else summary.to_markdown()
+    if _backend_name(backend) != 'rules':
+        try:
+            from llm_backend import get_llm
+            summary = get_llm(_backend_name(backend)).summarize(transcript)
+            return summary if structured else summary.to_markdown()
+        except Exception as e:
+            metrics.incr('llm.fallback')
+            print(f"LLM summary unavailable, using rule-based summary: {e}")
 
-def generate_summary(transcript: str) -> str:
-    """Generate structured summary using NLP techniques"""
     sentences = extract_sentences(transcript)
+    if dedupe:
+        sentences = dedupe_sentences(sentences)
     speakers = extract_speakers(transcript)
     word_freq = calculate_word_frequency(transcript)
     
@@ -53,50 +138,20 @@ def generate_summary(transcript: str) -> str:
     unique_speakers = list(set([s.strip() for s in speakers if s.strip()]))
     
     # Get meaningful keywords (filter out common meeting words)
-    meeting_stopwords = {'team', 'need', 'will', 'next', 'before', 'after', 'meeting', 'update'}
-    meaningful_keywords = []
-    for word, freq in word_freq.most_common(15):
-        if word not in meeting_stopwords and len(word) > 3:
-            meaningful_keywords.append(word.title())
-        if len(meaningful_keywords) >= 5:
-            break
+    keywords = meaningful_keywords(word_freq)
     
-    # Score sentences for key points
-    sentence_scores = {}
-    for i, sentence in enumerate(sentences):
-        score = 0
-        words = sentence.lower().split()
-        
-        # Keyword frequency score
-        for word in words:
-            if word in [k.lower() for k in meaningful_keywords]:
-                score += word_freq.get(word, 0) * 2
-        
-        # Decision/conclusion indicators
-        if any(indicator in sentence.lower() for indicator in ['decided', 'agreed', 'concluded', 'important', 'key']):
-            score += 10
-            
-        # Avoid very short or speaker-only sentences
-        if len(sentence) < 30 or sentence.count(':') > 0:
-            score *= 0.5
-            
-        sentence_scores[sentence] = score
+    with metrics.span('nlp.score'):
+        # Score sentences for key points
+        sentence_scores = {sentence: score_sentence(sentence, keywords, word_freq) for sentence in sentences}
     
     # Get top sentences for key points
     top_sentences = sorted(sentence_scores.items(), key=lambda x: x[1], reverse=True)[:4]
     
     # Extract main decisions and outcomes
-    decision_sentences = []
-    for sentence in sentences:
-        if any(word in sentence.lower() for word in ['decided', 'agreed', 'concluded', 'approved', 'finalized']):
-            decision_sentences.append(sentence)
+    decision_sentences = [sentence for sentence in sentences if is_decision(sentence)]
     
     # Extract next steps
-    next_step_sentences = []
-    for sentence in sentences:
-        if any(phrase in sentence.lower() for phrase in ['will', 'should', 'need to', 'plan to', 'next week', 'by friday', 'by monday']):
-            if len(sentence) > 30 and not sentence.startswith('That'):
-                next_step_sentences.append(sentence)
+    next_step_sentences = [sentence for sentence in sentences if is_next_step(sentence)]
     
     # Enhanced analysis with advanced NLP
     if ADVANCED_NLP_AVAILABLE:
@@ -111,66 +166,63 @@ def generate_summary(transcript: str) -> str:
             unique_speakers = list(set(unique_speakers))
         
         # Use key phrases instead of keywords
-        meaningful_keywords = [phrase[0].title() for phrase in key_phrases[:5]]
+        keywords = [phrase[0].title() for phrase in key_phrases[:5]]
     
     # Build structured summary
-    summary_parts = []
+    summary = MeetingSummary(metadata={
+        'participants': unique_speakers,
+        'keywords': keywords,
+        'sentence_count': len(sentences),
+        'advanced_nlp': ADVANCED_NLP_AVAILABLE,
+    })
     
     # Meeting overview with complexity analysis
     meeting_purpose = "Weekly product development meeting focused on SmartTrack feature improvements"
     if 'smarttrack' in transcript.lower():
-        summary_parts.append(f"**📋 Meeting Purpose:** {meeting_purpose}")
+        summary.add('📋', 'Meeting Purpose', meeting_purpose)
         if ADVANCED_NLP_AVAILABLE:
-            summary_parts.append(f"**🔍 Analysis:** {complexity['technical_level']} technical level, {complexity['decision_making_level']}")
+            summary.add('🔍', 'Analysis', f"{complexity['technical_level']} technical level, {complexity['decision_making_level']}")
     
     # Enhanced participants
     if unique_speakers:
         participants_list = ', '.join(unique_speakers[:8])
-        summary_parts.append(f"**👥 Participants ({len(unique_speakers)}):** {participants_list}")
+        summary.add('👥', f'Participants ({len(unique_speakers)})', participants_list)
     
     # Enhanced topics with AI insights
     if ADVANCED_NLP_AVAILABLE and 'topics' in locals() and topics:
-        summary_parts.append(f"**🎯 Discussion Themes:** {' | '.join(topics[:3])}")
-        if meaningful_keywords:
-            summary_parts.append(f"**🔑 Key Terms:** {', '.join(meaningful_keywords)}")
+        summary.add('🎯', 'Discussion Themes', ' | '.join(topics[:3]))
+        if keywords:
+            summary.add('🔑', 'Key Terms', ', '.join(keywords))
     else:
-        if meaningful_keywords:
-            topics_list = ', '.join(meaningful_keywords)
-            summary_parts.append(f"**🎯 Key Topics:** {topics_list}")
+        if keywords:
+            topics_list = ', '.join(keywords)
+            summary.add('🎯', 'Key Topics', topics_list)
     
     # Main discussion points
-    summary_parts.append("**💬 Key Discussion Points:**")
-    for sentence, _ in top_sentences[:3]:
-        if len(sentence) > 25:
-            clean_sentence = sentence.replace('"', '').strip()
-            summary_parts.append(f"   • {clean_sentence}")
+    summary.add('💬', 'Key Discussion Points',
+                bullets=[sentence.replace('"', '').strip() for sentence, _ in top_sentences[:3] if len(sentence) > 25])
     
     # Decisions made
     if decision_sentences:
-        summary_parts.append("**✅ Decisions Made:**")
-        for sentence in decision_sentences[:2]:
-            clean_sentence = sentence.replace('"', '').strip()
-            summary_parts.append(f"   • {clean_sentence}")
+        summary.add('✅', 'Decisions Made', bullets=[s.replace('"', '').strip() for s in decision_sentences[:2]])
     
     # Next steps
     if next_step_sentences:
-        summary_parts.append("**🚀 Next Steps:**")
-        for sentence in next_step_sentences[:3]:
-            clean_sentence = sentence.replace('"', '').strip()
-            if len(clean_sentence) > 25:
-                summary_parts.append(f"   • {clean_sentence}")
+        cleaned = (s.replace('"', '').strip() for s in next_step_sentences[:3])
+        summary.add('🚀', 'Next Steps', bullets=[s for s in cleaned if len(s) > 25])
     
     # Add AI-generated summary if available
     if ADVANCED_NLP_AVAILABLE and len(transcript) > 200:
         try:
             ai_summary = advanced_text_summarization(transcript, 100)
             if ai_summary and len(ai_summary) > 50:
-                summary_parts.append(f"**🤖 AI Insights:** {ai_summary}")
+                summary.add('🤖', 'AI Insights', ai_summary)
         except Exception:
             pass
     
-    return '\n\n'.join(summary_parts)
+    return summary if structured else summary.to_markdown()
 
+@metrics.timed('nlp.insights')
 def analyze_meeting_insights(transcript: str) -> Dict[str, Any]:
     """Generate meeting insights using advanced NLP analysis"""
     sentences = extract_sentences(transcript)
@@ -269,10 +321,143 @@ def analyze_meeting_insights(transcript: str) -> Dict[str, Any]:
     
     return insights
 
-def enhanced_action_extraction(transcript: str) -> List[Dict[str, Any]]:
-    """Enhanced action item extraction using NLP"""
+def _backend_name(backend: Optional[str]) -> str:
+    return (backend or os.environ.get('MEETING_NLP_BACKEND') or 'rules').lower()
+
+def _segment_index(transcript: str, segments: List[Any]) -> Tuple[List[int], List[Any]]:
+    """Locate each transcript segment's text in the transcript.
+
+    Returns parallel lists of character offsets and segments, sorted by
+    offset, for bisecting a character position back to its segment.
+    """
+    offsets, located = [], []
+    cursor = 0
+    for seg in segments:
+        pos = transcript.find(seg.text, cursor)
+        if pos == -1:
+            continue
+        offsets.append(pos)
+        located.append(seg)
+        cursor = pos + len(seg.text)
+    return offsets, located
+
+def enhanced_action_extraction(transcript: str, segments: Optional[List[Any]] = None,
+                               dedupe: bool = True, meeting_date: Optional[DateLike] = None,
+                               backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Enhanced action item extraction using NLP
+
+    segments: optional timestamped segments (``audio_processor.TranscriptSegment``)
+    the transcript was built from; when given, each action item also carries
+    the ``start_ms``/``end_ms`` of the segment it came from.
+    dedupe: collapse near-duplicate sentences first, so a repeated action is
+    reported once.
+    meeting_date: when given (date or ISO string), each item also gets a
+    resolved ISO ``due_date`` and the ``owner_id`` of the speaker it is
+    assigned to (see ``deadline_resolver``).
+    backend: 'rules' or 'mistral' (default: ``MEETING_NLP_BACKEND`` or
+    'rules'); rule-based extraction is used if the model is unavailable.
+    """
+    return [item.to_dict() for item in extract_action_items(transcript, segments, dedupe, meeting_date, backend)]
+
+def extract_action_batch(transcript: str, segments: Optional[List[Any]] = None,
+                         dedupe: bool = True, meeting_date: Optional[DateLike] = None,
+                         backend: Optional[str] = None) -> ActionItemBatch:
+    """Like ``enhanced_action_extraction`` but returns a compact columnar ``ActionItemBatch``."""
+    return ActionItemBatch(extract_action_items(transcript, segments, dedupe, meeting_date, backend))
+
+def _llm_action_items(transcript: str, backend: str,
+                      meeting_date: Optional[DateLike]) -> Optional[List[ActionItem]]:
+    """Action items from the model backend, or None to fall back to the rules."""
+    try:
+        from llm_backend import get_llm
+        raw_items = get_llm(backend).extract_action_items(transcript)
+    except Exception as e:
+        metrics.incr('llm.fallback')
+        print(f"LLM extraction unavailable, using rule-based extraction: {e}")
+        return None
+    items = [ActionItem(raw['task'], owner=raw['owner'], deadline=raw['deadline'].lower(),
+                        priority=raw['priority'], status=raw['status']) for raw in raw_items]
+    if meeting_date is not None:
+        owners = OwnerResolver(extract_speakers(transcript))
+        for item in items:
+            item.due_date = resolve_deadline(item.deadline, meeting_date, item.sentence)
+            item.owner_id = owners.resolve(item.owner)
+    return items
+
+# Straight or typographic apostrophe ("I’ll" in pasted documents)
+_FIRST_PERSON_RE = re.compile(r"\b(?:I['’]ll|I will|I['’]m going to|I am going to|I need to|I should|I can)\b")
+_DEADLINE_PATTERNS = [re.compile(p) for p in (
+    r'\b(today|tomorrow|yesterday)\b',
+    r'\b((?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)(?:\s+(?:of\s+)?next\s+week)?)\b',
+    r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\b',
+    r'\bby\s+(\w+(?:\s+\w+)?)\b',
+    r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b',
+    r'\b(\d{1,2}:\d{2})\b'
+)]
+
+def action_from_sentence(sentence: str) -> Optional[ActionItem]:
+    """The action item stated by one sentence (owner, deadline, priority), or None"""
+    # Skip if sentence is too short
+    if len(sentence) < 20:
+        return None
+        
+    # Check for action indicators
+    lowered = sentence.lower()
+    if not any(indicator in lowered for indicator in _ACTION_INDICATORS):
+        return None
+
+    # Extract owner (person mentioned before action)
+    owner_match = _OWNER_LABEL_RE.search(sentence)
+    owner = owner_match.group(1) if owner_match else None
+    
+    # If no owner from speaker pattern, look for names in sentence
+    if not owner:
+        name_match = _OWNER_NAME_RE.search(sentence)
+        owner = name_match.group(1) if name_match else None
+    
+    # Extract deadline
+    deadline = None
+    for pattern in _DEADLINE_PATTERNS:
+        match = pattern.search(lowered)
+        if match:
+            deadline = match.group(1)
+            break
+    
+    # Determine priority based on keywords
+    priority = "Medium"
+    if any(word in lowered for word in _HIGH_PRIORITY_WORDS):
+        priority = "High"
+    elif any(word in lowered for word in _LOW_PRIORITY_WORDS):
+        priority = "Low"
+    
+    # Clean up the task description
+    task_offset = 0
+    if owner and sentence.startswith(f"{owner}:"):
+        task_offset = len(owner) + 1
+    
+    return ActionItem(sentence, task_offset, owner or '', deadline or '', priority, 'Pending')
+
+@metrics.timed('nlp.extract')
+def extract_action_items(transcript: str, segments: Optional[List[Any]] = None,
+                         dedupe: bool = True, meeting_date: Optional[DateLike] = None,
+                         backend: Optional[str] = None) -> List[ActionItem]:
+    """Extract action items as ``ActionItem`` records (see ``enhanced_action_extraction``)."""
+    if _backend_name(backend) != 'rules':
+        items = _llm_action_items(transcript, _backend_name(backend), meeting_date)
+        if items is not None:
+            return items
     sentences = extract_sentences(transcript)
-    results = []
+    if dedupe:
+        sentences = dedupe_sentences(sentences)
+    results: List[ActionItem] = []
+    seg_offsets, seg_list = _segment_index(transcript, segments) if segments else ([], [])
+    cursor = 0
+
+    # Speaker turns, for resolving owners to speakers (including "I'll ..." sentences)
+    if meeting_date is not None:
+        turns = [(m.start(), m.group(1).strip()) for m in _SPEAKER_RE.finditer(transcript)]
+        turn_offsets = [offset for offset, _ in turns]
+        owners = OwnerResolver(dict.fromkeys(name for _, name in turns))
     
     # Patterns for action items
     action_patterns = [
@@ -282,59 +467,26 @@ def enhanced_action_extraction(transcript: str) -> List[Dict[str, Any]]:
     ]
     
     for sentence in sentences:
-        # Skip if sentence is too short
-        if len(sentence) < 20:
+        # Track where the sentence sits in the transcript for segment lookup
+        pos = transcript.find(sentence, cursor)
+        if pos != -1:
+            cursor = pos + len(sentence)
+
+        item = action_from_sentence(sentence)
+        if item is None:
             continue
-            
-        # Check for action indicators
-        action_indicators = ['will', 'shall', 'should', 'must', 'need to', 'have to', 'going to', 'responsible', 'assign', 'due', 'by', 'before', 'after', 'deadline']
-        
-        if any(indicator in sentence.lower() for indicator in action_indicators):
-            # Extract owner (person mentioned before action)
-            owner_match = re.search(r'([A-Z][a-zA-Z]+)(?:\s*\([^)]+\))?\s*:', sentence)
-            owner = owner_match.group(1) if owner_match else None
-            
-            # If no owner from speaker pattern, look for names in sentence
-            if not owner:
-                name_match = re.search(r'\b([A-Z][a-zA-Z]+)\s+(?:will|shall|should|must|needs to)', sentence)
-                owner = name_match.group(1) if name_match else None
-            
-            # Extract deadline
-            deadline_patterns = [
-                r'\b(today|tomorrow|yesterday)\b',
-                r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',
-                r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\b',
-                r'\bby\s+(\w+(?:\s+\w+)?)\b',
-                r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b',
-                r'\b(\d{1,2}:\d{2})\b'
-            ]
-            
-            deadline = None
-            for pattern in deadline_patterns:
-                match = re.search(pattern, sentence.lower())
-                if match:
-                    deadline = match.group(1)
-                    break
-            
-            # Determine priority based on keywords
-            priority = "Medium"
-            if any(word in sentence.lower() for word in ['urgent', 'asap', 'immediately', 'critical', 'important']):
-                priority = "High"
-            elif any(word in sentence.lower() for word in ['later', 'eventually', 'when possible', 'low priority']):
-                priority = "Low"
-            
-            # Clean up the task description
-            task = sentence
-            if owner and sentence.startswith(f"{owner}:"):
-                task = sentence[len(f"{owner}:"):].strip()
-            
-            results.append({
-                'task': task,
-                'owner': owner or '',
-                'deadline': deadline or '',
-                'priority': priority,
-                'status': 'Pending',
-                'note': f'Extracted from: "{sentence[:50]}..."' if len(sentence) > 50 else f'Extracted from: "{sentence}"'
-            })
+        if seg_list:
+            idx = bisect.bisect_right(seg_offsets, max(pos, 0)) - 1
+            seg = seg_list[max(idx, 0)]
+            item.start_ms = seg.start_ms
+            item.end_ms = seg.end_ms
+        if meeting_date is not None:
+            item.due_date = resolve_deadline(item.deadline, meeting_date, sentence)
+            item.owner_id = owners.resolve(item.owner)
+            if not item.owner_id and turns and _FIRST_PERSON_RE.search(sentence):
+                idx = bisect.bisect_right(turn_offsets, max(pos, 0)) - 1
+                if idx >= 0:
+                    item.owner_id = owners.resolve(turns[idx][1])
+        results.append(item)
     
     return results
\ No newline at end of file
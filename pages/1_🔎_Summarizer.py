@@ -1,10 +1,17 @@
-import os
 import pandas as pd
 import streamlit as st
 import json
-from nlp_summarizer import generate_summary, analyze_meeting_insights, enhanced_action_extraction
+from contextlib import ExitStack
+import metrics
+from nlp_summarizer import generate_summary, analyze_meeting_insights, extract_action_batch
+from hierarchical_summary import HIERARCHICAL_MIN_CHARS, summarize_hierarchical
+from live_analyzer import LiveAnalyzer
+from action_items import ActionItem, ActionItemBatch
+from meeting_summary import MeetingSummary
+from shared_cache import cache_key, get_shared_cache
+from dataclasses import asdict
 
-from audio_processor import transcribe_audio
+from audio_processor import transcribe_audio, segments_to_text
 
 # Custom CSS for modern styling
 st.markdown("""
@@ -50,6 +57,14 @@ st.markdown("""
         margin: 0.5rem 0;
         padding-left: 1rem;
     }
+    .meeting-summary {
+        font-size: 1rem;
+        line-height: 1.7;
+    }
+    .meeting-summary li {
+        margin: 0.3rem 0 0.3rem 20px;
+        color: #6b7280;
+    }
     .action-card {
         background: linear-gradient(135deg, #f0fdf4 0%, #dcfce7 100%);
         padding: 2rem;
@@ -120,11 +135,28 @@ st.markdown("""
 # Initialize session state for transcript persistence
 if 'transcript' not in st.session_state:
     st.session_state.transcript = ""
+if 'segments' not in st.session_state:
+    st.session_state.segments = None
+if 'summary_cache' not in st.session_state:
+    st.session_state.summary_cache = None
+# Set when run_app.py runs several workers: results are shared between them
+shared_cache = get_shared_cache()
+
+def shared_result(kind: str, compute):
+    """``compute()`` for the current transcript, computed once across all app workers."""
+    if shared_cache is None:
+        return compute()
+    return shared_cache.get_or_compute(cache_key(kind, st.session_state.transcript), compute)
+
+if 'live' not in st.session_state:
+    st.session_state.live = None
+    st.session_state.live_text = []
+    st.session_state.live_clip = None
 
 # Input section
 st.markdown("## 📥 Input Options")
 
-tab1, tab2 = st.tabs(["📝 Text Input", "🎤 Audio Input"])
+tab1, tab2, tab3 = st.tabs(["📝 Text Input", "🎤 Audio Input", "🔴 Live Meeting"])
 
 with tab1:
     st.markdown('<div class="tab-content">', unsafe_allow_html=True)
@@ -139,6 +171,7 @@ with tab1:
     # Update session state when text changes
     if transcript != st.session_state.transcript:
         st.session_state.transcript = transcript
+        st.session_state.segments = None
     st.markdown('</div>', unsafe_allow_html=True)
 
 with tab2:
@@ -155,10 +188,8 @@ with tab2:
         st.success(f"✅ File uploaded: {audio_file.name}")
         
         if st.button("🎯 Transcribe Audio", type="primary"):
+            metrics.incr('requests.transcribe')
             progress = st.progress(0.0, text="Transcribing audio...")
-            temp_path = f"temp_{audio_file.name}"
-            with open(temp_path, "wb") as f:
-                f.write(audio_file.getbuffer())
             
             def on_progress(p: float):
                 try:
@@ -166,14 +197,15 @@ with tab2:
                 except Exception:
                     pass
             
-            audio_transcript = transcribe_audio(temp_path, on_progress=on_progress)
-            os.remove(temp_path)
+            # Decoded straight from the upload buffer, no temp copy in the working directory
+            segments = transcribe_audio(audio_file, on_progress=on_progress, return_segments=True)
             progress.empty()
             
-            if audio_transcript:
+            if segments:
                 st.success("🎉 Transcription completed!")
-                # Update session state with transcribed text
-                st.session_state.transcript = audio_transcript
+                # Update session state with transcribed text and its timestamped segments
+                st.session_state.transcript = segments_to_text(segments)
+                st.session_state.segments = segments
                 st.rerun()  # Refresh to show the transcribed text
             else:
                 st.error("❌ Failed to transcribe audio. Please try again.")
@@ -181,6 +213,65 @@ with tab2:
         st.info("👆 Upload an audio file to transcribe it to text.")
     st.markdown('</div>', unsafe_allow_html=True)
 
+with tab3:
+    st.markdown('<div class="tab-content">', unsafe_allow_html=True)
+    st.markdown("### Follow a meeting while it happens:")
+    st.caption("Add transcript lines or record short clips as the meeting goes on; action items and the summary update with each addition.")
+    if st.session_state.live is None:
+        st.session_state.live = LiveAnalyzer(meeting_date=pd.Timestamp.today().date())
+    live = st.session_state.live
+
+    def add_live_text(text: str):
+        st.session_state.live_text.append(text)
+        live.feed(text)
+
+    with st.form('live_form', clear_on_submit=True):
+        new_text = st.text_area('New transcript lines', height=120,
+                                placeholder="Mike: I'll send the revised budget by Friday.")
+        if st.form_submit_button('➕ Add to meeting') and new_text.strip():
+            add_live_text(new_text.rstrip() + '\n')
+    if hasattr(st, 'audio_input'):
+        clip = st.audio_input('🎙️ Record a clip')
+        # The widget keeps its value across reruns; transcribe each recording once
+        if clip is not None and clip.file_id != st.session_state.live_clip:
+            st.session_state.live_clip = clip.file_id
+            with st.spinner('Transcribing clip...'):
+                clip_text = transcribe_audio(clip)
+            if clip_text:
+                # A clip ends at a pause, which counts as the end of a sentence
+                add_live_text(clip_text.strip() + ('' if clip_text.strip()[-1] in '.!?' else '.') + '\n')
+
+    stats = live.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.markdown(f'<div class="metric-card"><h4>{stats["word_count"]}</h4><p>Words</p></div>', unsafe_allow_html=True)
+    with col2:
+        st.markdown(f'<div class="metric-card"><h4>{len(stats["speakers"])}</h4><p>Speakers</p></div>', unsafe_allow_html=True)
+    with col3:
+        st.markdown(f'<div class="metric-card"><h4>{stats["action_items"]}</h4><p>Action Items</p></div>', unsafe_allow_html=True)
+    with col4:
+        st.markdown(f'<div class="metric-card"><h4>{stats["decisions"]}</h4><p>Decisions</p></div>', unsafe_allow_html=True)
+
+    if stats['word_count']:
+        st.markdown(f'<div class="summary-card">{live.summary().to_html()}</div>', unsafe_allow_html=True)
+        if live.action_items:
+            st.dataframe(pd.DataFrame(live.action_batch().to_dicts()), use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button('⏹️ End meeting and analyze', use_container_width=True, disabled=not st.session_state.live_text):
+            st.session_state.transcript = ''.join(st.session_state.live_text)
+            st.session_state.segments = None
+            st.session_state.live = None
+            st.session_state.live_text = []
+            st.rerun()
+    with col2:
+        if st.button('🔄 Start over', use_container_width=True):
+            st.session_state.live = None
+            st.session_state.live_text = []
+            st.rerun()
+    st.markdown('</div>', unsafe_allow_html=True)
+
 # Show current transcript if available
 if st.session_state.transcript:
     st.markdown("## 📄 Current Transcript")
@@ -204,18 +295,24 @@ with col1:
     st.info("Advanced natural language processing for comprehensive meeting analysis")
 with col2:
     st.markdown("")
+    # Per-request profiling is only offered when instrumentation is switched on
+    profile_run = metrics.is_enabled() and st.checkbox("🔬 Profile this run", help="Collect a cProfile report for this request")
 
 if st.button('🚀 Generate Summary & Actions', type="primary", use_container_width=True):
     if not st.session_state.transcript or not st.session_state.transcript.strip():
         st.error('❌ Please provide a transcript first!')
     else:
+        metrics.incr('requests.summarize')
+        profiling = ExitStack()
+        profile_report = profiling.enter_context(metrics.profile()) if profile_run else None
+
         # Summary and insights generation
         st.markdown("## 📊 Results")
         
         # Generate meeting insights
         with st.spinner('🔍 Analyzing meeting insights...'):
             try:
-                insights = analyze_meeting_insights(st.session_state.transcript)
+                insights = shared_result('insights', lambda: analyze_meeting_insights(st.session_state.transcript))
             except Exception as e:
                 st.warning(f'⚠️ Could not generate insights: {e}')
                 insights = None
@@ -244,23 +341,38 @@ if st.button('🚀 Generate Summary & Actions', type="primary", use_container_wi
                 st.markdown(f'<div class="metric-card"><h4 style="color: {sentiment_color}">{sentiment_icon}</h4><h4 style="color: {sentiment_color}">{sentiment}</h4><p>Sentiment</p></div>', unsafe_allow_html=True)
         
         with st.spinner('🧠 Generating summary...'):
-            summary = generate_summary(st.session_state.transcript)
+            # Reuse the summary (and its rendered HTML) while the transcript is unchanged
+            cached = st.session_state.summary_cache
+            if cached and cached[0] == st.session_state.transcript:
+                summary = cached[1]
+            elif len(st.session_state.transcript) >= HIERARCHICAL_MIN_CHARS:
+                # Long meeting: summarize windows in parallel, showing each one as it finishes
+                progress = st.expander('🕒 Summaries by section (long meeting)', expanded=False)
+                def show_window(window, window_summary):
+                    progress.markdown(f'**{window.label}**')
+                    progress.markdown(f'<div class="summary-card">{window_summary.to_html()}</div>',
+                                      unsafe_allow_html=True)
+                summary = summarize_hierarchical(st.session_state.transcript, segments=st.session_state.segments,
+                                                 on_window=show_window)
+                st.session_state.summary_cache = (st.session_state.transcript, summary)
+            else:
+                summary = MeetingSummary.from_dict(shared_result(
+                    'summary', lambda: generate_summary(st.session_state.transcript, structured=True).to_dict()))
+                st.session_state.summary_cache = (st.session_state.transcript, summary)
             
             st.markdown("### 📝 Meeting Summary")
-            # Convert markdown-style formatting to HTML for better display
-            html_summary = summary.replace('**', '<strong>').replace('**', '</strong>')
-            html_summary = html_summary.replace('\n\n', '</p><p>').replace('\n', '<br>')
-            html_summary = html_summary.replace('•', '<li style="margin: 0.5rem 0; color: #374151;">')
-            html_summary = html_summary.replace('   •', '<li style="margin: 0.3rem 0 0.3rem 20px; color: #6b7280;">')
-            html_summary = f'<div style="font-size: 1rem; line-height: 1.7;"><p>{html_summary}</p></div>'
-            st.markdown(f'<div class="summary-card">{html_summary}</div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="summary-card">{summary.to_html()}</div>', unsafe_allow_html=True)
 
         # Action items extraction
         with st.spinner('🎯 Extracting action items...'):
-            items = enhanced_action_extraction(st.session_state.transcript)
+            if st.session_state.segments is None:
+                batch = ActionItemBatch(ActionItem(**fields) for fields in shared_result(
+                    'actions', lambda: [asdict(item) for item in extract_action_batch(st.session_state.transcript)]))
+            else:
+                batch = extract_action_batch(st.session_state.transcript, segments=st.session_state.segments)
 
-            if items:
-                df = pd.DataFrame(items)
+            if len(batch):
+                df = pd.DataFrame(batch.to_dicts())
                 
                 st.markdown("### ✅ Action Items")
                 
@@ -303,7 +415,9 @@ if st.button('🚀 Generate Summary & Actions', type="primary", use_container_wi
                         options=["Pending", "In Progress", "Completed"],
                         width="small"
                     ) if 'status' in df.columns else None,
-                    "note": st.column_config.TextColumn("Notes", width="medium")
+                    "note": st.column_config.TextColumn("Notes", width="medium"),
+                    "start_ms": st.column_config.NumberColumn("Start (ms)", width="small") if 'start_ms' in df.columns else None,
+                    "end_ms": st.column_config.NumberColumn("End (ms)", width="small") if 'end_ms' in df.columns else None
                 }
                 
                 # Remove None values from column_config
@@ -322,7 +436,7 @@ if st.button('🚀 Generate Summary & Actions', type="primary", use_container_wi
                 with col1:
                     st.download_button(
                         '📥 Download CSV', 
-                        df.to_csv(index=False).encode('utf-8'), 
+                        batch.to_csv().encode('utf-8'), 
                         'action_items.csv', 
                         'text/csv',
                         use_container_width=True
@@ -330,7 +444,7 @@ if st.button('🚀 Generate Summary & Actions', type="primary", use_container_wi
                 with col2:
                     st.download_button(
                         '📥 Download JSON', 
-                        df.to_json(orient='records').encode('utf-8'), 
+                        batch.to_json().encode('utf-8'), 
                         'action_items.json', 
                         'application/json',
                         use_container_width=True
@@ -438,3 +552,7 @@ if st.button('🚀 Generate Summary & Actions', type="primary", use_container_wi
                             for issue in insights['issues_raised']:
                                 st.markdown(f"• {issue}")
 
+        profiling.close()
+        if profile_report:
+            with st.expander("🔬 Profile report", expanded=False):
+                st.code(profile_report['report'])
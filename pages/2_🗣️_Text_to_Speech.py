@@ -1,8 +1,11 @@
 import streamlit as st
 from text_to_audio import text_to_speech
-from pathlib import Path
+import metrics
+import scratch
 import os
 
+PREVIEW_BYTES = 20000
+
 # Custom CSS for modern styling
 st.markdown("""
 <style>
@@ -80,9 +83,11 @@ with tab1:
         st.success(f"✅ File uploaded: {uploaded.name}")
         # Show file preview
         with st.expander("📖 Preview file content"):
-            content = uploaded.read().decode('utf-8')
+            # Decode only the head of the upload buffer for the preview
+            content = str(uploaded.getbuffer()[:PREVIEW_BYTES], 'utf-8', errors='ignore')
+            if uploaded.size > PREVIEW_BYTES:
+                content += "\n..."
             st.text_area("File content", content, height=150, disabled=True)
-            uploaded.seek(0)  # Reset file pointer
     st.markdown('</div>', unsafe_allow_html=True)
 
 with tab2:
@@ -122,62 +127,54 @@ with col2:
 st.markdown("## 🎵 Convert to Audio")
 
 if st.button("🚀 Convert to Audio", type="primary", use_container_width=True):
-    input_path = None
-    
-    # Determine input source
+    # Determine input source: the upload or pasted text is handed over as is, no temp file
+    source = None
     if uploaded is not None:
-        input_path = Path(f"temp_{uploaded.name}")
-        with open(input_path, "wb") as f:
-            f.write(uploaded.getbuffer())
+        source = uploaded
+        base_name = os.path.splitext(uploaded.name)[0]
     elif custom_text.strip():
-        input_path = Path("temp_input.txt")
-        with open(input_path, "w", encoding="utf-8") as f:
-            f.write(custom_text)
+        source = custom_text.encode('utf-8')
+        base_name = "speech"
 
-    if input_path is None:
+    if source is None:
         st.error("❌ Please upload a file or paste text first!")
     else:
-        # Determine output filename
-        if out_name:
-            output_file = f"{out_name}.{output_format.lower()}"
-        else:
-            output_file = None
+        metrics.incr('requests.tts')
+        # Render into the scratch directory under a unique name; the chosen name is used for the download
+        extension = output_format.lower()
+        download_name = f"{out_name or base_name}.{extension}"
+        output_file = scratch.path(f".{extension}", prefix="tts")
         
         with st.spinner('🎤 Converting text to speech...'):
-            out_path = text_to_speech(str(input_path), output_file)
-            
-            # Clean up temp file
-            try:
-                os.remove(input_path)
-            except:
-                pass
+            out_path = text_to_speech(source, output_file)
         
         if out_path:
+            with open(out_path, "rb") as f:
+                audio_bytes = f.read()
+            scratch.remove(out_path)
             st.markdown("## 🎉 Conversion Complete!")
             st.markdown(f'<div class="result-card">', unsafe_allow_html=True)
-            st.success(f"✅ Audio file created: {out_path}")
+            st.success(f"✅ Audio file created: {download_name}")
             
             # Show file info
-            if os.path.exists(out_path):
-                file_size = os.path.getsize(out_path) / 1024  # KB
-                st.info(f"📁 File size: {file_size:.1f} KB")
+            st.info(f"📁 File size: {len(audio_bytes) / 1024:.1f} KB")
             
+            mime = "audio/wav" if out_path.endswith(".wav") else "audio/mpeg"
             # Audio player
             st.markdown("### 🎧 Preview")
             try:
-                st.audio(str(out_path))
+                st.audio(audio_bytes, format=mime)
             except Exception as e:
                 st.warning(f"Could not preview audio: {e}")
             
             # Download button
-            with open(out_path, "rb") as f:
-                st.download_button(
-                    "📥 Download Audio File",
-                    f.read(),
-                    file_name=os.path.basename(out_path),
-                    mime="audio/wav" if output_format == "WAV" else "audio/mpeg",
-                    use_container_width=True
-                )
+            st.download_button(
+                "📥 Download Audio File",
+                audio_bytes,
+                file_name=download_name,
+                mime=mime,
+                use_container_width=True
+            )
             
             st.markdown('</div>', unsafe_allow_html=True)
         else:
@@ -0,0 +1,152 @@
+import hmac
+import os
+import time
+import pandas as pd
+import streamlit as st
+import metrics
+
+# Custom CSS for modern styling
+st.markdown("""
+<style>
+    .page-header {
+        background: linear-gradient(135deg, #0f172a 0%, #334155 100%);
+        padding: 2rem;
+        border-radius: 15px;
+        color: white;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .metric-card {
+        background: linear-gradient(135deg, #ffffff 0%, #f8fafc 100%);
+        padding: 1.2rem;
+        border-radius: 12px;
+        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+        text-align: center;
+        border: 2px solid #e2e8f0;
+    }
+    .metric-card h4 {
+        color: #1e293b;
+        font-size: 1.5rem;
+        margin-bottom: 0.25rem;
+        font-weight: 700;
+    }
+    .metric-card p {
+        color: #64748b;
+        font-size: 0.875rem;
+        margin: 0;
+        font-weight: 500;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+
+def _admin_token() -> str:
+    """Token from MEETING_ADMIN_TOKEN or [admin] token in secrets; empty means the page is disabled."""
+    token = os.environ.get('MEETING_ADMIN_TOKEN', '')
+    if not token:
+        try:
+            token = st.secrets.get('admin', {}).get('token', '')
+        except Exception:
+            token = ''
+    return token
+
+
+# The page is hidden from everyone who does not open it as ?admin=<token>
+token = _admin_token()
+if not token or not hmac.compare_digest(st.query_params.get('admin', '').encode(), token.encode()):
+    st.info("ℹ️ Nothing to see here. Head back to the Summarizer page.")
+    st.stop()
+
+st.markdown("""
+<div class="page-header">
+    <h1 style="margin: 0; font-size: 2.5rem;">📟 Operations</h1>
+    <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9;">Live throughput, latency and resource usage of this server</p>
+</div>
+""", unsafe_allow_html=True)
+
+col1, col2, col3 = st.columns([2, 1, 1])
+with col1:
+    enabled = st.toggle("Record metrics", value=metrics.is_enabled(),
+                        help="Same as starting the server with MEETING_METRICS=1")
+    if enabled != metrics.is_enabled():
+        metrics.enable(enabled)
+with col2:
+    if st.button("🔄 Refresh", use_container_width=True):
+        st.rerun()
+with col3:
+    if st.button("🧹 Reset", use_container_width=True):
+        metrics.reset()
+        st.rerun()
+
+if not metrics.is_enabled():
+    st.warning("⚠️ Metrics recording is off; numbers below only cover the time it was on.")
+
+rss = metrics.rss_mb()
+metrics.set_gauge('process.rss_mb', rss)
+snap = metrics.snapshot()
+counters, gauges, histograms = snap['counters'], snap['gauges'], snap['histograms']
+uptime = max(snap['uptime_s'], 1e-9)
+
+# Headline numbers
+requests_total = sum(v for k, v in counters.items() if k.startswith('requests.'))
+queue_depth = sum(v for k, v in gauges.items() if k.startswith('queue.'))
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.markdown(f'<div class="metric-card"><h4>{requests_total / uptime * 60:.1f}</h4><p>Requests / min</p></div>', unsafe_allow_html=True)
+with col2:
+    st.markdown(f'<div class="metric-card"><h4>{int(requests_total)}</h4><p>Requests since reset</p></div>', unsafe_allow_html=True)
+with col3:
+    st.markdown(f'<div class="metric-card"><h4>{int(queue_depth)}</h4><p>Queued jobs</p></div>', unsafe_allow_html=True)
+with col4:
+    st.markdown(f'<div class="metric-card"><h4>{rss:.0f} MB</h4><p>Memory (RSS)</p></div>', unsafe_allow_html=True)
+
+# Per-stage latency percentiles
+st.markdown("## ⏱️ Stage Latency")
+stage_rows = [
+    {'stage': name[len('stage.'):], 'calls': h['count'], 'per_min': h['count'] / uptime * 60,
+     'p50_ms': h['p50'] * 1000, 'p95_ms': h['p95'] * 1000, 'p99_ms': h['p99'] * 1000,
+     'max_ms': h['max'] * 1000, 'total_s': h['sum']}
+    for name, h in sorted(histograms.items()) if name.startswith('stage.')
+]
+if stage_rows:
+    st.dataframe(pd.DataFrame(stage_rows).round(2), use_container_width=True, hide_index=True)
+else:
+    st.info("ℹ️ No stage timings recorded yet.")
+
+# Cache hit rates from <name>.cache_hit / <name>.cache_miss counters
+st.markdown("## 🗃️ Caches")
+cache_names = sorted({k.rsplit('.cache_', 1)[0] for k in counters if '.cache_' in k})
+if cache_names:
+    cache_rows = []
+    for name in cache_names:
+        hits = counters.get(f'{name}.cache_hit', 0)
+        misses = counters.get(f'{name}.cache_miss', 0)
+        lookups = hits + misses
+        cache_rows.append({'cache': name, 'hits': int(hits), 'misses': int(misses),
+                           'hit_rate': f"{hits / lookups:.0%}" if lookups else '-'})
+    st.dataframe(pd.DataFrame(cache_rows), use_container_width=True, hide_index=True)
+else:
+    st.info("ℹ️ No cache lookups recorded yet.")
+
+# Everything else
+col1, col2 = st.columns(2)
+with col1:
+    st.markdown("## 🔢 Counters")
+    st.dataframe(pd.DataFrame([{'counter': k, 'value': v} for k, v in sorted(counters.items())]),
+                 use_container_width=True, hide_index=True)
+with col2:
+    st.markdown("## 📏 Gauges")
+    st.dataframe(pd.DataFrame([{'gauge': k, 'value': v} for k, v in sorted(gauges.items())]),
+                 use_container_width=True, hide_index=True)
+
+# Exports
+st.markdown("## 📤 Export")
+col1, col2 = st.columns(2)
+with col1:
+    st.download_button('📥 Metrics JSON', metrics.to_json().encode('utf-8'),
+                       'metrics.json', 'application/json', use_container_width=True)
+with col2:
+    st.download_button('📥 Prometheus text', metrics.to_prometheus().encode('utf-8'),
+                       'metrics.prom', 'text/plain', use_container_width=True)
+
+st.caption(f"Uptime since reset: {uptime / 60:.1f} min • Snapshot at {time.strftime('%H:%M:%S')}")
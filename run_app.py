@@ -1,44 +1,177 @@
 #!/usr/bin/env python3
 """
 Simple script to run the Meeting Action Extractor app
+
+By default Streamlit runs inside this process and the heavy modules and
+shared resources (recognizer, TTS engine, NLP caches) are warmed up in the
+background while the server starts, so the first summary doesn't pay for
+them (see warmup.py). --no-warm runs `streamlit run` in a subprocess as
+before. --measure compares time-to-first-result of cold and warmed
+processes by driving the Summarizer page headlessly.
+
+--workers N starts N app processes on the ports after --port and the
+sticky-session proxy from lb_proxy.py on --port, so sessions spread over
+N interpreters (and cores). Workers share computed summaries and action
+items through the SQLite cache in shared_cache.py.
+
+    python run_app.py [--port 8501] [--no-warm] [--workers N]
+    python run_app.py --measure [--runs 3]
 """
 
+import argparse
+import json
+import statistics
 import subprocess
 import sys
 import os
+import time
+import urllib.request
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+SUMMARIZER_PAGE = os.path.join(APP_DIR, 'pages', '1_🔎_Summarizer.py')
 
 def check_dependencies():
     """Check if required packages are installed"""
     required = ['streamlit', 'pandas', 'requests']
     missing = []
-    
+
     for pkg in required:
         try:
             __import__(pkg)
         except ImportError:
             missing.append(pkg)
-    
+
     if missing:
         print(f"❌ Missing packages: {', '.join(missing)}")
         print("Install with: pip install streamlit pandas requests python-dotenv")
         return False
     return True
 
+def serve(port: int, warm: bool = True):
+    """Run the Streamlit server in this process, warming up in the background."""
+    from streamlit.web import bootstrap
+    import warmup
+
+    if warm:
+        warmup.start_background()
+    flags = {'server_port': port}
+    bootstrap.load_config_options(flags)
+    bootstrap.run(os.path.join(APP_DIR, 'streamlit_app.py'), False, [], flags)
+
+def wait_healthy(port: int, timeout: float = 120.0) -> bool:
+    """Poll a worker's health endpoint until it answers or ``timeout`` passes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=2) as resp:
+                if resp.status == 200:
+                    return True
+        except OSError:
+            time.sleep(0.25)
+    return False
+
+def serve_workers(port: int, workers: int, warm: bool = True):
+    """Run ``workers`` app processes behind the sticky-session proxy on ``port``."""
+    import asyncio
+    from lb_proxy import StickyProxy
+
+    env = dict(os.environ, STREAMLIT_SERVER_HEADLESS='true')
+    env.setdefault('MEETING_SHARED_CACHE', os.path.join(APP_DIR, 'shared_cache.db'))
+    ports = [port + 1 + i for i in range(workers)]
+    procs = []
+    try:
+        for worker_port in ports:
+            cmd = [sys.executable, __file__, '--port', str(worker_port)]
+            if not warm:
+                cmd.append('--no-warm')
+            procs.append(subprocess.Popen(cmd, cwd=APP_DIR, env=env))
+        for worker_port in ports:
+            if not wait_healthy(worker_port):
+                raise RuntimeError(f"worker on port {worker_port} did not start")
+        print(f"✅ {workers} workers on ports {ports[0]}-{ports[-1]}, "
+              f"shared cache {env['MEETING_SHARED_CACHE']}")
+        print(f"🌐 Open http://localhost:{port}")
+        proxy = StickyProxy([('127.0.0.1', p) for p in ports], '0.0.0.0', port)
+        asyncio.run(proxy.serve_forever())
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+def first_result(warm: bool) -> dict:
+    """Seconds to warm up (if asked) and then to produce the first summary on the Summarizer page."""
+    from streamlit.testing.v1 import AppTest
+    import warmup
+
+    start = time.perf_counter()
+    if warm:
+        warmup.ensure_warm()
+    ready = time.perf_counter()
+    at = AppTest.from_file(SUMMARIZER_PAGE, default_timeout=300)
+    at.run()
+    next(t for t in at.text_area if t.key == 'text_input').input(warmup.SAMPLE_TRANSCRIPT)
+    at.run()
+    next(b for b in at.button if 'Generate Summary' in b.label).click()
+    at.run()
+    done = time.perf_counter()
+    return {'startup_s': ready - start, 'first_result_s': done - ready, 'errors': len(at.exception)}
+
+def measure(runs: int):
+    """Time-to-first-result in fresh interpreters, without and with warm-up."""
+    print(f"{'mode':<6} {'startup (s)':>12} {'first result (s)':>17}")
+    for mode in ('cold', 'warm'):
+        samples = []
+        for _ in range(runs):
+            out = subprocess.run([sys.executable, __file__, '--measure-child', mode], cwd=APP_DIR,
+                                 capture_output=True, text=True, check=True)
+            samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        errors = sum(s['errors'] for s in samples)
+        print(f"{mode:<6} {statistics.median(s['startup_s'] for s in samples):>12.3f} "
+              f"{statistics.median(s['first_result_s'] for s in samples):>17.3f}"
+              + (f"  ({errors} page errors)" if errors else ''))
+
 def main():
+    parser = argparse.ArgumentParser(description='Run the Meeting Action Extractor app')
+    parser.add_argument('--port', type=int, default=8501)
+    parser.add_argument('--no-warm', action='store_true', help='Plain `streamlit run` in a subprocess, no warm-up')
+    parser.add_argument('--measure', action='store_true', help='Compare time-to-first-result cold vs warm')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='App processes behind a sticky-session proxy on --port')
+    parser.add_argument('--runs', type=int, default=3, help='Fresh processes per mode for --measure')
+    parser.add_argument('--measure-child', choices=['cold', 'warm'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Change to script directory
+    os.chdir(APP_DIR)
+
+    if args.measure_child:
+        print(json.dumps(first_result(args.measure_child == 'warm')))
+        return
+    if args.measure:
+        measure(args.runs)
+        return
+
     print("🚀 Starting Meeting Action Extractor...")
-    
+
     if not check_dependencies():
         sys.exit(1)
-    
-    # Change to script directory
-    os.chdir(os.path.dirname(os.path.abspath(__file__)))
-    
+
     try:
-        subprocess.run([sys.executable, "-m", "streamlit", "run", "streamlit_app.py"], check=True)
+        if args.workers > 1:
+            serve_workers(args.port, args.workers, warm=not args.no_warm)
+        elif args.no_warm:
+            subprocess.run([sys.executable, "-m", "streamlit", "run", "streamlit_app.py",
+                            "--server.port", str(args.port)], check=True)
+        else:
+            serve(args.port)
     except KeyboardInterrupt:
         print("\n👋 App stopped by user")
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, RuntimeError) as e:
         print(f"❌ Error running app: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
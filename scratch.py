@@ -0,0 +1,117 @@
+"""
+Managed scratch directory for uploads and intermediate audio.
+
+Everything that has to touch disk (uploads a decoder can't read from memory,
+TTS chunk files, generated audio awaiting download) goes into one directory
+with collision-free names instead of the working directory. The directory is
+capped in size: files abandoned for longer than ``STALE_SECONDS`` are evicted
+to make room, and if that is not enough ``ScratchFull`` is raised rather than
+filling the disk.
+
+    MEETING_SCRATCH_DIR   location (default: <system temp>/meeting-scratch)
+    MEETING_SCRATCH_MB    size cap in MB (default: 2048)
+"""
+import contextlib
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import BinaryIO, Iterator, Optional, Union
+
+SCRATCH_DIR = os.environ.get('MEETING_SCRATCH_DIR') or os.path.join(tempfile.gettempdir(), 'meeting-scratch')
+MAX_BYTES = int(float(os.environ.get('MEETING_SCRATCH_MB', '2048')) * 1024 * 1024)
+STALE_SECONDS = 3600
+_COPY_BLOCK = 1024 * 1024
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+_lock = threading.Lock()
+
+
+class ScratchFull(OSError):
+    """The scratch directory is at its size cap."""
+
+
+def _usage() -> list:
+    entries = []
+    with os.scandir(SCRATCH_DIR) as it:
+        for entry in it:
+            with contextlib.suppress(OSError):
+                if entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+    return entries
+
+
+def _make_room(nbytes: int) -> None:
+    entries = _usage()
+    used = sum(size for _, size, _ in entries)
+    if used + nbytes <= MAX_BYTES:
+        return
+    cutoff = time.time() - STALE_SECONDS
+    for mtime, size, path in sorted(entries):
+        if mtime > cutoff or used + nbytes <= MAX_BYTES:
+            break
+        with contextlib.suppress(OSError):
+            os.unlink(path)
+            used -= size
+    if used + nbytes > MAX_BYTES:
+        raise ScratchFull(f'Scratch directory {SCRATCH_DIR} is full ({used // (1024 * 1024)} MB in use)')
+
+
+def path(suffix: str = '', prefix: str = '', reserve: int = 0) -> str:
+    """A fresh, unique path in the scratch directory (the file is not created).
+
+    ``reserve`` is the number of bytes the caller is about to write; the cap
+    is checked against it.
+    """
+    os.makedirs(SCRATCH_DIR, exist_ok=True)
+    with _lock:
+        _make_room(reserve)
+    safe_prefix = ''.join(c for c in prefix if c.isalnum() or c in '-_')[:40]
+    return os.path.join(SCRATCH_DIR, f'{safe_prefix}{"-" if safe_prefix else ""}{uuid.uuid4().hex}{suffix}')
+
+
+def spill(data: Union[BytesLike, BinaryIO], suffix: str = '', prefix: str = '') -> str:
+    """Write a buffer or binary file object to a new scratch file and return its path.
+
+    A file object's size is unknown up front, so the cap is checked before
+    each block is written; ``ScratchFull`` removes the partial file.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        dest = path(suffix, prefix, reserve=memoryview(data).nbytes)
+        with open(dest, 'wb') as f:
+            f.write(data)
+        return dest
+    dest = path(suffix, prefix)
+    try:
+        # Unbuffered, so the directory's usage always includes every block written so far
+        with open(dest, 'wb', buffering=0) as f:
+            while True:
+                block = data.read(_COPY_BLOCK)
+                if not block:
+                    break
+                with _lock:
+                    _make_room(len(block))
+                f.write(block)
+    except BaseException:
+        remove(dest)
+        raise
+    return dest
+
+
+def remove(file_path: Optional[str]) -> None:
+    if file_path:
+        with contextlib.suppress(OSError):
+            os.unlink(file_path)
+
+
+@contextlib.contextmanager
+def scratch_file(suffix: str = '', prefix: str = '') -> Iterator[str]:
+    """Path to a scratch file that is deleted when the block exits."""
+    file_path = path(suffix, prefix)
+    try:
+        yield file_path
+    finally:
+        remove(file_path)
@@ -0,0 +1,243 @@
+"""
+Full-text search over archived meeting transcripts.
+
+Each sentence of a transcript is indexed with the same content-word tokens
+``calculate_word_frequency`` counts, in an SQLite FTS5 table ranked by BM25.
+The language is detected once per transcript and stored with the meeting;
+queries are tokenized with each stored language's rules and run against the
+meetings in that language, so stop words and short terms match both ways.
+Meetings can be added incrementally (re-adding one replaces it) and results
+point back to the meeting, speaker and character offset of the sentence:
+
+    python search_index.py add meetings/*.txt --date 2024-03-04
+    python search_index.py search "SmartTrack API" --from 2024-01-01 --by-speaker
+"""
+import argparse
+import bisect
+import datetime as dt
+import os
+import re
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from nlp_summarizer import _SPEAKER_RE, extract_sentences, keyword_tokens
+from tokenizer import detect_language
+
+DEFAULT_DB = os.environ.get('MEETING_SEARCH_DB', 'transcript_index.db')
+
+_QUERY_WORD_RE = re.compile(r'\w+')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    meeting_key TEXT NOT NULL UNIQUE,
+    meeting_date TEXT,
+    title TEXT,
+    language TEXT
+);
+CREATE TABLE IF NOT EXISTS sentences (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id),
+    speaker TEXT NOT NULL DEFAULT '',
+    char_offset INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sentences_meeting ON sentences(meeting_id);
+CREATE INDEX IF NOT EXISTS idx_meetings_date ON meetings(meeting_date);
+CREATE VIRTUAL TABLE IF NOT EXISTS sentence_terms USING fts5(terms, tokenize='unicode61');
+"""
+
+
+def iter_indexed_sentences(transcript: str, language: Optional[str] = None
+                           ) -> Iterator[Tuple[int, str, str, List[str]]]:
+    """Yield (char_offset, speaker, sentence, tokens) for each sentence worth indexing.
+
+    language: tokenizer language for every sentence (detected from the whole transcript when None).
+    """
+    if language is None:
+        language = detect_language(transcript)
+    labels = [(m.start(), m.group(1).strip()) for m in _SPEAKER_RE.finditer(transcript)]
+    label_offsets = [offset for offset, _ in labels]
+    cursor = 0
+    for sentence in extract_sentences(transcript):
+        pos = transcript.find(sentence, cursor)
+        if pos == -1:
+            continue
+        cursor = pos + len(sentence)
+        tokens = keyword_tokens(sentence, language)
+        if not tokens:
+            continue
+        idx = bisect.bisect_right(label_offsets, pos) - 1
+        speaker = labels[idx][1] if idx >= 0 else ''
+        yield pos, speaker, sentence, tokens
+
+
+class TranscriptIndex:
+    """Inverted index of transcript sentences backed by SQLite FTS5."""
+
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._migrate()
+        self.conn.executescript(_SCHEMA)
+
+    def _migrate(self) -> None:
+        """Add columns introduced after an index was created."""
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(meetings)')}
+        if columns and 'language' not in columns:
+            with self.conn:
+                self.conn.execute('ALTER TABLE meetings ADD COLUMN language TEXT')
+                rows = self.conn.execute(
+                    "SELECT meeting_id, group_concat(text, ' ') FROM sentences GROUP BY meeting_id").fetchall()
+                self.conn.executemany('UPDATE meetings SET language = ? WHERE id = ?',
+                                      [(detect_language(text), meeting_id) for meeting_id, text in rows])
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_meeting(self, meeting_key: str, transcript: str, meeting_date: Optional[str] = None,
+                    title: Optional[str] = None) -> int:
+        """Index one transcript in a single transaction, replacing any earlier version. Returns sentences indexed."""
+        language = detect_language(transcript)
+        rows = list(iter_indexed_sentences(transcript, language))
+        with self.conn:
+            meeting_id = self.conn.execute(
+                'INSERT INTO meetings (meeting_key, meeting_date, title, language) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(meeting_key) DO UPDATE SET meeting_date=excluded.meeting_date, title=excluded.title, '
+                'language=excluded.language RETURNING id', (meeting_key, meeting_date, title, language)).fetchone()[0]
+            self.conn.execute('DELETE FROM sentence_terms WHERE rowid IN '
+                              '(SELECT id FROM sentences WHERE meeting_id = ?)', (meeting_id,))
+            self.conn.execute('DELETE FROM sentences WHERE meeting_id = ?', (meeting_id,))
+            for offset, speaker, sentence, tokens in rows:
+                sentence_id = self.conn.execute(
+                    'INSERT INTO sentences (meeting_id, speaker, char_offset, text) VALUES (?, ?, ?, ?)',
+                    (meeting_id, speaker, offset, sentence)).lastrowid
+                self.conn.execute('INSERT INTO sentence_terms (rowid, terms) VALUES (?, ?)',
+                                  (sentence_id, ' '.join(tokens)))
+        return len(rows)
+
+    def has_meeting(self, meeting_key: str) -> bool:
+        return self.conn.execute('SELECT 1 FROM meetings WHERE meeting_key = ?', (meeting_key,)).fetchone() is not None
+
+    @staticmethod
+    def _match_expression(query: str, language: Optional[str] = None) -> Optional[str]:
+        """Turn free text into an FTS5 query over the tokens a ``language`` meeting was indexed with."""
+        tokens = keyword_tokens(query, language) or [w.lower() for w in _QUERY_WORD_RE.findall(query)]
+        if not tokens:
+            return None
+        return ' AND '.join(f'"{t}"' for t in dict.fromkeys(tokens))
+
+    def _matches(self, query: str) -> List[Tuple[str, str]]:
+        """(language, FTS5 expression) for each language the index holds meetings in."""
+        languages = [row[0] for row in self.conn.execute('SELECT DISTINCT language FROM meetings')]
+        matches = []
+        for language in languages:
+            match = self._match_expression(query, language)
+            if match:
+                matches.append((language, match))
+        return matches
+
+    def search(self, query: str, speaker: Optional[str] = None, date_from: Optional[str] = None,
+               date_to: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Ranked sentences matching all query terms (best first)."""
+        rows: List[Dict[str, Any]] = []
+        for language, match in self._matches(query):
+            rows.extend(self._search(match, language, speaker, date_from, date_to, limit))
+        return sorted(rows, key=lambda row: row['score'])[:limit]
+
+    def _search(self, match: str, language: Optional[str], speaker: Optional[str], date_from: Optional[str],
+                date_to: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        sql = ('SELECT m.meeting_key, m.meeting_date, s.speaker, s.char_offset, s.text, '
+               'bm25(sentence_terms) AS score FROM sentence_terms '
+               'JOIN sentences s ON s.id = sentence_terms.rowid JOIN meetings m ON m.id = s.meeting_id '
+               'WHERE sentence_terms MATCH ? AND m.language IS ?')
+        params: List[Any] = [match, language]
+        if speaker:
+            sql += ' AND s.speaker = ? COLLATE NOCASE'
+            params.append(speaker)
+        if date_from:
+            sql += ' AND m.meeting_date >= ?'
+            params.append(date_from)
+        if date_to:
+            sql += ' AND m.meeting_date <= ?'
+            params.append(date_to)
+        sql += ' ORDER BY score LIMIT ?'
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def speakers_for(self, query: str, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                     limit: int = 10) -> List[Dict[str, Any]]:
+        """Who talked about a topic: matching sentence and meeting counts per speaker."""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for language, match in self._matches(query):
+            sql = ('SELECT s.speaker, COUNT(*) AS mentions, COUNT(DISTINCT s.meeting_id) AS meetings '
+                   'FROM sentence_terms JOIN sentences s ON s.id = sentence_terms.rowid '
+                   'JOIN meetings m ON m.id = s.meeting_id WHERE sentence_terms MATCH ? AND m.language IS ?')
+            params: List[Any] = [match, language]
+            if date_from:
+                sql += ' AND m.meeting_date >= ?'
+                params.append(date_from)
+            if date_to:
+                sql += ' AND m.meeting_date <= ?'
+                params.append(date_to)
+            sql += " AND s.speaker != '' GROUP BY s.speaker"
+            # A meeting has one language, so counts from different languages add up
+            for row in self.conn.execute(sql, params):
+                total = totals.setdefault(row['speaker'], {'speaker': row['speaker'], 'mentions': 0, 'meetings': 0})
+                total['mentions'] += row['mentions']
+                total['meetings'] += row['meetings']
+        return sorted(totals.values(), key=lambda row: -row['mentions'])[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Full-text search over meeting transcripts')
+    parser.add_argument('--db', default=DEFAULT_DB, help='SQLite index path')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    add = sub.add_parser('add', help='Index transcript files (re-adding a file replaces it)')
+    add.add_argument('files', nargs='+')
+    add.add_argument('--date', help='Meeting date (YYYY-MM-DD); defaults to each file\'s modification date')
+
+    search = sub.add_parser('search', help='Search indexed transcripts')
+    search.add_argument('query')
+    search.add_argument('--speaker')
+    search.add_argument('--from', dest='date_from')
+    search.add_argument('--to', dest='date_to')
+    search.add_argument('--limit', type=int, default=20)
+    search.add_argument('--by-speaker', action='store_true', help='Summarize matches per speaker')
+
+    args = parser.parse_args()
+    with TranscriptIndex(args.db) as index:
+        if args.command == 'add':
+            for path in args.files:
+                with open(path, 'r', encoding='utf-8') as f:
+                    transcript = f.read()
+                date = args.date or dt.date.fromtimestamp(os.path.getmtime(path)).isoformat()
+                count = index.add_meeting(os.path.abspath(path), transcript, date, os.path.basename(path))
+                print(f"Indexed {count} sentences from {path}")
+        elif args.by_speaker:
+            rows = index.speakers_for(args.query, args.date_from, args.date_to, args.limit)
+            if not rows:
+                print('No matches.')
+            for row in rows:
+                print(f"{row['speaker']}: {row['mentions']} mention(s) in {row['meetings']} meeting(s)")
+        else:
+            rows = index.search(args.query, args.speaker, args.date_from, args.date_to, args.limit)
+            if not rows:
+                print('No matches.')
+            for row in rows:
+                print(f"[{row['meeting_date']}] {os.path.basename(row['meeting_key'])} @{row['char_offset']} "
+                      f"{row['speaker'] or '?'}: {row['text']}")
+
+
+if __name__ == '__main__':
+    main()
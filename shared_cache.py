@@ -0,0 +1,152 @@
+"""
+SQLite-backed result cache shared by app worker processes.
+
+With ``run_app.py --workers N`` each Streamlit worker is a separate process,
+so session state and in-process caches are per worker. Results worth
+sharing (a transcript's summary and action items) go through this cache,
+keyed by a hash of their inputs, in one SQLite file (``MEETING_SHARED_CACHE``)
+that every worker opens in WAL mode.
+
+``get_or_compute`` doubles as a small job table: the first worker to ask for
+a key marks it pending and computes it, and workers asking for the same key
+meanwhile wait for that result instead of repeating the work. A pending
+claim older than ``lease`` seconds (its worker died) can be taken over.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Optional
+
+import metrics
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    value TEXT,
+    owner TEXT,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_updated ON entries(updated);
+"""
+
+
+def cache_key(*parts: str) -> str:
+    """Stable key for a result derived from ``parts`` (e.g. a kind and a transcript)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class SharedCache:
+    """JSON values by key with a TTL and an entry cap, safe across threads and processes."""
+
+    def __init__(self, path: str, ttl: float = 24 * 3600, max_entries: int = 10_000,
+                 lease: float = 120.0, name: str = 'shared_cache'):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lease = lease
+        self.name = name
+        self._local = threading.local()
+        self._writes = 0
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._conn().execute(
+            "SELECT value FROM entries WHERE key = ? AND state = 'ready' AND updated > ?",
+            (key, time.time() - self.ttl)).fetchone()
+        metrics.incr(f'{self.name}.cache_hit' if row else f'{self.name}.cache_miss')
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any) -> None:
+        self._conn().execute(
+            "INSERT INTO entries (key, state, value, owner, updated) VALUES (?, 'ready', ?, NULL, ?) "
+            "ON CONFLICT(key) DO UPDATE SET state = 'ready', value = excluded.value, owner = NULL, "
+            "updated = excluded.updated", (key, json.dumps(value), time.time()))
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.prune()
+
+    def prune(self) -> None:
+        """Drop expired entries and the oldest ones beyond ``max_entries``."""
+        conn = self._conn()
+        conn.execute("DELETE FROM entries WHERE state = 'ready' AND updated <= ?", (time.time() - self.ttl,))
+        conn.execute("DELETE FROM entries WHERE key IN (SELECT key FROM entries WHERE state = 'ready' "
+                     "ORDER BY updated DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def _claim(self, key: str, owner: str) -> Optional[Any]:
+        """Mark ``key`` pending for ``owner`` unless it is ready or being computed.
+
+        Returns the cached value if ready, ``owner`` if the claim succeeded,
+        or None if another worker holds a live claim.
+        """
+        conn = self._conn()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT state, value, updated FROM entries WHERE key = ?', (key,)).fetchone()
+            if row and row[0] == 'ready' and row[2] > now - self.ttl:
+                return json.loads(row[1])
+            if row and row[0] == 'pending' and row[2] > now - self.lease:
+                return None
+            conn.execute("INSERT OR REPLACE INTO entries (key, state, value, owner, updated) "
+                         "VALUES (?, 'pending', NULL, ?, ?)", (key, owner, now))
+            return owner
+        finally:
+            conn.execute('COMMIT')
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], poll: float = 0.05) -> Any:
+        """The cached value for ``key``, computing it once across all workers if missing."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        owner = uuid.uuid4().hex
+        while True:
+            claimed = self._claim(key, owner)
+            if claimed == owner:
+                break
+            if claimed is not None:
+                return claimed
+            metrics.incr(f'{self.name}.wait')
+            time.sleep(poll)
+        try:
+            value = compute()
+        except BaseException:
+            self._conn().execute("DELETE FROM entries WHERE key = ? AND owner = ?", (key, owner))
+            raise
+        self.set(key, value)
+        return value
+
+
+_SHARED: Optional[SharedCache] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """The cache at ``MEETING_SHARED_CACHE`` (set by ``run_app.py --workers``), or None when unset."""
+    global _SHARED
+    path = os.environ.get('MEETING_SHARED_CACHE')
+    if not path:
+        return None
+    if _SHARED is None or _SHARED.path != path:
+        with _SHARED_LOCK:
+            if _SHARED is None or _SHARED.path != path:
+                _SHARED = SharedCache(path)
+    return _SHARED
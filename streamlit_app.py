@@ -1,4 +1,5 @@
 import streamlit as st
+import warmup
 
 st.set_page_config(
     page_title="Meeting Notes Summarizer",
@@ -7,6 +8,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Import heavy modules and build shared resources once per server process, off the request path
+warmup.start_background()
+
 # Custom CSS for modern styling
 st.markdown("""
 <style>
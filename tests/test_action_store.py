@@ -0,0 +1,60 @@
+import datetime as dt
+import os
+import sys
+
+import action_store
+from action_store import ActionStore
+from nlp_summarizer import extract_action_items
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = os.path.join(ROOT, 'sample_transcript2.txt')
+MEETING = '2024-03-04'  # a Monday
+
+
+def _items():
+    with open(SAMPLE, encoding='utf-8') as f:
+        return extract_action_items(f.read(), meeting_date=MEETING)
+
+
+def test_add_meeting_upserts():
+    items = _items()
+    with ActionStore(':memory:') as store:
+        meeting_id = store.add_meeting('sample2', items, MEETING, 'Sync')
+        assert store.stats() == {'meetings': 1, 'action_items': len(items)}
+        # Re-ingesting keeps the meeting id (RETURNING on the upsert) and replaces its items
+        assert store.add_meeting('sample2', items, MEETING, 'Sync again') == meeting_id
+        assert store.stats() == {'meetings': 1, 'action_items': len(items)}
+        assert store.conn.execute('SELECT title FROM meetings').fetchone()[0] == 'Sync again'
+        assert store.add_meetings([('other', '2024-03-11', items[:2])]) == 1
+        assert store.stats() == {'meetings': 2, 'action_items': len(items) + 2}
+
+
+def test_query_filters():
+    with ActionStore(':memory:') as store:
+        store.add_meeting('sample2', _items(), MEETING)
+        week = store.query(due_from='2024-03-04', due_to='2024-03-10')
+        assert [row['due_date'] for row in week] == ['2024-03-08', '2024-03-08', '2024-03-09']
+        # Owner matches the resolved speaker id of "I’ll ..." items
+        ravi = store.query(owner='Ravi')
+        assert ravi and all('ravi' in (row['owner_id'], row['owner'].lower()) for row in ravi)
+        assert any(row['task'].startswith('I’ll share') for row in ravi)
+        assert store.set_status(ravi[0]['id'], 'Completed')
+        assert not store.set_status(10_000, 'Completed')
+        assert ravi[0]['id'] not in [row['id'] for row in store.query(owner='Ravi', status='Pending')]
+        assert store.query(meeting_from='2024-03-05') == []
+        assert len(store.query(limit=2)) == 2
+
+
+def test_cli_ingest_and_due_this_week(tmp_path, monkeypatch, capsys):
+    db = str(tmp_path / 'actions.db')
+    monkeypatch.setattr(sys, 'argv', ['action_store.py', '--db', db, 'ingest', SAMPLE, '--date', MEETING])
+    action_store.main()
+    assert 'Ingested 1 meeting(s)' in capsys.readouterr().out
+
+    week_of_meeting = action_store._week_bounds(dt.date.fromisoformat(MEETING))
+    monkeypatch.setattr(action_store, '_week_bounds', lambda today: week_of_meeting)
+    monkeypatch.setattr(sys, 'argv', ['action_store.py', '--db', db, 'query', '--due-this-week', '--open'])
+    action_store.main()
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 3
+    assert all('due: 2024-03-0' in line for line in lines)
@@ -0,0 +1,111 @@
+import io
+import os
+import time
+import wave
+
+import numpy as np
+import pytest
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+import api_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MEETING = '2024-03-04'
+
+
+@pytest.fixture(scope='module')
+def client():
+    with TestClient(api_server.create_app(workers=2)) as client:
+        yield client
+
+
+@pytest.fixture(scope='module')
+def transcript():
+    with open(os.path.join(ROOT, 'sample_transcript2.txt'), encoding='utf-8') as f:
+        return f.read()
+
+
+def _wav(seconds: float = 1.0) -> bytes:
+    """A tone (silence would be skipped as no speech)."""
+    t = np.arange(int(16000 * seconds)) / 16000
+    samples = (8000 * np.sin(2 * np.pi * 220 * t)).astype('<i2')
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(16000)
+        w.writeframes(samples.tobytes())
+    return buf.getvalue()
+
+
+def test_actions(client, transcript):
+    response = client.post('/v1/actions', json={'transcript': transcript, 'meeting_date': MEETING})
+    assert response.status_code == 200
+    items = response.json()['action_items']
+    sharing = next(item for item in items if item['task'].startswith('I’ll share'))
+    assert (sharing['owner_id'], sharing['due_date']) == ('ravi', '2024-03-08')
+
+
+def test_analyze(client, transcript):
+    response = client.post('/v1/analyze', json={'transcript': transcript, 'summary_format': 'text'})
+    assert response.status_code == 200
+    assert set(response.json()) == {'summary', 'action_items', 'insights'}
+
+
+@pytest.mark.parametrize('body, status', [
+    (b'not json', 400),
+    (b'{"transcript": ""}', 400),
+    (b'{"transcript": "x", "meeting_date": "soon"}', 400),
+    (b'{"transcript": "x", "meeting_date": 20240304}', 400),
+    (b'{"transcript": "x", "summary_format": "pdf"}', 400),
+])
+def test_text_validation(client, body, status):
+    response = client.post('/v1/summarize', content=body, headers={'content-type': 'application/json'})
+    assert response.status_code == status
+    assert 'error' in response.json()
+
+
+def test_body_limits(client, monkeypatch):
+    monkeypatch.setattr(api_server, 'MAX_JSON_BYTES', 1000)
+    monkeypatch.setattr(api_server, 'MAX_UPLOAD_BYTES', 1000)
+    assert client.post('/v1/actions', json={'transcript': 'x' * 2000}).status_code == 413
+    assert client.post('/v1/transcriptions', content=b'\0' * 2000).status_code == 413
+    assert client.post('/v1/transcriptions', files={'file': ('a.wav', b'\0' * 2000)}).status_code == 413
+
+
+def test_multipart_errors(client):
+    assert client.post('/v1/transcriptions', files={'other': ('a.wav', b'x')}).status_code == 400
+    response = client.post('/v1/transcriptions', content=b'--x\r\nbroken',
+                           headers={'content-type': 'multipart/form-data; boundary=x'})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('upload', ['raw', 'multipart'])
+def test_transcription_job(client, upload):
+    if upload == 'raw':
+        response = client.post('/v1/transcriptions?backend=stub', content=_wav())
+    else:
+        response = client.post('/v1/transcriptions?backend=stub', files={'file': ('a.wav', _wav())})
+    assert response.status_code == 202
+    location = response.headers['location']
+    deadline = time.monotonic() + 30
+    while True:
+        job = client.get(location).json()
+        if job['status'] not in ('queued', 'running') or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+    assert job['status'] == 'done', job
+    assert 'stub transcript' in job['text']
+    assert client.get('/v1/transcriptions/nope').status_code == 404
+
+
+def test_live(client):
+    with client.websocket_connect(f'/v1/live?meeting_date={MEETING}&summary_format=text') as ws:
+        ws.send_text('Alex: I will ship the billing API by Friday.\n')
+        reply = ws.receive_json()
+    assert [item['due_date'] for item in reply['action_items']] == ['2024-03-08']
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with client.websocket_connect('/v1/live?meeting_date=soon') as ws:
+            ws.receive_text()
+    assert closed.value.code == 1003
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from deadline_resolver import resolve_deadline
+from nlp_summarizer import enhanced_action_extraction
+
+MEETING = '2024-03-04'  # a Monday
+
+
+@pytest.mark.parametrize('phrase, expected', [
+    ('by Friday', '2024-03-08'),
+    ('tomorrow', '2024-03-05'),
+    ('next Tuesday', '2024-03-12'),
+    ('Tuesday next week', '2024-03-12'),
+    ('by Friday of next week', '2024-03-15'),
+    ('next week', '2024-03-15'),
+    ('end of the month', '2024-03-31'),
+    ('in May', '2024-05-31'),
+    ('3/15', '2024-03-15'),
+    ('no date here', None),
+    ('by 3/15', '2024-03-15'),
+    ('due on 4/2', '2024-04-02'),
+    ('ship 2024-04-01', '2024-04-01'),
+    # Ranges and fractions are not dates
+    ('finish the migration in 2-3 weeks', None),
+    ('review pages 10-12', None),
+    ('3/4 of the budget', None),
+])
+def test_resolve_deadline(phrase, expected):
+    assert resolve_deadline(phrase, MEETING) == expected
+
+
+def test_sentence_fallback():
+    sentence = 'I expect to complete testing by Tuesday next week'
+    assert resolve_deadline('tuesday', MEETING, sentence) == '2024-03-05'
+    assert resolve_deadline('', MEETING, sentence) == '2024-03-12'
+
+
+def test_extraction_resolves_sample_transcript():
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sample_transcript2.txt')
+    with open(path, encoding='utf-8') as f:
+        items = {item['task']: item for item in enhanced_action_extraction(f.read(), meeting_date=MEETING)}
+    testing = next(item for task, item in items.items() if 'complete testing' in task)
+    assert (testing['deadline'], testing['due_date']) == ('tuesday next week', '2024-03-12')
+    # "I’ll" with a typographic apostrophe is attributed to the speaker
+    sharing = next(item for task, item in items.items() if task.startswith('I’ll share'))
+    assert sharing['owner_id'] == 'ravi'
@@ -0,0 +1,29 @@
+from dedup import MeetingDeduplicator, dedupe_sentences
+
+DEPLOY = 'We will deploy the new billing service to the staging cluster on {}'
+
+
+def test_near_duplicates_collapse():
+    sentences = [DEPLOY.format('Friday'), DEPLOY.format('Friday') + '!', DEPLOY.format('Friday') + ' as planned']
+    assert dedupe_sentences(sentences) == [DEPLOY.format('Friday')]
+
+
+def test_different_deadlines_are_kept():
+    sentences = [DEPLOY.format('Friday'), DEPLOY.format('Monday'), DEPLOY.format('3/15')]
+    assert dedupe_sentences(sentences) == sentences
+
+
+def test_different_owners_are_kept():
+    sentences = ['Alex will deploy the new billing service to the staging cluster',
+                 'Sam will deploy the new billing service to the staging cluster']
+    assert dedupe_sentences(sentences) == sentences
+
+
+def test_meeting_deduplicator_replaces_bands():
+    transcript = ' '.join(DEPLOY.format(day) for day in ('Monday', 'Tuesday', 'Friday'))
+    with MeetingDeduplicator(':memory:') as dedup:
+        dedup.add('a', transcript)
+        dedup.add('a', transcript)
+        count = dedup.conn.execute('SELECT COUNT(*) FROM meeting_lsh_bands').fetchone()[0]
+        assert count == dedup.bands
+        assert [key for key, _ in dedup.find_duplicates(transcript)] == ['a']
@@ -0,0 +1,46 @@
+import multiprocessing
+import os
+
+import pytest
+
+import hierarchical_summary
+from hierarchical_summary import Window, summarize_windows
+
+_PARENT = os.getpid()
+_real_summarize_window = hierarchical_summary._summarize_window
+
+
+def _dies_in_worker(text):
+    if os.getpid() != _PARENT:
+        os._exit(1)
+    return _real_summarize_window(text)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='patch must reach the workers')
+def test_broken_pool_falls_back_in_process(monkeypatch):
+    monkeypatch.setattr(hierarchical_summary, '_summarize_window', _dies_in_worker)
+    windows = [Window(i, f'Alex: We will ship part {i} by Friday. Sam: The budget review is done.') for i in range(4)]
+    done = sorted(window.index for window, _, _ in summarize_windows(windows, workers=2))
+    assert done == [0, 1, 2, 3]
+    assert hierarchical_summary._POOL is None
+
+
+def test_segment_windows():
+    from audio_processor import TranscriptSegment
+
+    segments = [TranscriptSegment(start_ms=i * 60_000, end_ms=(i + 1) * 60_000, text=f'part {i}', confidence=1.0) for i in range(5)]
+    windows = hierarchical_summary.split_windows('', segments, window_ms=2 * 60_000)
+    assert [(w.start_ms, w.end_ms) for w in windows] == [(0, 120_000), (120_000, 240_000), (240_000, 300_000)]
+
+
+@pytest.mark.parametrize('text', ['', '  \n', 'Alex: We will ship the billing API by Friday.\n'])
+def test_main_prints_json(tmp_path, monkeypatch, capsys, text):
+    import json
+
+    path = tmp_path / 'meeting.txt'
+    path.write_text(text, encoding='utf-8')
+    monkeypatch.setattr('sys.argv', ['hierarchical_summary.py', str(path), '--format', 'json', '--workers', '1'])
+    hierarchical_summary.main()
+    out, err = capsys.readouterr()
+    assert json.loads(out)['sections']
+    assert 'windows in' in err
@@ -0,0 +1,48 @@
+import email.utils
+import time
+
+import pytest
+
+from llm_backend import MAX_RETRY_AFTER, _retry_delay
+
+
+@pytest.mark.parametrize('headers, attempt, expected', [
+    ({'Retry-After': '2'}, 0, 2.0),
+    ({'retry-after': '0.05'}, 0, 0.05),
+    ({}, 2, 2.0),
+    ({'Retry-After': 'soon'}, 1, 1.0),
+    ({'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}, 0, 0.0),
+    ({'Retry-After': '86400'}, 0, MAX_RETRY_AFTER),
+])
+def test_retry_delay(headers, attempt, expected):
+    assert _retry_delay(headers, attempt) == pytest.approx(expected)
+
+
+def test_retry_delay_http_date():
+    later = email.utils.formatdate(time.time() + 10, usegmt=True)
+    assert 8 <= _retry_delay({'Retry-After': later}, 0) <= 10
+
+
+def test_mock_server_answers_with_rules(monkeypatch):
+    import llm_backend
+    from llm_backend import _MockHandler, serve_mock
+    from nlp_summarizer import enhanced_action_extraction, generate_summary
+
+    server = serve_mock(port=0)
+    try:
+        # As documented: the app and the mock share MEETING_NLP_BACKEND=mistral
+        monkeypatch.setenv('MEETING_NLP_BACKEND', 'mistral')
+        monkeypatch.setenv('MISTRAL_BASE_URL', f'http://127.0.0.1:{server.server_address[1]}')
+        monkeypatch.setattr(llm_backend, '_cache', llm_backend.ResponseCache())
+        transcript = 'Alex: We will ship the billing API by Friday.\nSam: I will review the budget tomorrow.'
+        before = _MockHandler._counter
+        start = time.perf_counter()
+        items = enhanced_action_extraction(transcript)
+        summary = generate_summary(transcript, structured=True)
+        assert time.perf_counter() - start < 5
+        # One request each: the mock must not call itself through the mistral backend
+        assert _MockHandler._counter - before == 2
+        assert [item['owner'] for item in items] == ['Alex', 'Sam']
+        assert summary.sections
+    finally:
+        server.shutdown()
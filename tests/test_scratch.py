@@ -0,0 +1,33 @@
+import io
+import os
+
+import pytest
+
+import scratch
+
+
+@pytest.fixture
+def small_scratch(tmp_path, monkeypatch):
+    monkeypatch.setattr(scratch, 'SCRATCH_DIR', str(tmp_path))
+    monkeypatch.setattr(scratch, 'MAX_BYTES', 10_000)
+    monkeypatch.setattr(scratch, '_COPY_BLOCK', 1024)
+    return tmp_path
+
+
+@pytest.mark.parametrize('make', [bytes, bytearray, memoryview, io.BytesIO])
+def test_spill_within_cap(small_scratch, make):
+    dest = scratch.spill(make(b'a' * 5000), suffix='.wav', prefix='up load')
+    assert dest.startswith(str(small_scratch)) and dest.endswith('.wav')
+    with open(dest, 'rb') as f:
+        assert f.read() == b'a' * 5000
+    scratch.remove(dest)
+    assert not os.listdir(small_scratch)
+
+
+@pytest.mark.parametrize('make', [bytes, io.BytesIO])
+def test_spill_over_cap(small_scratch, make):
+    kept = scratch.spill(b'b' * 4000)
+    with pytest.raises(scratch.ScratchFull):
+        scratch.spill(make(b'a' * 7000))
+    # The streamed copy stops at the cap and leaves nothing behind
+    assert os.listdir(small_scratch) == [os.path.basename(kept)]
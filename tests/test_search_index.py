@@ -0,0 +1,56 @@
+import os
+import sqlite3
+
+from search_index import TranscriptIndex
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GERMAN = ("Anna: Wir müssen das Budget für das dritte Quartal bis Freitag überprüfen.\n"
+          "Jonas: Das Release der Schnittstelle kommt morgen, die Tests laufen noch.\n")
+
+
+def _sample(name):
+    with open(os.path.join(ROOT, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_search_and_speakers():
+    with TranscriptIndex(':memory:') as index:
+        count = index.add_meeting('sample', _sample('sample_transcript.txt'), '2024-03-04', 'sample')
+        assert count > 0
+        rows = index.search('budget')
+        assert rows and all('budget' in row['text'].lower() for row in rows)
+        assert rows == sorted(rows, key=lambda row: row['score'])
+        assert index.search('budget', date_from='2024-03-05') == []
+        speakers = index.speakers_for('budget')
+        assert sum(row['mentions'] for row in speakers) <= len(rows)
+        # Re-adding replaces the meeting's sentences
+        assert index.add_meeting('sample', _sample('sample_transcript.txt'), '2024-03-04') == count
+        assert len(index.search('budget')) == len(rows)
+
+
+def test_query_uses_the_meetings_language():
+    with TranscriptIndex(':memory:') as index:
+        index.add_meeting('de', GERMAN, '2024-03-04')
+        index.add_meeting('en', _sample('sample_transcript.txt'), '2024-03-04')
+        assert index.conn.execute("SELECT language FROM meetings WHERE meeting_key = 'de'").fetchone()[0] == 'de'
+        # "morgen" is a German stop word, left out of the index; the query reads as English on its own
+        rows = index.search('the release for morgen')
+        assert [row['meeting_key'] for row in rows] == ['de']
+        assert rows[0]['speaker'] == 'Jonas'
+
+
+def test_migrates_index_without_language(tmp_path):
+    path = str(tmp_path / 'index.db')
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE meetings (id INTEGER PRIMARY KEY, meeting_key TEXT NOT NULL UNIQUE, meeting_date TEXT, title TEXT);
+        CREATE TABLE sentences (id INTEGER PRIMARY KEY, meeting_id INTEGER NOT NULL, speaker TEXT NOT NULL DEFAULT '',
+                                char_offset INTEGER NOT NULL, text TEXT NOT NULL);
+        INSERT INTO meetings VALUES (1, 'de', '2024-03-04', NULL);
+        INSERT INTO sentences VALUES (1, 1, 'Anna', 0, 'Wir müssen das Budget für das dritte Quartal überprüfen.');
+    """)
+    conn.commit()
+    conn.close()
+    with TranscriptIndex(path) as index:
+        assert index.conn.execute('SELECT language FROM meetings').fetchone()[0] == 'de'
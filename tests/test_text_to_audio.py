@@ -0,0 +1,26 @@
+import random
+
+import pytest
+
+from text_to_audio import _chunk_text
+
+# Weighted towards the characters the chunker breaks on
+_ALPHABET = 'abcdefghij      \n..!?,;:"\')ü界'
+
+
+def _random_text(rng: random.Random) -> str:
+    size = rng.choice([0, 1, rng.randint(2, 50), rng.randint(50, 500), rng.randint(500, 5000)])
+    if rng.random() < 0.1:
+        # No break points at all
+        return 'x' * size
+    return ''.join(rng.choice(_ALPHABET) for _ in range(size))
+
+
+@pytest.mark.parametrize('seed', range(300))
+def test_chunks_are_exact_and_bounded(seed):
+    rng = random.Random(seed)
+    text = _random_text(rng)
+    max_chars = rng.choice([1, 2, 7, 40, 200, 1800])
+    chunks = _chunk_text(text, max_chars)
+    assert ''.join(chunks) == text
+    assert all(0 < len(chunk) <= max_chars for chunk in chunks)
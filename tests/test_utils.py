@@ -0,0 +1,24 @@
+import time
+
+import pytest
+
+from utils import extract_json_from_text, iter_json_blocks
+
+
+def test_blocks_in_prose_and_stream():
+    text = 'Items (see [1]): [{"task": "Ship it", "owner": "Sam"}] }} and {"note": "x]"} done.'
+    expected = [[1], [{'task': 'Ship it', 'owner': 'Sam'}], {'note': 'x]'}]
+    assert list(iter_json_blocks(text)) == expected
+    assert list(iter_json_blocks(iter(text[i:i + 7] for i in range(0, len(text), 7)))) == expected
+    assert extract_json_from_text(text) == expected[1]
+
+
+@pytest.mark.parametrize('text', [
+    '[' * 40_000 + '}' * 40_000,
+    '{' * 40_000 + ']' * 40_000,
+])
+def test_stray_closers_are_linear(text):
+    # Quadratic matching took about 18 s on these; linear is well under a second
+    start = time.perf_counter()
+    assert list(iter_json_blocks(text)) == []
+    assert time.perf_counter() - start < 2.0
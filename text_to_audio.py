@@ -1,90 +1,194 @@
 from pathlib import Path
 import pyttsx3
 import argparse
-from typing import List
+from typing import IO, Dict, List, Optional, Union
 from pydub import AudioSegment
-import tempfile
 import os
+import re
+import bisect
+import threading
+import time
+import wave
+import metrics
+import scratch
 
+# A text file path, UTF-8 bytes / memoryview, or a text or binary file object
+TextSource = Union[str, os.PathLike, bytes, bytearray, memoryview, IO]
+
+# Candidate break points, strongest first: sentence ends / newlines, clause
+# punctuation, then plain whitespace. Each match ends where the next chunk starts.
+_BOUNDARY_RE = re.compile(r'(?P<sentence>[.!?]+["\')\]]*\s+|\s*\n\s*)|(?P<clause>[,;:]\s+)|(?P<space>\s+)')
+_BOUNDARY_TIERS = ('sentence', 'clause', 'space')
+
+
+def _boundary_index(text: str) -> Dict[str, List[int]]:
+    """Collect sorted boundary offsets per tier in a single pass over the text."""
+    index: Dict[str, List[int]] = {tier: [] for tier in _BOUNDARY_TIERS}
+    for m in _BOUNDARY_RE.finditer(text):
+        index[m.lastgroup].append(m.end())
+    return index
+
+
+@metrics.timed('tts.chunk')
 def _chunk_text(text: str, max_chars: int = 1800) -> List[str]:
-    """Split long text into manageable chunks near sentence boundaries."""
+    """Split long text into balanced chunks near sentence boundaries.
+
+    Chunks are exact slices of ``text`` so ``''.join(chunks) == text``. Each
+    break point is chosen close to an even split of what remains over the
+    fewest chunks that fit ``max_chars``, so parallel synthesis workers get
+    similar amounts of work.
+    """
     if len(text) <= max_chars:
-        return [text]
+        return [text] if text else []
+    index = _boundary_index(text)
     chunks = []
     start = 0
-    while start < len(text):
-        end = min(start + max_chars, len(text))
-        if end < len(text):
-            # try to break on a sentence boundary
-            breakpoint = max(
-                text.rfind(". ", start, end),
-                text.rfind("! ", start, end),
-                text.rfind("? ", start, end),
-                text.rfind("\n", start, end)
-            )
-            if breakpoint == -1 or breakpoint <= start:
-                breakpoint = text.rfind(" ", start, end)
-            if breakpoint == -1 or breakpoint <= start:
-                breakpoint = end
-            else:
-                breakpoint += 1  # include the separator
-        else:
-            breakpoint = end
-        chunks.append(text[start:breakpoint].strip())
-        start = breakpoint
-    return [c for c in chunks if c]
+    total = len(text)
+    while total - start > max_chars:
+        remaining = total - start
+        parts = -(-remaining // max_chars)
+        target = start + -(-remaining // parts)
+        lo, hi = start + max(1, (target - start) // 2), start + max_chars
+        cut = None
+        for tier in _BOUNDARY_TIERS:
+            offsets = index[tier]
+            i = bisect.bisect_left(offsets, target)
+            near = [offsets[j] for j in (i - 1, i) if 0 <= j < len(offsets) and lo <= offsets[j] <= hi]
+            if near:
+                cut = min(near, key=lambda o: abs(o - target))
+                break
+        if cut is None:
+            cut = hi
+        chunks.append(text[start:cut])
+        start = cut
+    chunks.append(text[start:])
+    return chunks
+
+
+def _read_text(source: TextSource) -> str:
+    """Text of a path, bytes-like buffer or file object, decoding bytes as UTF-8."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'r', encoding='utf-8') as f:
+            return f.read()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return str(source, 'utf-8')
+    getbuffer = getattr(source, 'getbuffer', None)
+    data = getbuffer() if getbuffer is not None else source.read()
+    return data if isinstance(data, str) else str(data, 'utf-8')
+
+
+class StubEngine:
+    """Offline stand-in for a pyttsx3 engine, for tests and load tests.
+
+    Implements the ``save_to_file``/``runAndWait`` calls ``text_to_speech``
+    makes, writing silent 16 kHz mono WAVs as long as the text would take to
+    read aloud at ``words_per_minute``. ``latency`` seconds per second of
+    audio mimic a real synthesizer's cost.
+    """
+    RATE = 16000
+
+    def __init__(self, latency: float = 0.0, words_per_minute: int = 150):
+        self.latency = latency
+        self.words_per_minute = words_per_minute
+        self._queue: List[tuple] = []
+
+    def save_to_file(self, text: str, path: str) -> None:
+        self._queue.append((text, path))
 
+    def runAndWait(self) -> None:
+        queue, self._queue = self._queue, []
+        for text, path in queue:
+            seconds = len(text.split()) * 60 / self.words_per_minute
+            if self.latency:
+                time.sleep(seconds * self.latency)
+            with wave.open(path, 'wb') as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(self.RATE)
+                wf.writeframes(bytes(2 * int(seconds * self.RATE)))
 
-def text_to_speech(input_file: str, output_file: str = None):
+
+TTS_ENGINES = {
+    'pyttsx3': pyttsx3.init,
+    'stub': StubEngine,
+}
+
+_ENGINE = None
+# pyttsx3 engines are not thread-safe: hold this while queueing and running utterances
+ENGINE_LOCK = threading.Lock()
+
+def shared_engine():
+    """The process's TTS engine, initialized on first use and kept alive.
+
+    The engine is pyttsx3 unless ``MEETING_TTS_BACKEND=stub`` selects
+    ``StubEngine``. pyttsx3 hands out one engine per driver and holds it
+    only weakly, so an engine created per call was torn down and
+    re-initialized (driver load, voice lookup) on every conversion.
+    """
+    global _ENGINE
+    if _ENGINE is None:
+        name = (os.environ.get('MEETING_TTS_BACKEND') or 'pyttsx3').lower()
+        if name not in TTS_ENGINES:
+            raise ValueError(f"Unknown TTS backend '{name}'. Choose from: {', '.join(TTS_ENGINES)}")
+        with ENGINE_LOCK:
+            if _ENGINE is None:
+                _ENGINE = TTS_ENGINES[name]()
+    return _ENGINE
+
+def text_to_speech(input_file: TextSource, output_file: Optional[str] = None):
     """Convert text file to audio file with chunking to avoid truncation.
 
+    input_file: a path, or the text itself as UTF-8 bytes, a memoryview or a
+    file object (e.g. an upload), read without writing it to disk first.
+    output_file: defaults to the input path with a .wav suffix, or a fresh
+    file in the scratch directory when the input is not a path.
+
     Returns the output file path string on success, otherwise None.
     """
-    # Read input text file
-    with open(input_file, 'r', encoding='utf-8') as f:
-        text = f.read()
+    text = _read_text(input_file)
 
     # Choose output extension (prefer wav for compatibility)
-    if output_file is None:
+    if output_file is not None:
+        output_path = Path(output_file)
+    elif isinstance(input_file, (str, os.PathLike)):
         output_path = Path(input_file).with_suffix('.wav')
     else:
-        output_path = Path(output_file)
-
-    # Initialize TTS engine
-    engine = pyttsx3.init()
+        output_path = Path(scratch.path('.wav', prefix='tts'))
 
     # Prepare temp wav files per chunk
     temp_wavs: List[str] = []
     try:
-        chunks = _chunk_text(text)
-        for chunk in chunks:
-            tmp = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-            tmp_path = tmp.name
-            tmp.close()
-            temp_wavs.append(tmp_path)
-            engine.save_to_file(chunk, tmp_path)
-
-        # Process all queued saves
-        engine.runAndWait()
-
-        # Concatenate chunks
-        combined: AudioSegment | None = None
-        for idx, wav_path in enumerate(temp_wavs):
-            seg = AudioSegment.from_wav(wav_path)
-            combined = seg if combined is None else combined + seg
-
-        if combined is None:
-            raise RuntimeError('No audio generated from chunks')
-
-        # Export to desired format based on suffix
-        suffix = output_path.suffix.lower()
-        if suffix == '.mp3':
-            combined.export(str(output_path), format='mp3')
-        else:
-            # default/export wav
-            if suffix != '.wav':
-                output_path = output_path.with_suffix('.wav')
-            combined.export(str(output_path), format='wav')
+        chunks = [c for c in _chunk_text(text) if c.strip()]
+        engine = shared_engine()
+        with ENGINE_LOCK:
+            for chunk in chunks:
+                tmp_path = scratch.path('.wav', prefix='tts-chunk')
+                temp_wavs.append(tmp_path)
+                engine.save_to_file(chunk, tmp_path)
+
+            # Process all queued saves
+            with metrics.span('tts.synthesize', chunks=len(chunks)):
+                engine.runAndWait()
+
+        with metrics.span('tts.render'):
+            # Concatenate chunks
+            combined: AudioSegment | None = None
+            for idx, wav_path in enumerate(temp_wavs):
+                seg = AudioSegment.from_wav(wav_path)
+                combined = seg if combined is None else combined + seg
+
+            if combined is None:
+                raise RuntimeError('No audio generated from chunks')
+
+            # Export to desired format based on suffix
+            suffix = output_path.suffix.lower()
+            if suffix == '.mp3':
+                combined.export(str(output_path), format='mp3')
+            else:
+                # default/export wav
+                if suffix != '.wav':
+                    output_path = output_path.with_suffix('.wav')
+                combined.export(str(output_path), format='wav')
 
         print(f"Successfully created audio file: {output_path}")
         return str(output_path)
@@ -93,10 +197,7 @@ def text_to_speech(input_file: str, output_file: str = None):
         return None
     finally:
         for p in temp_wavs:
-            try:
-                os.unlink(p)
-            except Exception:
-                pass
+            scratch.remove(p)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Convert text file to audio')
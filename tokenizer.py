@@ -0,0 +1,126 @@
+"""
+Unicode-aware word tokenizer and per-language stop-word tables.
+
+Keyword counting used to keep only ASCII words of four or more letters, so
+German and Hindi meetings (umlauts, Devanagari vowel signs) produced empty
+keyword lists and terms like "API", "Q4" or "v2" were dropped. ``tokenize``
+takes runs of Unicode letters, digits and combining marks that start with
+a letter, drops the language's stop words and tokens shorter than the
+language's minimum length, but keeps short acronyms and letter-digit terms.
+
+Stop words live in ``stopwords/<language>.txt`` (one word per line, ``#``
+comments) and are loaded once per process into frozensets. The language is
+detected per text from its script and stop-word hits unless given, or
+``MEETING_LANGUAGE`` is set.
+"""
+import functools
+import os
+import re
+import sys
+import unicodedata
+from typing import FrozenSet, List, Optional
+
+STOPWORDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stopwords')
+LANGUAGES = ('en', 'de', 'hi')
+DEFAULT_LANGUAGE = 'en'
+# Hindi content words are often three code points or fewer ("बजट", "काम")
+MIN_LENGTH = {'en': 4, 'de': 4, 'hi': 2}
+# Text scanned by detect_language
+DETECT_CHARS = 4000
+
+
+def _mark_ranges() -> str:
+    """Character-class ranges of all combining marks (Mn, Mc, Me) in the BMP.
+
+    ``\\w`` doesn't match them, which splits Devanagari, Bengali or Tamil
+    words at every vowel sign.
+    """
+    ranges = []
+    start = prev = None
+    for cp in range(0x300, 0x10000):
+        if unicodedata.category(chr(cp))[0] == 'M':
+            if start is None:
+                start = cp
+            elif cp != prev + 1:
+                ranges.append((start, prev))
+                start = cp
+            prev = cp
+    if start is not None:
+        ranges.append((start, prev))
+    return ''.join(f'\\u{a:04x}-\\u{b:04x}' if a != b else f'\\u{a:04x}' for a, b in ranges)
+
+
+_MARKS = _mark_ranges()
+# A letter, then letters, digits and marks: "budget", "Q4", "v2", "बजट" (not "2024" or the "am" of "10am" as a whole)
+_TOKEN_RE = re.compile(rf'[^\W\d_][\w{_MARKS}]*')
+_SCRIPTS = {'hi': re.compile(r'[ऀ-ॿ]')}
+
+
+@functools.lru_cache(maxsize=None)
+def stop_words(language: str) -> FrozenSet[str]:
+    """Stop words of ``language`` from ``stopwords/<language>.txt``, loaded once."""
+    path = os.path.join(STOPWORDS_DIR, f'{language}.txt')
+    try:
+        with open(path, encoding='utf-8') as f:
+            return frozenset(sys.intern(line.strip().lower()) for line in f
+                             if line.strip() and not line.startswith('#'))
+    except OSError as e:
+        print(f"Stop words for '{language}' not available: {e}")
+        return frozenset()
+
+
+@functools.lru_cache(maxsize=None)
+def _stop_set(language: str) -> FrozenSet[str]:
+    # English terms turn up in most meetings, so its stop words always apply
+    return stop_words(language) | stop_words(DEFAULT_LANGUAGE)
+
+
+@functools.lru_cache(maxsize=None)
+def _distinctive(language: str) -> FrozenSet[str]:
+    """Stop words of ``language`` that no other language lists, for detection."""
+    others = set().union(*(stop_words(other) for other in LANGUAGES if other != language))
+    return stop_words(language) - others
+
+
+def detect_language(text: str) -> str:
+    """Best guess among ``LANGUAGES`` from the start of ``text``.
+
+    Languages with their own script win when a tenth of the sample is in
+    it; otherwise the language with the most distinctive stop words does.
+    """
+    forced = os.environ.get('MEETING_LANGUAGE')
+    if forced:
+        return forced.lower()
+    sample = text[:DETECT_CHARS]
+    for language, script in _SCRIPTS.items():
+        if len(script.findall(sample)) * 10 > len(sample):
+            return language
+    words = _TOKEN_RE.findall(sample.lower())
+    best, best_hits = DEFAULT_LANGUAGE, 0
+    for language in LANGUAGES:
+        if language in _SCRIPTS:
+            continue
+        table = _distinctive(language)
+        hits = sum(1 for w in words if w in table)
+        if hits > best_hits:
+            best, best_hits = language, hits
+    return best
+
+
+def tokenize(text: str, language: Optional[str] = None, min_length: Optional[int] = None) -> List[str]:
+    """Lowercased content tokens of ``text``.
+
+    language: stop-word table to apply (detected when None).
+    min_length: shortest token kept, in code points (default per language).
+    Shorter tokens are kept anyway when they are acronyms or contain a
+    digit, so "API", "QA", "Q4" and "v2" survive.
+    """
+    if language is None:
+        language = detect_language(text)
+    stops = _stop_set(language)
+    if min_length is None:
+        min_length = MIN_LENGTH.get(language, MIN_LENGTH[DEFAULT_LANGUAGE])
+    # Length and case are checked on the original token, and only short ones pay for the case check
+    return [w for token in _TOKEN_RE.findall(text)
+            if len(token) >= min_length or len(token) > 1 and (token.isupper() or not token.isalpha())
+            if (w := token.lower()) not in stops]
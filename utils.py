@@ -1,18 +1,177 @@
 import re, json
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-def extract_json_from_text(text: str):
-    """Try to find the first JSON array/object in text and parse it."""
-    m = re.search(r'(\[\s*\{.*\}\s*\])', text, flags=re.S)
-    if not m:
-        m = re.search(r'(\{.*\})', text, flags=re.S)
-    if not m:
-        return None
-    json_text = m.group(1)
+# Outside any block only openers matter; inside one, brackets and quotes; inside a string, quotes and escapes
+_OPEN_RE = re.compile(r'[\[{]')
+_TOKEN_RE = re.compile(r'[\[\]{}"]')
+_STRING_RE = re.compile(r'["\\]')
+_MATCHING = {']': '[', '}': '{'}
+# How many levels of invalid brackets are searched again for JSON inside them
+_MAX_RESCAN_DEPTH = 16
+
+
+def _loads(text: str) -> Optional[Any]:
     try:
-        return json.loads(json_text)
-    except Exception:
+        return json.loads(text)
+    except (ValueError, RecursionError):
+        if "'" not in text:
+            return None
         try:
-            fixed = json_text.replace("'", '"')
-            return json.loads(fixed)
-        except Exception:
+            return json.loads(text.replace("'", '"'))
+        except (ValueError, RecursionError):
             return None
+
+
+class JSONScanner:
+    """Incremental scanner for balanced JSON arrays/objects embedded in text.
+
+    ``feed()`` chunks of a streamed response as they arrive and it returns
+    the parsed blocks each chunk completed; ``finish()`` flushes the end of
+    the stream. The scan jumps between brackets and quotes with
+    precompiled patterns, looking at each character once, and each closed
+    block is decoded from its own slice, so cost stays linear in the
+    input. Quotes only count inside a block, so apostrophes and quotes in
+    surrounding prose don't throw off matching. A balanced block that is
+    not valid JSON is searched again for valid blocks inside it, and blocks
+    enclosed by a bracket that is never closed are returned by ``finish()``.
+    """
+
+    def __init__(self, _depth: int = 0):
+        self._chunks: List[str] = []
+        self._chunks_start = 0  # absolute offset of _chunks[0]
+        self._end = 0           # absolute offset just past the last fed character
+        # Open brackets: (offset, bracket, closed child blocks as flat start/end pairs)
+        self._stack: List[Tuple[int, str, array]] = []
+        # Stack depths of the open brackets of each type, so a closer finds its opener (or has none) in O(1)
+        self._open: Dict[str, List[int]] = {'[': [], '{': []}
+        self._in_string = False
+        self._escape = False
+        self._depth = _depth
+
+    def feed(self, text: str) -> List[Any]:
+        return list(self.iter_feed(text))
+
+    def iter_feed(self, text: str) -> Iterator[Any]:
+        """Like ``feed`` but yields each block as soon as it is found."""
+        out: List[Any] = []
+        base = self._end
+        self._chunks.append(text)
+        self._end += len(text)
+        i, n = 0, len(text)
+        if self._escape and n:
+            self._escape = False
+            i = 1
+        while i < n:
+            if self._in_string:
+                m = _STRING_RE.search(text, i)
+                if m is None:
+                    break
+                if m.group() == '\\':
+                    if m.end() >= n:
+                        self._escape = True
+                        break
+                    i = m.end() + 1
+                else:
+                    self._in_string = False
+                    i = m.end()
+                continue
+            m = (_TOKEN_RE if self._stack else _OPEN_RE).search(text, i)
+            if m is None:
+                break
+            c, i = m.group(), m.end()
+            if c == '"':
+                self._in_string = True
+            elif c in '[{':
+                # Blocks are only decoded once closed, from their own slice: decoding from the
+                # opener in the whole chunk fails with an error that counts lines up to it
+                self._open[c].append(len(self._stack))
+                self._stack.append((base + m.start(), c, array('q')))
+            else:
+                self._close(c, base + i, out)
+                if out:
+                    yield from out
+                    out.clear()
+        if not self._stack:
+            self._chunks = []
+            self._chunks_start = self._end
+
+    def _close(self, closer: str, end: int, out: List[Any]) -> None:
+        depths = self._open[_MATCHING[closer]]
+        if not depths:
+            return  # stray closer
+        depth = depths.pop()
+        start = self._stack[depth][0]
+        # Unclosed openers above the match were prose; the closed block covers them
+        del self._stack[depth:]
+        for other in self._open.values():
+            while other and other[-1] > depth:
+                other.pop()
+        if self._stack:
+            self._stack[-1][2].extend((start, end))
+        else:
+            out.extend(_parse_block(self._slice(start, end), self._depth))
+            # Earlier chunks can't be part of a later block any more
+            if len(self._chunks) > 1:
+                self._chunks_start = self._end - len(self._chunks[-1])
+                self._chunks = self._chunks[-1:]
+
+    def _slice(self, start: int, end: int) -> str:
+        text = ''.join(self._chunks)
+        return text[start - self._chunks_start:end - self._chunks_start]
+
+    def finish(self) -> List[Any]:
+        """End of input: return the complete blocks enclosed by brackets that were never closed."""
+        out: List[Any] = []
+        if self._stack:
+            text = ''.join(self._chunks)
+            spans = sorted((pairs[i], pairs[i + 1]) for _, _, pairs in self._stack for i in range(0, len(pairs), 2))
+            for start, end in spans:
+                out.extend(_parse_block(text[start - self._chunks_start:end - self._chunks_start], self._depth))
+        self._stack = []
+        self._open = {'[': [], '{': []}
+        self._chunks = []
+        self._chunks_start = self._end
+        self._in_string = self._escape = False
+        return out
+
+
+def _parse_block(text: str, depth: int = 0) -> List[Any]:
+    value = _loads(text)
+    if value is not None:
+        return [value]
+    inner = text[1:-1]
+    if depth >= _MAX_RESCAN_DEPTH or _OPEN_RE.search(inner) is None:
+        return []
+    # Not JSON as a whole (e.g. "[see {...}]"): look for blocks inside the brackets
+    return list(_scan([inner], depth + 1))
+
+
+def iter_json_blocks(source: Union[str, Iterable[str]]) -> Iterator[Any]:
+    """Yield every top-level JSON array/object found in a string or a stream of text chunks, in order.
+
+    Works lazily, so a caller that stops after the first block doesn't scan the rest.
+    """
+    return _scan([source] if isinstance(source, str) else source, 0)
+
+
+def _scan(chunks: Iterable[str], depth: int) -> Iterator[Any]:
+    scanner = JSONScanner(depth)
+    for chunk in chunks:
+        yield from scanner.iter_feed(chunk)
+    yield from scanner.finish()
+
+
+def extract_json_from_text(text: str):
+    """Try to find the first JSON array/object in text and parse it.
+
+    An array of objects (the usual shape of model output) is preferred over
+    a plain object that appears earlier, as before.
+    """
+    first_object = None
+    for block in iter_json_blocks(text):
+        if isinstance(block, list) and block and all(isinstance(item, dict) for item in block):
+            return block
+        if first_object is None and isinstance(block, dict):
+            first_object = block
+    return first_object
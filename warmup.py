@@ -0,0 +1,97 @@
+"""
+Process-wide warm-up of heavy modules and shared resources.
+
+The first Summarizer or TTS request in a fresh app process used to pay for
+importing pandas, pydub, speech_recognition and pyttsx3, creating the
+recognizer and TTS engine, and the first-call costs of the NLP pipeline.
+``warm_up()`` does all of it once per process: ``run_app.py`` starts it in
+the background while the server boots, and pages call ``start_background()``
+so a process launched another way warms up on its first page view. The
+resources it creates are the module singletons the pages use
+(``audio_processor.shared_backend``, ``text_to_audio.shared_engine``).
+"""
+import contextlib
+import importlib
+import threading
+import time
+from datetime import date
+from typing import Dict, Optional
+
+import metrics
+
+SAMPLE_TRANSCRIPT = (
+    "John: Good morning everyone. Let's review the SmartTrack launch plan.\n"
+    "Sarah: We agreed to move the launch to next week after the design review.\n"
+    "Mike: I'll send the updated budget report by Friday.\n"
+    "Lisa: Sarah should coordinate with the marketing team on the urgent fixes.\n"
+)
+
+_RESULT: Optional[Dict[str, float]] = None
+_LOCK = threading.Lock()
+_THREAD: Optional[threading.Thread] = None
+
+
+@contextlib.contextmanager
+def _step(name: str, timings: Dict[str, float]):
+    start = time.perf_counter()
+    try:
+        with metrics.span(f'warmup.{name}'):
+            yield
+    except Exception as e:
+        print(f"Warm-up step '{name}' failed: {e}")
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+def warm_up(audio: bool = True, tts: bool = True) -> Dict[str, float]:
+    """Import and exercise everything a first request needs; returns seconds per step.
+
+    Failing steps (no TTS voice installed, say) are reported and skipped;
+    the request that needs them will report the error itself.
+    """
+    timings: Dict[str, float] = {}
+    with _step('import_nlp', timings):
+        import nlp_summarizer
+        # Only the import cost is paid here; the Summarizer page uses it for long transcripts
+        importlib.import_module('hierarchical_summary')
+        import live_analyzer
+    with _step('nlp', timings):
+        # First calls build the dedup hash tables and fill regex and numpy caches
+        nlp_summarizer.generate_summary(SAMPLE_TRANSCRIPT, structured=True).to_html()
+        nlp_summarizer.extract_action_batch(SAMPLE_TRANSCRIPT, meeting_date=date.today()).to_dicts()
+        nlp_summarizer.analyze_meeting_insights(SAMPLE_TRANSCRIPT)
+        live_analyzer.LiveAnalyzer().feed(SAMPLE_TRANSCRIPT)
+    with _step('import_pandas', timings):
+        importlib.import_module('pandas')
+    if audio:
+        with _step('import_audio', timings):
+            import audio_processor
+        with _step('recognizer', timings):
+            audio_processor.shared_backend()
+    if tts:
+        with _step('import_tts', timings):
+            import text_to_audio
+        with _step('tts_engine', timings):
+            text_to_audio.shared_engine()
+    timings['total'] = sum(timings.values())
+    return timings
+
+
+def ensure_warm() -> Dict[str, float]:
+    """Run ``warm_up()`` once per process; later calls wait for it and return its timings."""
+    global _RESULT
+    if _RESULT is None:
+        with _LOCK:
+            if _RESULT is None:
+                _RESULT = warm_up()
+    return _RESULT
+
+
+def start_background() -> threading.Thread:
+    """Start ``ensure_warm()`` on a daemon thread (once per process) and return immediately."""
+    global _THREAD
+    with _LOCK:
+        if _THREAD is None:
+            _THREAD = threading.Thread(target=ensure_warm, name='warmup', daemon=True)
+            _THREAD.start()
+    return _THREAD